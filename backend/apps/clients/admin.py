@@ -4,7 +4,7 @@ from .models import Client, Supplier
 
 @admin.register(Client)
 class ClientAdmin(admin.ModelAdmin):
-    list_display = ['document_number', 'name', 'document_type', 'phone', 'is_active']
+    list_display = ['document_number', 'name', 'document_type', 'phone', 'total_spent', 'purchase_count', 'is_active']
     list_filter = ['document_type', 'is_active']
     search_fields = ['name', 'document_number', 'email']
 
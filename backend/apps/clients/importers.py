@@ -0,0 +1,175 @@
+"""
+Bulk import of clients and suppliers.
+
+Rows are streamed and processed in batches: each batch is deduplicated
+against the rows already seen in the file and against the database with
+a single query, then written with bulk_create/bulk_update. A batch that
+collides with rows inserted meanwhile by someone else is looked up and
+written again, so those rows become updates.
+"""
+import csv
+import io
+from collections import Counter, defaultdict
+from collections.abc import Mapping
+
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Client, Supplier
+
+IMPORT_SPECS = {
+    'clients': {
+        'model': Client,
+        'key': 'document_number',
+        'fields': [
+            'name', 'document_type', 'document_number', 'email',
+            'phone', 'address', 'is_active'
+        ],
+    },
+    'suppliers': {
+        'model': Supplier,
+        'key': 'ruc',
+        'fields': [
+            'name', 'ruc', 'email', 'phone', 'address',
+            'contact_name', 'is_active'
+        ],
+    },
+}
+
+TRUE_VALUES = {'1', 'true', 't', 'yes', 'y', 'si', 'sí', 's'}
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def read_csv(fileobj):
+    """Stream rows from an uploaded or opened CSV file."""
+    if isinstance(fileobj, io.TextIOBase):
+        stream = fileobj
+    else:
+        stream = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    return csv.DictReader(stream)
+
+
+def _clean_row(spec, row):
+    """Keep known columns and normalize their values."""
+    values = {}
+    for field in spec['fields']:
+        if field not in row or row[field] is None:
+            continue
+        value = row[field]
+        if field == 'is_active':
+            value = value if isinstance(value, bool) else str(value).strip().lower() in TRUE_VALUES
+        else:
+            value = str(value).strip()
+        values[field] = value
+    return values
+
+
+def _build(spec, values):
+    """Instantiate and validate a row without touching the database."""
+    instance = spec['model'](**values)
+    instance.full_clean(exclude=['id'], validate_unique=False)
+    return instance
+
+
+def _error(row_number, key_value, errors):
+    return {'row': row_number, 'key': key_value, 'status': 'error', 'errors': errors}
+
+
+def _flush(spec, batch, update_existing, batch_size):
+    """Upsert one batch of validated rows. Returns their report entries."""
+    try:
+        return _write(spec, batch, update_existing, batch_size)
+    except IntegrityError:
+        pass
+    # A concurrent import or request created some of these keys after the
+    # lookup; looking them up again turns those rows into updates
+    try:
+        return _write(spec, batch, update_existing, batch_size)
+    except IntegrityError:
+        errors = {NON_FIELD_ERRORS: ['Conflicto con registros creados al mismo tiempo, vuelva a importar la fila']}
+        return [_error(row_number, getattr(instance, spec['key']), errors) for row_number, instance, _ in batch]
+
+
+def _write(spec, batch, update_existing, batch_size):
+    model, key = spec['model'], spec['key']
+    keys = [getattr(instance, key) for _, instance, _ in batch]
+    existing = dict(
+        model.objects.filter(**{f'{key}__in': keys}).values_list(key, 'id')
+    )
+
+    now = timezone.now()
+    to_create, report = [], []
+    # Rows are grouped by their columns so missing columns are never overwritten
+    to_update = defaultdict(list)
+    for row_number, instance, columns in batch:
+        key_value = getattr(instance, key)
+        pk = existing.get(key_value)
+        if pk is None:
+            to_create.append(instance)
+            report.append({'row': row_number, 'key': key_value, 'status': 'created'})
+        elif update_existing:
+            instance.pk = pk
+            instance.updated_at = now
+            to_update[frozenset(columns) - {key}].append(instance)
+            report.append({'row': row_number, 'key': key_value, 'status': 'updated'})
+        else:
+            report.append({'row': row_number, 'key': key_value, 'status': 'skipped'})
+
+    with transaction.atomic():
+        model.objects.bulk_create(to_create, batch_size=batch_size)
+        for update_fields, instances in to_update.items():
+            model.objects.bulk_update(
+                instances, sorted(update_fields) + ['updated_at'], batch_size=batch_size
+            )
+    return report
+
+
+def import_rows(kind, rows, update_existing=True, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Import client or supplier rows, upserting by document number / RUC.
+    
+    ``rows`` is any iterable of dicts (a csv.DictReader streams from
+    disk). Returns ``(summary, report)`` with one report entry per row.
+    """
+    spec = IMPORT_SPECS[kind]
+    key = spec['key']
+    seen = set()
+    batch, report = [], []
+
+    for row_number, row in enumerate(rows, start=1):
+        if not isinstance(row, Mapping):
+            report.append(_error(row_number, '', {NON_FIELD_ERRORS: ['La fila debe ser un objeto con sus columnas']}))
+            continue
+        values = _clean_row(spec, row)
+        key_value = values.get(key, '')
+
+        if key_value and key_value in seen:
+            report.append({'row': row_number, 'key': key_value, 'status': 'duplicate'})
+            continue
+
+        try:
+            instance = _build(spec, values)
+        except ValidationError as exc:
+            report.append(_error(row_number, key_value, {
+                field: [str(message) for message in messages]
+                for field, messages in exc.message_dict.items()
+            }))
+            continue
+
+        seen.add(key_value)
+        batch.append((row_number, instance, values.keys()))
+        if len(batch) >= batch_size:
+            report.extend(_flush(spec, batch, update_existing, batch_size))
+            batch = []
+
+    if batch:
+        report.extend(_flush(spec, batch, update_existing, batch_size))
+
+    report.sort(key=lambda entry: entry['row'])
+    summary = Counter(entry['status'] for entry in report)
+    summary['total'] = len(report)
+    return dict(summary), report
+
+
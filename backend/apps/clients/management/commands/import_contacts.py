@@ -0,0 +1,47 @@
+import csv
+
+from django.core.management.base import BaseCommand
+
+from apps.clients.importers import DEFAULT_BATCH_SIZE, IMPORT_SPECS, import_rows, read_csv
+
+
+class Command(BaseCommand):
+    help = 'Import clients or suppliers from a CSV file, deduplicating by document number/RUC'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(IMPORT_SPECS))
+        parser.add_argument('path', help='CSV file with a header row using the model field names')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            '--no-update',
+            action='store_true',
+            help='Skip rows that already exist instead of updating them'
+        )
+        parser.add_argument('--report', help='Write the per-row report to this CSV file')
+    
+    def handle(self, *args, **options):
+        with open(options['path'], encoding='utf-8-sig', newline='') as fh:
+            summary, report = import_rows(
+                options['kind'],
+                read_csv(fh),
+                update_existing=not options['no_update'],
+                batch_size=options['batch_size']
+            )
+        
+        if options['report']:
+            with open(options['report'], 'w', newline='') as out:
+                writer = csv.DictWriter(out, fieldnames=['row', 'key', 'status', 'errors'])
+                writer.writeheader()
+                writer.writerows(report)
+        else:
+            for entry in report:
+                if entry['status'] == 'error':
+                    self.stdout.write(self.style.WARNING(
+                        f"Fila {entry['row']} ({entry['key']}): {entry['errors']}"
+                    ))
+        
+        self.stdout.write(self.style.SUCCESS(
+            ', '.join(f'{status}: {count}' for status, count in sorted(summary.items()))
+        ))
+
+
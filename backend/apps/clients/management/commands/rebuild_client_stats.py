@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.clients.services import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute client purchase statistics from sales history'
+    
+    def handle(self, *args, **options):
+        count = rebuild_stats()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt statistics for {count} clients'))
+
+
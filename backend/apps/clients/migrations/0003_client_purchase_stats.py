@@ -0,0 +1,65 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:17
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def rebuild_purchase_stats(apps, schema_editor):
+    Client = apps.get_model('clients', 'Client')
+    Sale = apps.get_model('sales', 'Sale')
+    sales = Sale.objects.filter(
+        client_id=OuterRef('pk'), status='completed'
+    ).order_by().values('client_id')
+    Client.objects.update(
+        total_spent=Coalesce(
+            Subquery(sales.annotate(s=Sum('total')).values('s')),
+            Value(Decimal('0')),
+            output_field=models.DecimalField(max_digits=14, decimal_places=2)
+        ),
+        purchase_count=Coalesce(
+            Subquery(sales.annotate(c=Count('id')).values('c')), Value(0)
+        ),
+        last_purchase_at=Subquery(sales.annotate(m=Max('created_at')).values('m')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0002_client_name_lower_idx'),
+        ('sales', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='last_purchase_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Última compra'),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='purchase_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Número de compras'),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='total_spent',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Total comprado'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['total_spent', 'id'], name='client_total_spent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['purchase_count', 'id'], name='client_purchase_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['last_purchase_at', 'id'], name='client_last_purchase_idx'),
+        ),
+        migrations.RunPython(rebuild_purchase_stats, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class Client(models.Model):
@@ -26,6 +27,22 @@ class Client(models.Model):
     phone = models.CharField(max_length=20, blank=True, verbose_name='Teléfono')
     address = models.TextField(blank=True, verbose_name='Dirección')
     is_active = models.BooleanField(default=True, verbose_name='Activo')
+    # Purchase statistics, maintained incrementally by sales
+    total_spent = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name='Total comprado'
+    )
+    purchase_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Número de compras'
+    )
+    last_purchase_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Última compra'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -33,6 +50,12 @@ class Client(models.Model):
         verbose_name = 'Cliente'
         verbose_name_plural = 'Clientes'
         ordering = ['name']
+        indexes = [
+            models.Index(Lower('name'), name='client_name_lower_idx'),
+            models.Index(fields=['total_spent', 'id'], name='client_total_spent_idx'),
+            models.Index(fields=['purchase_count', 'id'], name='client_purchase_count_idx'),
+            models.Index(fields=['last_purchase_at', 'id'], name='client_last_purchase_idx'),
+        ]
     
     def __str__(self):
         return f"{self.document_number} - {self.name}"
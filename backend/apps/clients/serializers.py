@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from .models import Client, Supplier
+from store_backend.fieldsets import FieldsetSerializerMixin
 
 
-class ClientSerializer(serializers.ModelSerializer):
+class ClientSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for Client model."""
     
     document_type_display = serializers.CharField(
@@ -15,12 +16,16 @@ class ClientSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'document_type', 'document_type_display',
             'document_number', 'email', 'phone', 'address', 'is_active',
+            'total_spent', 'purchase_count', 'last_purchase_at',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'id', 'total_spent', 'purchase_count', 'last_purchase_at',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class SupplierSerializer(serializers.ModelSerializer):
+class SupplierSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for Supplier model."""
     
     class Meta:
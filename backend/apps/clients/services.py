@@ -0,0 +1,72 @@
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, F, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import Client
+from apps.sales.models import Sale
+
+
+def _completed_sales():
+    """Completed sales of the client in the outer query."""
+    return Sale.objects.filter(
+        client_id=OuterRef('pk'),
+        status=Sale.Status.COMPLETED
+    ).order_by().values('client_id')
+
+
+def register_purchase(sale):
+    """Add a completed sale to its client's statistics."""
+    if not sale.client_id:
+        return
+    Client.objects.filter(pk=sale.client_id).update(
+        total_spent=F('total_spent') + sale.total,
+        purchase_count=F('purchase_count') + 1,
+        # An older sale moved to this client does not move its last purchase back
+        last_purchase_at=Greatest(Coalesce('last_purchase_at', Value(sale.created_at)), Value(sale.created_at)),
+        updated_at=timezone.now()
+    )
+
+
+def revert_purchase(sale):
+    """Remove a sale that no longer counts (cancelled, moved or deleted) from its client's statistics."""
+    if not sale.client_id:
+        return
+    Client.objects.filter(pk=sale.client_id).update(
+        total_spent=F('total_spent') - sale.total,
+        purchase_count=F('purchase_count') - 1,
+        last_purchase_at=Subquery(
+            _completed_sales().exclude(pk=sale.pk).annotate(
+                last=Max('created_at')
+            ).values('last')
+        ),
+        updated_at=timezone.now()
+    )
+
+
+def rebuild_stats(queryset=None):
+    """
+    Recompute purchase statistics from sales history.
+    
+    Runs as a single set-based UPDATE. Returns the number of clients updated.
+    """
+    queryset = Client.objects.all() if queryset is None else queryset
+    sales = _completed_sales()
+    return queryset.update(
+        total_spent=Coalesce(
+            Subquery(sales.annotate(total_spent=Sum('total')).values('total_spent')),
+            Value(Decimal('0')),
+            output_field=DecimalField(max_digits=14, decimal_places=2)
+        ),
+        purchase_count=Coalesce(
+            Subquery(sales.annotate(purchase_count=Count('id')).values('purchase_count')),
+            Value(0)
+        ),
+        last_purchase_at=Subquery(
+            sales.annotate(last=Max('created_at')).values('last')
+        ),
+        updated_at=timezone.now()
+    )
+
+
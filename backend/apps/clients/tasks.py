@@ -0,0 +1,12 @@
+from apps.tasks.models import Task
+from apps.tasks.services import task
+
+from .services import rebuild_stats
+
+
+@task('clients.rebuild_stats', priority=Task.Priority.LOW)
+def rebuild_stats_task():
+    """Recompute every client's purchase statistics from sales history."""
+    rebuild_stats()
+
+
@@ -1,11 +1,76 @@
-from rest_framework import viewsets
+import hashlib
+
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from django.core.cache import cache
 from django.db.models import Q
+from django.db.models.functions import Lower
 
 from .models import Client, Supplier
 from .serializers import ClientSerializer, SupplierSerializer
+from .importers import import_rows, read_csv
+from store_backend.conditional import ConditionalGetMixin
+from store_backend.fieldsets import FieldsetViewMixin
+from store_backend.renderers import FastJSONParser
+
+AUTOCOMPLETE_MIN_LENGTH = 2
+AUTOCOMPLETE_MAX_RESULTS = 20
+AUTOCOMPLETE_CACHE_SECONDS = 30
+
+CLIENT_ORDERINGS = {
+    f'{direction}{field}'
+    for field in ('name', 'total_spent', 'purchase_count', 'last_purchase_at')
+    for direction in ('', '-')
+}
+
+
+def prefix_upper_bound(prefix):
+    """Smallest string greater than every string starting with prefix."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def sqlite_lower_prefixes(term):
+    """
+    Prefixes to match against SQLite's lower(), which only folds ASCII letters.
+    
+    "Ñañez" is indexed as "Ñañez", so besides the fully lowercased term the
+    lookup also tries it capitalized and with every non-ASCII letter
+    uppercased. Other mixes of accented capitals within the prefix are not
+    matched.
+    """
+    lowered = term.lower()
+    return {
+        lowered,
+        lowered[0].upper() + lowered[1:] if not lowered[0].isascii() else lowered,
+        ''.join(char if char.isascii() else char.upper() for char in lowered),
+    }
 
 
-class ClientViewSet(viewsets.ModelViewSet):
+def import_response(request, kind):
+    """Run an import from the request payload and build the report response."""
+    upload = request.FILES.get('file')
+    if upload is not None:
+        rows = read_csv(upload.file)
+    elif isinstance(request.data.get('rows'), list):
+        rows = request.data['rows']
+    else:
+        return Response(
+            {'error': 'Envíe un archivo CSV (file) o una lista de filas (rows)'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    update_existing = str(request.data.get('update', 'true')).lower() != 'false'
+    summary, report = import_rows(kind, rows, update_existing=update_existing)
+    
+    if request.query_params.get('report') == 'errors':
+        report = [entry for entry in report if entry['status'] in ('error', 'duplicate', 'skipped')]
+    
+    return Response({'summary': summary, 'rows': report})
+
+
+class ClientViewSet(ConditionalGetMixin, FieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for Client management."""
     
     queryset = Client.objects.all()
@@ -28,10 +93,86 @@ class ClientViewSet(viewsets.ModelViewSet):
                 Q(email__icontains=search)
             )
         
+        # Ordering by purchase statistics (indexed)
+        ordering = self.request.query_params.get('ordering')
+        if ordering in CLIENT_ORDERINGS:
+            direction = '-' if ordering.startswith('-') else ''
+            queryset = queryset.order_by(ordering, f'{direction}id')
+        
         return queryset
+    
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Prefix lookup by document number or name for checkout.
+        
+        Uses range conditions on indexed columns (document_number and
+        lower(name)) instead of icontains, skips pagination and COUNT and
+        caches the small projection for a few seconds.
+        """
+        term = request.query_params.get('q', '').strip()
+        if len(term) < AUTOCOMPLETE_MIN_LENGTH:
+            return Response(
+                {'error': f'Ingrese al menos {AUTOCOMPLETE_MIN_LENGTH} caracteres'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), AUTOCOMPLETE_MAX_RESULTS))
+        except ValueError:
+            limit = 10
+        
+        term_hash = hashlib.md5(term.lower().encode()).hexdigest()
+        cache_key = f'clients:autocomplete:{limit}:{term_hash}'
+        results = cache.get(cache_key)
+        if results is None:
+            results = self._autocomplete(term, limit)
+            cache.set(cache_key, results, AUTOCOMPLETE_CACHE_SECONDS)
+        
+        return Response(results)
+    
+    def _autocomplete(self, term, limit):
+        fields = ('id', 'name', 'document_type', 'document_number')
+        active = Client.objects.filter(is_active=True).order_by()
+        
+        results = []
+        if term.isdigit():
+            results = list(
+                active.filter(
+                    document_number__gte=term,
+                    document_number__lt=prefix_upper_bound(term)
+                ).order_by('document_number').values(*fields)[:limit]
+            )
+        
+        if len(results) < limit:
+            seen = {client['id'] for client in results}
+            name_prefix = Q()
+            for prefix in sqlite_lower_prefixes(term):
+                name_prefix |= Q(name_lower__gte=prefix, name_lower__lt=prefix_upper_bound(prefix))
+            by_name = active.annotate(name_lower=Lower('name')).filter(
+                name_prefix
+            ).order_by('name_lower').values(*fields)[:limit]
+            results += [client for client in by_name if client['id'] not in seen]
+        
+        return results[:limit]
+    
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='import',
+        parser_classes=[MultiPartParser, FastJSONParser]
+    )
+    def bulk_import(self, request):
+        """
+        Bulk import from a CSV upload (``file``) or a JSON list (``rows``).
+        
+        Existing records are updated unless ``update=false``; with
+        ``report=errors`` only rows that were not written are listed.
+        """
+        return import_response(request, 'clients')
 
 
-class SupplierViewSet(viewsets.ModelViewSet):
+class SupplierViewSet(ConditionalGetMixin, FieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for Supplier management."""
     
     queryset = Supplier.objects.all()
@@ -55,5 +196,20 @@ class SupplierViewSet(viewsets.ModelViewSet):
             )
         
         return queryset
+    
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='import',
+        parser_classes=[MultiPartParser, FastJSONParser]
+    )
+    def bulk_import(self, request):
+        """
+        Bulk import from a CSV upload (``file``) or a JSON list (``rows``).
+        
+        Existing records are updated unless ``update=false``; with
+        ``report=errors`` only rows that were not written are listed.
+        """
+        return import_response(request, 'suppliers')
 
 
@@ -0,0 +1,84 @@
+"""
+Minimal PDF writer for plain text documents.
+
+Documents are laid out as fixed-width text and drawn with the standard
+Courier font, so no external PDF library is required.
+"""
+import zlib
+
+PAGE_WIDTH = 595  # A4 in points
+PAGE_HEIGHT = 842
+MARGIN = 40
+FONT_SIZE = 9
+LEADING = 12
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LEADING
+
+
+def _escape(line):
+    """Encode a text line as a PDF string literal."""
+    data = line.encode('cp1252', errors='replace')
+    return data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+def _page_stream(lines):
+    """Build the compressed content stream for one page."""
+    parts = [
+        b'BT',
+        b'/F1 %d Tf' % FONT_SIZE,
+        b'%d TL' % LEADING,
+        b'%d %d Td' % (MARGIN, PAGE_HEIGHT - MARGIN - FONT_SIZE),
+    ]
+    for line in lines:
+        parts.append(b'(' + _escape(line) + b") '")
+    parts.append(b'ET')
+    return zlib.compress(b'\n'.join(parts))
+
+
+def text_to_pdf(text):
+    """Render plain text into PDF bytes, one line per text line."""
+    lines = text.expandtabs().splitlines() or ['']
+    pages = [
+        lines[start:start + LINES_PER_PAGE]
+        for start in range(0, len(lines), LINES_PER_PAGE)
+    ]
+
+    # 1: catalog, 2: pages, 3: font, then a page/content pair per page
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>',
+    ]
+    kids = []
+    for page_lines in pages:
+        page_id = len(objects) + 1
+        stream = _page_stream(page_lines)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>'
+            % (PAGE_WIDTH, PAGE_HEIGHT, page_id + 1)
+        )
+        objects.append(
+            b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(stream)
+            + stream + b'\nendstream'
+        )
+        kids.append(b'%d 0 R' % page_id)
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (b' '.join(kids), len(kids))
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+
+    xref_offset = len(output)
+    output += b'xref\n0 %d\n' % (len(objects) + 1)
+    output += b'0000000000 65535 f \n'
+    for offset in offsets:
+        output += b'%010d 00000 n \n' % offset
+    output += (
+        b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+        % (len(objects) + 1, xref_offset)
+    )
+    return bytes(output)
+
+
@@ -0,0 +1,246 @@
+"""
+Server-side rendering of invoices and quotes.
+
+Rendering runs in a bounded process pool and every document is cached on
+disk by id and version, so a reprint is only a file read. Request workers
+never wait for the pool: on a cache miss the render is started in the
+background and the view answers 202, and the client asks again.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.http import FileResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from . import workers
+from store_backend.config import APP_CONFIG
+
+TEMPLATES = {
+    ('invoice', 'html'): 'documents/invoice.html',
+    ('invoice', 'pdf'): 'documents/invoice.txt',
+    ('quote', 'html'): 'documents/quote.html',
+    ('quote', 'pdf'): 'documents/quote.txt',
+}
+
+CONTENT_TYPES = {
+    'html': 'text/html; charset=utf-8',
+    'pdf': 'application/pdf',
+}
+
+# Seconds a client should wait before asking again for a document being rendered
+RETRY_AFTER = 1
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+# Path -> Future of the renders this process has in the pool
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the shared rendering pool, or None to render inline."""
+    global _pool
+    max_workers = getattr(settings, 'DOCUMENT_RENDER_WORKERS', 2)
+    if max_workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=get_context('spawn'),
+                initializer=workers.setup_worker,
+                initargs=(os.environ['DJANGO_SETTINGS_MODULE'],)
+            )
+    return _pool
+
+
+def document_path(kind, document_id, version, file_format):
+    """Disk cache location for a rendered document."""
+    root = settings.DOCUMENTS_ROOT / kind
+    root.mkdir(parents=True, exist_ok=True)
+    return root / f'{document_id}-{version}.{file_format}'
+
+
+def _remove_stale(path):
+    """Delete cached renders of previous versions of the same document."""
+    document_id = path.name.split('-', 1)[0]
+    for stale in path.parent.glob(f'{document_id}-*{path.suffix}'):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
+
+def _finished(path, future):
+    with _pending_lock:
+        _pending.pop(path, None)
+    if future.exception() is not None:
+        logger.error('Rendering %s failed', path, exc_info=future.exception())
+    else:
+        _remove_stale(path)
+
+
+def get_document(kind, document_id, version, file_format, build_context, wait=False):
+    """
+    Return the path of a rendered document, or None while it is being rendered.
+    
+    On a cache miss the render is submitted to the pool (once per process)
+    and None is returned right away; ``wait=True``, for background tasks,
+    blocks until the file exists. Without a pool (``DOCUMENT_RENDER_WORKERS
+    = 0``) the document is rendered inline. ``build_context`` is only called
+    when the document is not cached yet.
+    """
+    path = document_path(kind, document_id, version, file_format)
+    if path.exists():
+        return path
+    
+    template_name = TEMPLATES[(kind, file_format)]
+    pool = get_pool()
+    if pool is None:
+        workers.render_to_file(template_name, build_context(), file_format, str(path))
+        _remove_stale(path)
+        return path
+    
+    with _pending_lock:
+        future = _pending.get(path)
+        if future is None:
+            future = pool.submit(workers.render_to_file, template_name, build_context(), file_format, str(path))
+            _pending[path] = future
+    # Registered outside the lock: it runs at once if the render already ended
+    future.add_done_callback(lambda done: _finished(path, done))
+    if not wait:
+        return None
+    future.result(timeout=getattr(settings, 'DOCUMENT_RENDER_TIMEOUT', 30))
+    return path
+
+
+def version_of(timestamp):
+    """
+    Document version: the last modification time plus a hash of the
+    configuration printed on every document, so a new company name or
+    currency symbol does not serve old files.
+    """
+    config = json.dumps([_company(), APP_CONFIG['currency_symbol']], sort_keys=True)
+    return f"{timestamp.strftime('%Y%m%d%H%M%S%f')}-{hashlib.sha1(config.encode()).hexdigest()[:8]}"
+
+
+def _money(value):
+    return f'{value:,.2f}'
+
+
+def _company():
+    return {
+        'name': APP_CONFIG['company_name'],
+        'ruc': APP_CONFIG['company_ruc'],
+        'address': APP_CONFIG['company_address'],
+        'phone': APP_CONFIG['company_phone'],
+        'email': APP_CONFIG['company_email'],
+    }
+
+
+def _client(client):
+    if client is None:
+        return None
+    return {
+        'name': client.name,
+        'document_type': client.get_document_type_display(),
+        'document_number': client.document_number,
+        'address': client.address,
+    }
+
+
+def _items(items):
+    return [
+        {
+            'quantity': str(item.quantity),
+            'name': item.product.name,
+            'sku': item.product.sku,
+            'description': getattr(item, 'description', ''),
+            'unit_price': _money(item.unit_price),
+            'subtotal': _money(item.subtotal),
+            'igv': _money(item.igv),
+            'total': _money(item.total),
+        }
+        for item in items
+    ]
+
+
+def invoice_context(invoice):
+    """Plain, picklable context for rendering an invoice."""
+    sale = invoice.sale
+    return {
+        'company': _company(),
+        'currency_symbol': APP_CONFIG['currency_symbol'],
+        'title': invoice.get_invoice_type_display(),
+        'number': f'{invoice.series}-{invoice.number}',
+        'issued_at': timezone.localtime(invoice.issued_at).strftime('%d/%m/%Y %H:%M'),
+        'client': _client(sale.client),
+        'payment_method': sale.get_payment_method_display(),
+        'cancelled': sale.status == sale.Status.CANCELLED,
+        'items': _items(sale.items.select_related('product')),
+        'subtotal': _money(sale.subtotal),
+        'igv': _money(sale.igv),
+        'total': _money(sale.total),
+        'notes': sale.notes,
+    }
+
+
+def quote_context(quote):
+    """Plain, picklable context for rendering a quote."""
+    return {
+        'company': _company(),
+        'currency_symbol': APP_CONFIG['currency_symbol'],
+        'title': 'Cotización',
+        'number': quote.quote_number,
+        'issued_at': timezone.localtime(quote.created_at).strftime('%d/%m/%Y'),
+        'valid_until': quote.valid_until.strftime('%d/%m/%Y') if quote.valid_until else '',
+        'status': quote.get_status_display(),
+        'client': _client(quote.client),
+        'items': _items(quote.items.all()),
+        'subtotal': _money(quote.subtotal),
+        'igv': _money(quote.igv),
+        'total': _money(quote.total),
+        'notes': quote.notes,
+        'terms': quote.terms,
+    }
+
+
+def render_invoice(invoice, file_format, wait=False):
+    """Path of the rendered invoice, invalidated when its sale changes."""
+    return get_document(
+        'invoice', invoice.pk, version_of(invoice.sale.updated_at),
+        file_format, lambda: invoice_context(invoice), wait=wait
+    )
+
+
+def render_quote(quote, file_format, wait=False):
+    """Path of the rendered quote, invalidated when the quote changes."""
+    return get_document(
+        'quote', quote.pk, version_of(quote.updated_at),
+        file_format, lambda: quote_context(quote), wait=wait
+    )
+
+
+def document_response(path, file_format, filename):
+    """Send a rendered document as an inline file, or 202 while it is being rendered."""
+    if path is None:
+        return Response(
+            {'detail': 'El documento se está generando, vuelve a intentarlo en un momento'},
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Retry-After': str(RETRY_AFTER)}
+        )
+    return FileResponse(
+        open(path, 'rb'),
+        content_type=CONTENT_TYPES[file_format],
+        filename=f'{filename}.{file_format}'
+    )
+
+
@@ -0,0 +1,15 @@
+from apps.sales.models import Invoice
+from apps.tasks.models import Task
+from apps.tasks.services import task
+
+from .rendering import render_invoice
+
+
+@task('documents.render_invoice', priority=Task.Priority.LOW)
+def render_invoice_task(invoice_id, file_format='pdf'):
+    """Render an invoice into the document cache so printing it is a file read."""
+    invoice = Invoice.objects.select_related('sale__client').filter(pk=invoice_id).first()
+    if invoice is not None:
+        render_invoice(invoice, file_format, wait=True)
+
+
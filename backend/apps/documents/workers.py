@@ -0,0 +1,48 @@
+"""
+Functions executed inside the rendering process pool.
+
+This module must not import models at module level: spawned workers
+import it before Django has been set up by the pool initializer.
+"""
+import os
+import tempfile
+from functools import lru_cache
+
+from .pdf import text_to_pdf
+
+
+def setup_worker(settings_module):
+    """Pool initializer: configure Django in the worker process."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+@lru_cache(maxsize=None)
+def get_template(template_name):
+    """Load and compile a template once per process."""
+    from django.template.loader import get_template as load_template
+    return load_template(template_name)
+
+
+def render_to_file(template_name, context, file_format, path):
+    """Render a document and write it atomically to ``path``."""
+    content = get_template(template_name).render(context)
+    if file_format == 'pdf':
+        data = text_to_pdf(content)
+    else:
+        data = content.encode('utf-8')
+
+    # Unique per render: inline renders in several threads of one process
+    # must not share a temporary file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Expense, ExpenseCategory
+from .models import Expense, ExpenseCategory, RecurringExpense
 
 
 @admin.register(ExpenseCategory)
@@ -11,7 +11,14 @@ class ExpenseCategoryAdmin(admin.ModelAdmin):
 @admin.register(Expense)
 class ExpenseAdmin(admin.ModelAdmin):
     list_display = ['description', 'category', 'amount', 'payment_method', 'date', 'user']
-    list_filter = ['category', 'payment_method', 'date']
+    list_filter = ['category', 'payment_method', 'date', 'recurring']
     search_fields = ['description', 'receipt_number']
 
 
+@admin.register(RecurringExpense)
+class RecurringExpenseAdmin(admin.ModelAdmin):
+    list_display = ['description', 'category', 'amount', 'frequency', 'start_date', 'end_date', 'is_active']
+    list_filter = ['frequency', 'is_active', 'category']
+    search_fields = ['description']
+
+
@@ -0,0 +1,26 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.expenses.services import generate_recurring_expenses
+
+
+class Command(BaseCommand):
+    help = 'Create the expenses due from recurring templates up to a date'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--until',
+            help='Last date to generate (YYYY-MM-DD), defaults to today'
+        )
+    
+    def handle(self, *args, **options):
+        until = None
+        if options['until']:
+            try:
+                until = date.fromisoformat(options['until'])
+            except ValueError:
+                raise CommandError('--until debe tener el formato YYYY-MM-DD')
+        
+        generated = generate_recurring_expenses(until=until)
+        self.stdout.write(self.style.SUCCESS(f'Generated {generated} expenses'))
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:22
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('expenses', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecurringExpense',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('description', models.CharField(max_length=500, verbose_name='Descripción')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Monto')),
+                ('payment_method', models.CharField(choices=[('cash', 'Efectivo'), ('card', 'Tarjeta'), ('transfer', 'Transferencia')], default='cash', max_length=20, verbose_name='Método de pago')),
+                ('frequency', models.CharField(choices=[('weekly', 'Semanal'), ('monthly', 'Mensual'), ('yearly', 'Anual')], default='monthly', max_length=20, verbose_name='Frecuencia')),
+                ('start_date', models.DateField(verbose_name='Fecha de inicio')),
+                ('end_date', models.DateField(blank=True, null=True, verbose_name='Fecha de fin')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Activo')),
+                ('notes', models.TextField(blank=True, verbose_name='Notas')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Gasto recurrente',
+                'verbose_name_plural': 'Gastos recurrentes',
+                'ordering': ['description'],
+            },
+        ),
+        migrations.AddField(
+            model_name='expense',
+            name='period',
+            field=models.DateField(blank=True, null=True, verbose_name='Periodo'),
+        ),
+        migrations.AddField(
+            model_name='recurringexpense',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recurring_expenses', to='expenses.expensecategory', verbose_name='Categoría'),
+        ),
+        migrations.AddField(
+            model_name='recurringexpense',
+            name='user',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recurring_expenses', to=settings.AUTH_USER_MODEL, verbose_name='Usuario'),
+        ),
+        migrations.AddField(
+            model_name='expense',
+            name='recurring',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='expenses', to='expenses.recurringexpense', verbose_name='Gasto recurrente'),
+        ),
+        migrations.AddConstraint(
+            model_name='expense',
+            constraint=models.UniqueConstraint(fields=('recurring', 'period'), name='expense_recurring_period_unique'),
+        ),
+    ]
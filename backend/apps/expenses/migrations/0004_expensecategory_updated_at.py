@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0003_recurring_expenses'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expensecategory',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -1,3 +1,6 @@
+import calendar
+from datetime import date, timedelta
+
 from django.db import models
 from django.conf import settings
 
@@ -7,6 +10,7 @@ class ExpenseCategory(models.Model):
     
     name = models.CharField(max_length=100, verbose_name='Nombre')
     description = models.TextField(blank=True, verbose_name='Descripción')
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         verbose_name = 'Categoría de gasto'
@@ -17,6 +21,13 @@ class ExpenseCategory(models.Model):
         return self.name
 
 
+def add_months(day, months):
+    """Shift a date by whole months, clamping to the last day of the month."""
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
 class Expense(models.Model):
     """Expense model."""
     
@@ -59,6 +70,15 @@ class Expense(models.Model):
         verbose_name='Usuario'
     )
     notes = models.TextField(blank=True, verbose_name='Notas')
+    recurring = models.ForeignKey(
+        'RecurringExpense',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='expenses',
+        verbose_name='Gasto recurrente'
+    )
+    period = models.DateField(null=True, blank=True, verbose_name='Periodo')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -66,8 +86,92 @@ class Expense(models.Model):
         verbose_name = 'Gasto'
         verbose_name_plural = 'Gastos'
         ordering = ['-date', '-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['recurring', 'period'],
+                name='expense_recurring_period_unique'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.description} - {self.amount}"
 
 
+class RecurringExpense(models.Model):
+    """Template for expenses that repeat on a schedule (rent, payroll, services)."""
+    
+    class Frequency(models.TextChoices):
+        WEEKLY = 'weekly', 'Semanal'
+        MONTHLY = 'monthly', 'Mensual'
+        YEARLY = 'yearly', 'Anual'
+    
+    category = models.ForeignKey(
+        ExpenseCategory,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='recurring_expenses',
+        verbose_name='Categoría'
+    )
+    description = models.CharField(max_length=500, verbose_name='Descripción')
+    amount = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        verbose_name='Monto'
+    )
+    payment_method = models.CharField(
+        max_length=20,
+        choices=Expense.PaymentMethod.choices,
+        default=Expense.PaymentMethod.CASH,
+        verbose_name='Método de pago'
+    )
+    frequency = models.CharField(
+        max_length=20,
+        choices=Frequency.choices,
+        default=Frequency.MONTHLY,
+        verbose_name='Frecuencia'
+    )
+    start_date = models.DateField(verbose_name='Fecha de inicio')
+    end_date = models.DateField(null=True, blank=True, verbose_name='Fecha de fin')
+    is_active = models.BooleanField(default=True, verbose_name='Activo')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='recurring_expenses',
+        verbose_name='Usuario'
+    )
+    notes = models.TextField(blank=True, verbose_name='Notas')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Gasto recurrente'
+        verbose_name_plural = 'Gastos recurrentes'
+        ordering = ['description']
+    
+    def __str__(self):
+        return f"{self.description} ({self.get_frequency_display()})"
+    
+    def occurrence(self, index):
+        """Date of the n-th occurrence, counting from start_date."""
+        if self.frequency == self.Frequency.WEEKLY:
+            return self.start_date + timedelta(weeks=index)
+        if self.frequency == self.Frequency.YEARLY:
+            return add_months(self.start_date, 12 * index)
+        return add_months(self.start_date, index)
+    
+    def occurrences(self, after=None, until=None):
+        """Occurrence dates strictly after ``after`` and up to ``until``."""
+        if self.end_date and (until is None or self.end_date < until):
+            until = self.end_date
+        index = 0
+        while True:
+            period = self.occurrence(index)
+            if until and period > until:
+                return
+            if after is None or period > after:
+                yield period
+            index += 1
+
+
@@ -1,8 +1,9 @@
 from rest_framework import serializers
-from .models import Expense, ExpenseCategory
+from .models import Expense, ExpenseCategory, RecurringExpense
+from store_backend.fieldsets import FieldsetSerializerMixin
 
 
-class ExpenseCategorySerializer(serializers.ModelSerializer):
+class ExpenseCategorySerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for ExpenseCategory model."""
     
     expenses_count = serializers.SerializerMethodField()
@@ -11,15 +12,21 @@ class ExpenseCategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = ExpenseCategory
         fields = ['id', 'name', 'description', 'expenses_count', 'total_amount']
+        annotated_fields = ['expenses_count', 'total_amount']
     
     def get_expenses_count(self, obj):
+        # Annotated by ExpenseCategoryViewSet, like amount_total
+        if hasattr(obj, 'expenses_total'):
+            return obj.expenses_total
         return obj.expenses.count()
     
     def get_total_amount(self, obj):
+        if hasattr(obj, 'amount_total'):
+            return obj.amount_total or 0
         return sum(e.amount for e in obj.expenses.all())
 
 
-class ExpenseSerializer(serializers.ModelSerializer):
+class ExpenseSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for Expense model."""
     
     category_name = serializers.CharField(source='category.name', read_only=True)
@@ -34,8 +41,47 @@ class ExpenseSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'category', 'category_name', 'description', 'amount',
             'payment_method', 'payment_method_display', 'receipt_number',
-            'date', 'user', 'user_name', 'notes', 'created_at', 'updated_at'
+            'date', 'user', 'user_name', 'notes', 'recurring', 'period',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'id', 'user', 'recurring', 'period', 'created_at', 'updated_at'
+        ]
+        expandable_fields = {'category': ExpenseCategorySerializer}
+
+
+class RecurringExpenseSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
+    """Serializer for RecurringExpense model."""
+    
+    category_name = serializers.CharField(source='category.name', read_only=True)
+    frequency_display = serializers.CharField(
+        source='get_frequency_display',
+        read_only=True
+    )
+    
+    class Meta:
+        model = RecurringExpense
+        fields = [
+            'id', 'category', 'category_name', 'description', 'amount',
+            'payment_method', 'frequency', 'frequency_display', 'start_date',
+            'end_date', 'is_active', 'user', 'notes', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+        expandable_fields = {'category': ExpenseCategorySerializer}
+    
+    def validate(self, data):
+        start_date = data.get('start_date', getattr(self.instance, 'start_date', None))
+        end_date = data.get('end_date', getattr(self.instance, 'end_date', None))
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError(
+                {'end_date': 'La fecha de fin no puede ser anterior a la de inicio'}
+            )
+        return data
+
+
+class GenerateRecurringSerializer(serializers.Serializer):
+    """Input for materializing recurring expenses."""
+    
+    until = serializers.DateField(required=False)
 
 
@@ -0,0 +1,60 @@
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Expense, RecurringExpense
+
+
+def generate_recurring_expenses(until=None, templates=None, batch_size=500):
+    """
+    Materialize every due occurrence of the active recurring templates.
+
+    Each template resumes from the last period it already generated, and
+    all new expenses are written with a single bulk_create. The unique
+    (recurring, period) constraint makes repeated or concurrent runs
+    harmless: conflicting rows are skipped by the database.
+
+    Returns how many expenses were actually inserted. bulk_create returns
+    every object it was given, skipped ones included, so the templates'
+    expenses are counted before and after the insert in the same
+    (IMMEDIATE) transaction.
+    """
+    until = until or timezone.localdate()
+    if templates is None:
+        templates = RecurringExpense.objects.all()
+    templates = list(
+        templates.filter(is_active=True, start_date__lte=until)
+    )
+
+    last_periods = dict(
+        Expense.objects.filter(recurring__in=templates)
+        .values('recurring')
+        .annotate(last=Max('period'))
+        .values_list('recurring', 'last')
+    )
+
+    expenses = []
+    for template in templates:
+        for period in template.occurrences(after=last_periods.get(template.id), until=until):
+            expenses.append(Expense(
+                category_id=template.category_id,
+                description=template.description,
+                amount=template.amount,
+                payment_method=template.payment_method,
+                date=period,
+                user_id=template.user_id,
+                notes=template.notes,
+                recurring=template,
+                period=period
+            ))
+
+    if not expenses:
+        return 0
+
+    generated = Expense.objects.filter(recurring__in=templates)
+    with transaction.atomic():
+        before = generated.count()
+        Expense.objects.bulk_create(expenses, batch_size=batch_size, ignore_conflicts=True)
+        return generated.count() - before
+
+
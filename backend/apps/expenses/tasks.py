@@ -0,0 +1,13 @@
+from datetime import date
+
+from apps.tasks.services import task
+
+from .services import generate_recurring_expenses
+
+
+@task('expenses.generate_recurring')
+def generate_recurring_task(until=None):
+    """Create the expenses due from recurring templates; ``until`` is an ISO date."""
+    generate_recurring_expenses(until=date.fromisoformat(until) if until else None)
+
+
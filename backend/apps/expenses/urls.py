@@ -1,9 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ExpenseViewSet, ExpenseCategoryViewSet
+from .views import ExpenseViewSet, ExpenseCategoryViewSet, RecurringExpenseViewSet
 
 router = DefaultRouter()
 router.register('categories', ExpenseCategoryViewSet, basename='expense-categories')
+router.register('recurring', RecurringExpenseViewSet, basename='recurring-expenses')
 router.register('', ExpenseViewSet, basename='expenses')
 
 urlpatterns = [
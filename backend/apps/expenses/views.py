@@ -1,18 +1,31 @@
-from rest_framework import viewsets
-from django.db.models import Q, Sum
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django.db.models import Count, Q, Sum
 
-from .models import Expense, ExpenseCategory
-from .serializers import ExpenseSerializer, ExpenseCategorySerializer
+from .models import Expense, ExpenseCategory, RecurringExpense
+from .serializers import (
+    ExpenseSerializer, ExpenseCategorySerializer,
+    RecurringExpenseSerializer, GenerateRecurringSerializer
+)
+from .services import generate_recurring_expenses
+from store_backend.conditional import ConditionalGetMixin
+from store_backend.fieldsets import FieldsetViewMixin
 
 
-class ExpenseCategoryViewSet(viewsets.ModelViewSet):
+class ExpenseCategoryViewSet(ConditionalGetMixin, FieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for ExpenseCategory management."""
     
-    queryset = ExpenseCategory.objects.all()
+    # Meta.ordering does not apply to aggregated querysets
+    queryset = ExpenseCategory.objects.annotate(
+        expenses_total=Count('expenses'),
+        amount_total=Sum('expenses__amount')
+    ).order_by('name')
     serializer_class = ExpenseCategorySerializer
+    conditional_fields = ('updated_at', 'expenses__updated_at')
 
 
-class ExpenseViewSet(viewsets.ModelViewSet):
+class ExpenseViewSet(FieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for Expense management."""
     
     queryset = Expense.objects.select_related('category', 'user').all()
@@ -53,3 +66,34 @@ class ExpenseViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
+class RecurringExpenseViewSet(ConditionalGetMixin, FieldsetViewMixin, viewsets.ModelViewSet):
+    """ViewSet for recurring expense templates."""
+    
+    queryset = RecurringExpense.objects.select_related('category').all()
+    serializer_class = RecurringExpenseSerializer
+    conditional_fields = ('updated_at', 'category__updated_at')
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        
+        is_active = self.request.query_params.get('is_active')
+        if is_active is not None:
+            queryset = queryset.filter(is_active=is_active.lower() == 'true')
+        
+        return queryset
+    
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+    
+    @action(detail=False, methods=['post'])
+    def generate(self, request):
+        """Create every expense due up to ``until`` (defaults to today)."""
+        serializer = GenerateRecurringSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        generated = generate_recurring_expenses(
+            until=serializer.validated_data.get('until')
+        )
+        return Response({'generated': generated}, status=status.HTTP_200_OK)
+
+
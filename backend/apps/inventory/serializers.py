@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from .models import Inventory, InventoryMovement
+from apps.products.serializers import ProductSerializer
+from store_backend.fieldsets import FieldsetSerializerMixin
 
 
-class InventorySerializer(serializers.ModelSerializer):
+class InventorySerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for Inventory model."""
     
     product_name = serializers.CharField(source='product.name', read_only=True)
@@ -19,9 +21,16 @@ class InventorySerializer(serializers.ModelSerializer):
             'stock_status', 'updated_at'
         ]
         read_only_fields = ['id', 'updated_at']
+        expandable_fields = {'product': ProductSerializer}
+    
+    def validate_quantity(self, value):
+        # Stock changes go through movements (POST .../adjust/), which the change feed publishes
+        if self.instance is not None and value != self.instance.quantity:
+            raise serializers.ValidationError('La cantidad se modifica con un ajuste de stock')
+        return value
 
 
-class InventoryMovementSerializer(serializers.ModelSerializer):
+class InventoryMovementSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for InventoryMovement model."""
     
     movement_type_display = serializers.CharField(
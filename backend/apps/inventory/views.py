@@ -1,6 +1,7 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db import transaction
 from django.db.models import Q
 
 from .models import Inventory, InventoryMovement
@@ -9,13 +10,21 @@ from .serializers import (
     InventoryMovementSerializer,
     StockAdjustmentSerializer
 )
+from apps.outbox.models import OutboxEvent
+from apps.outbox.services import event, publish
+from store_backend.conditional import ConditionalGetMixin
+from store_backend.fieldsets import FieldsetViewMixin
 
 
-class InventoryViewSet(viewsets.ModelViewSet):
+class InventoryViewSet(ConditionalGetMixin, FieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for Inventory management."""
     
-    queryset = Inventory.objects.select_related('product').all()
+    # Ordered, so pages neither overlap nor skip rows
+    queryset = Inventory.objects.select_related('product').order_by('id')
     serializer_class = InventorySerializer
+    conditional_fields = ('updated_at', 'product__updated_at')
+    # No DELETE: it would drop the stock and its movements without a trace
+    http_method_names = ['get', 'post', 'put', 'patch', 'head', 'options']
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -23,8 +32,8 @@ class InventoryViewSet(viewsets.ModelViewSet):
         # Filter by stock status
         stock_status = self.request.query_params.get('status')
         if stock_status == 'low':
-            queryset = [inv for inv in queryset if inv.is_low_stock]
-            return Inventory.objects.filter(id__in=[i.id for i in queryset])
+            low = [inv.id for inv in queryset if inv.is_low_stock]
+            return queryset.filter(id__in=low)
         elif stock_status == 'out':
             queryset = queryset.filter(quantity__lte=0)
         
@@ -39,6 +48,22 @@ class InventoryViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    @transaction.atomic
+    def perform_create(self, serializer):
+        inventory = serializer.save()
+        if inventory.quantity:
+            # Opening stock is recorded like any other adjustment
+            movement = InventoryMovement.objects.create(
+                inventory=inventory,
+                movement_type=InventoryMovement.MovementType.ADJUSTMENT,
+                quantity=inventory.quantity,
+                previous_quantity=0,
+                new_quantity=inventory.quantity,
+                reason='Stock inicial',
+                user=self.request.user
+            )
+            publish(event(movement, OutboxEvent.Action.CREATED))
+    
     @action(detail=True, methods=['post'])
     def adjust(self, request, pk=None):
         """Adjust stock quantity."""
@@ -59,18 +84,20 @@ class InventoryViewSet(viewsets.ModelViewSet):
             else:  # adjustment
                 inventory.quantity = quantity
             
-            inventory.save()
-            
-            # Create movement record
-            InventoryMovement.objects.create(
-                inventory=inventory,
-                movement_type=movement_type,
-                quantity=quantity,
-                previous_quantity=previous_quantity,
-                new_quantity=inventory.quantity,
-                reason=reason,
-                user=request.user
-            )
+            with transaction.atomic():
+                inventory.save()
+                
+                # Create movement record
+                movement = InventoryMovement.objects.create(
+                    inventory=inventory,
+                    movement_type=movement_type,
+                    quantity=quantity,
+                    previous_quantity=previous_quantity,
+                    new_quantity=inventory.quantity,
+                    reason=reason,
+                    user=request.user
+                )
+                publish(event(movement, OutboxEvent.Action.CREATED))
             
             return Response(InventorySerializer(inventory).data)
         
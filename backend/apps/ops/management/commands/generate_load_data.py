@@ -0,0 +1,521 @@
+import random
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime, time as dt_time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import AutoField, Max
+from django.utils import timezone
+
+from apps.products.models import Category, Product
+from apps.inventory.models import Inventory, InventoryMovement
+from apps.clients.models import Client, Supplier
+from apps.clients.services import rebuild_stats
+from apps.sales.models import Sale, SaleItem, Invoice, Payment
+from apps.sales.services import INVOICE_SERIES
+from apps.quotes.models import Quote, QuoteItem
+from apps.expenses.models import Expense, ExpenseCategory
+from store_backend.config import get_config
+
+User = get_user_model()
+
+# Basket sizes and their weights: most tickets carry one to three lines
+BASKET_SIZES = [1, 2, 3, 4, 5, 6, 8, 10, 15]
+BASKET_WEIGHTS = [34, 24, 15, 10, 7, 4, 3, 2, 1]
+ITEM_QUANTITIES = [1, 2, 3, 4, 6, 12]
+ITEM_QUANTITY_WEIGHTS = [60, 20, 8, 5, 4, 3]
+# Store hours 08:00-21:59 with lunch and evening peaks
+HOUR_WEIGHTS = [3, 5, 7, 8, 10, 9, 6, 6, 7, 8, 9, 8, 5, 3]
+PAYMENT_METHODS = ['cash', 'card', 'transfer', 'credit']
+PAYMENT_WEIGHTS = [50, 30, 10, 10]
+INVOICE_TYPES = ['boleta', 'factura', 'nota_venta']
+INVOICE_WEIGHTS = [70, 20, 10]
+QUOTE_STATUSES = ['draft', 'sent', 'accepted', 'rejected']
+QUOTE_STATUS_WEIGHTS = [20, 40, 25, 15]
+CANCELLED_RATE = 0.03
+CLIENT_RATE = 0.6
+RESTOCK_UNITS = 500
+
+CATEGORY_NAMES = [
+    'Electrónicos', 'Ropa', 'Alimentos', 'Hogar', 'Oficina',
+    'Limpieza', 'Bebidas', 'Ferretería', 'Juguetes', 'Librería'
+]
+EXPENSE_CATEGORY_NAMES = [
+    'Servicios', 'Alquiler', 'Sueldos', 'Proveedores', 'Marketing', 'Otros'
+]
+FIRST_NAMES = [
+    'Juan', 'María', 'Carlos', 'Ana', 'Luis', 'Rosa', 'Jorge', 'Lucía',
+    'Pedro', 'Carmen', 'Miguel', 'Elena', 'José', 'Patricia', 'Diego', 'Sofía'
+]
+LAST_NAMES = [
+    'Pérez', 'García', 'Rodríguez', 'Quispe', 'Flores', 'Sánchez', 'Ramírez',
+    'Torres', 'Mamani', 'Vargas', 'Castillo', 'Rojas', 'Huamán', 'Chávez'
+]
+PRODUCT_WORDS = [
+    'Básico', 'Premium', 'Eco', 'Pro', 'Max', 'Mini', 'Plus', 'Clásico',
+    'Deluxe', 'Compacto', 'Familiar', 'Express'
+]
+
+
+def cents(value):
+    return Decimal(value).scaleb(-2)
+
+
+@contextmanager
+def backdating(*models):
+    """Let bulk_create keep the created_at/updated_at values we assign."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class RowWriter:
+    """
+    INSERTs plain tuples with executemany() for the high-volume tables,
+    skipping model instances. Values are given already adapted for the
+    backend; fields that are not listed get their model default.
+    """
+    
+    def __init__(self, model, names):
+        opts = model._meta
+        given = [opts.get_field(name) for name in names]
+        rest = [
+            field for field in opts.concrete_fields
+            if field not in given and not isinstance(field, AutoField)
+        ]
+        self.defaults = tuple(
+            field.get_db_prep_save(field.get_default(), connection) for field in rest
+        )
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(field.column) for field in given + rest)
+        placeholders = ', '.join(['%s'] * (len(given) + len(rest)))
+        self.sql = f'INSERT INTO {quote(opts.db_table)} ({columns}) VALUES ({placeholders})'
+        self.rows = []
+        self.count = 0
+    
+    def add(self, *values):
+        self.rows.append(values + self.defaults)
+    
+    def flush(self, cursor):
+        if self.rows:
+            cursor.executemany(self.sql, self.rows)
+            self.count += len(self.rows)
+            self.rows = []
+
+
+class Command(BaseCommand):
+    help = 'Generate reproducible production-scale data for benchmarks'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=2000)
+        parser.add_argument('--clients', type=int, default=5000)
+        parser.add_argument('--suppliers', type=int, default=200)
+        parser.add_argument('--sellers', type=int, default=10)
+        parser.add_argument('--sales', type=int, default=100000)
+        parser.add_argument('--quotes', type=int, default=5000)
+        parser.add_argument('--expenses', type=int, default=5000)
+        parser.add_argument('--days', type=int, default=365, help='Date span ending at --end')
+        parser.add_argument(
+            '--end',
+            type=date.fromisoformat,
+            help='Last day of data (YYYY-MM-DD); with the same --seed the dataset is identical. Default: now'
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--prefix',
+            default='LD',
+            help='Prefix for SKUs, documents and usernames, so runs never collide'
+        )
+    
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.prefix = options['prefix']
+        if options['end']:
+            # Data runs through the whole day; quotes expire as they would on it
+            self.end = timezone.make_aware(datetime.combine(options['end'] + timedelta(days=1), dt_time.min))
+            self.today = options['end']
+        else:
+            self.end = timezone.now().replace(minute=0, second=0, microsecond=0)
+            self.today = timezone.localdate()
+        self.start = self.end - timedelta(days=options['days'])
+        igv_rate = Decimal(str(get_config('igv_rate', 0.18)))
+        # IGV in basis points, so line amounts can be computed in integer cents
+        self.igv_bp = int(igv_rate * 10000)
+        # Bound once: going through the connection proxy per value is measurable
+        self.adapt_decimal = connection.ops.adapt_decimalfield_value
+        self.moment = connection.ops.adapt_datetimefield_value
+        
+        if Product.objects.filter(sku__startswith=f'{self.prefix}-').exists():
+            raise CommandError(
+                f'Ya existen datos con el prefijo {self.prefix}; use otro --prefix'
+            )
+        
+        started = time.monotonic()
+        with backdating(Client, Supplier, Product, Inventory):
+            self.create_catalog(options)
+        self.create_sales(options['sales'])
+        self.step('Quotes', lambda: self.create_quotes(options['quotes']))
+        self.step('Expenses', lambda: self.create_expenses(options['expenses']))
+        
+        # Rows were inserted with explicit ids; move PostgreSQL sequences past them
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [Sale, Quote]):
+                cursor.execute(sql)
+        
+        self.step('Client statistics', rebuild_stats)
+        self.stdout.write(self.style.SUCCESS(
+            f'Load data generated in {time.monotonic() - started:.1f}s (seed {options["seed"]})'
+        ))
+    
+    def step(self, label, func):
+        started = time.monotonic()
+        result = func()
+        self.stdout.write(f'{label}: {time.monotonic() - started:.1f}s')
+        return result
+    
+    def bulk(self, model, objs):
+        with transaction.atomic():
+            return model.objects.bulk_create(objs, batch_size=self.batch_size)
+    
+    def random_moment(self, start, end):
+        """A timestamp between start and end (capped at the end), during store hours."""
+        day = timezone.localtime(
+            start + timedelta(seconds=self.rng.random() * (end - start).total_seconds())
+        )
+        hour = 8 + self.rng.choices(range(len(HOUR_WEIGHTS)), HOUR_WEIGHTS)[0]
+        value = day.replace(
+            hour=hour,
+            minute=self.rng.randrange(60),
+            second=self.rng.randrange(60),
+            microsecond=0
+        ).astimezone(dt_timezone.utc)
+        return min(value, self.end)
+    
+    def money(self, value):
+        """Integer cents adapted for a DecimalField(max_digits=12, decimal_places=2)."""
+        return self.adapt_decimal(cents(value), 12, 2)
+    
+    def person_name(self):
+        return (
+            f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)} '
+            f'{self.rng.choice(LAST_NAMES)}'
+        )
+    
+    def line_amounts(self, index, quantity):
+        """(subtotal, igv) in cents for `quantity` units of product `index`."""
+        subtotal = quantity * self.price_cents[index]
+        igv = (subtotal * self.igv_bp + 5000) // 10000 if self.products[index].apply_igv else 0
+        return subtotal, igv
+    
+    def pick_products(self, count):
+        return self.rng.choices(
+            range(len(self.products)), cum_weights=self.product_cum_weights, k=count
+        )
+    
+    def next_id(self, model):
+        return (model.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+    
+    def create_catalog(self, options):
+        rng, prefix = self.rng, self.prefix
+        
+        self.sellers = self.step('Sellers', lambda: self.bulk(User, [
+            User(
+                username=f'{prefix.lower()}_seller{index}',
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                role=User.Role.SELLER,
+                password='!'
+            )
+            for index in range(options['sellers'])
+        ]))
+        self.seller_ids = [seller.id for seller in self.sellers]
+        
+        categories = [Category.objects.get_or_create(name=name)[0] for name in CATEGORY_NAMES]
+        self.expense_category_ids = [
+            ExpenseCategory.objects.get_or_create(name=name)[0].id
+            for name in EXPENSE_CATEGORY_NAMES
+        ]
+        
+        products = []
+        for index in range(options['products']):
+            # Log-normal prices between a few soles and a few thousand
+            price = max(100, int(rng.lognormvariate(3.5, 1.2) * 100))
+            created_at = self.random_moment(self.start - timedelta(days=90), self.start)
+            products.append(Product(
+                sku=f'{prefix}-{index:07d}',
+                barcode=f'{prefix}{index:011d}',
+                name=f'{rng.choice(CATEGORY_NAMES)} {rng.choice(PRODUCT_WORDS)} {index}',
+                category=rng.choice(categories),
+                price=cents(price),
+                cost=cents(price * rng.randint(55, 85) // 100),
+                apply_igv=rng.random() < 0.9,
+                created_at=created_at,
+                updated_at=created_at
+            ))
+        self.products = self.step('Products', lambda: self.bulk(Product, products))
+        self.price_cents = [int(product.price * 100) for product in self.products]
+        self.price_values = [self.money(price) for price in self.price_cents]
+        
+        # Popularity follows a Zipf-like curve over a shuffled catalog
+        ranking = list(range(len(self.products)))
+        rng.shuffle(ranking)
+        weights = [0.0] * len(self.products)
+        for rank, index in enumerate(ranking, start=1):
+            weights[index] = 1 / rank ** 1.1
+        self.product_cum_weights = []
+        total = 0.0
+        for weight in weights:
+            total += weight
+            self.product_cum_weights.append(total)
+        
+        inventories = []
+        for product in self.products:
+            inventories.append(Inventory(
+                product=product,
+                quantity=rng.randint(50, 1000),
+                min_quantity=rng.choice([0, 5, 10, 20, 50]),
+                updated_at=product.created_at
+            ))
+        self.inventories = self.step('Inventories', lambda: self.bulk(Inventory, inventories))
+        self.stock = [inventory.quantity for inventory in self.inventories]
+        
+        clients = []
+        for index in range(options['clients']):
+            is_company = rng.random() < 0.2
+            created_at = self.random_moment(self.start - timedelta(days=90), self.end)
+            clients.append(Client(
+                name=(
+                    f'{rng.choice(LAST_NAMES)} {rng.choice(PRODUCT_WORDS)} S.A.C.'
+                    if is_company else self.person_name()
+                ),
+                document_type='ruc' if is_company else 'dni',
+                document_number=f'{prefix}{index:09d}',
+                email=f'cliente{index}@example.com' if rng.random() < 0.5 else '',
+                created_at=created_at,
+                updated_at=created_at
+            ))
+        clients = self.step('Clients', lambda: self.bulk(Client, clients))
+        self.client_ids = [client.id for client in clients]
+        
+        suppliers = []
+        for index in range(options['suppliers']):
+            created_at = self.random_moment(self.start - timedelta(days=90), self.end)
+            suppliers.append(Supplier(
+                name=f'Distribuidora {rng.choice(LAST_NAMES)} {index} S.A.C.',
+                ruc=f'{prefix[:2]}{index:09d}',
+                contact_name=self.person_name(),
+                created_at=created_at,
+                updated_at=created_at
+            ))
+        self.step('Suppliers', lambda: self.bulk(Supplier, suppliers))
+    
+    def create_sales(self, count):
+        """
+        Sales are generated chunk by chunk in chronological order, so the
+        stock each movement records is a consistent running balance.
+        """
+        rng, money, moment = self.rng, self.money, self.moment
+        sales = RowWriter(Sale, [
+            'id', 'client', 'seller', 'payment_method', 'status', 'subtotal', 'igv',
+            'total', 'amount_paid', 'created_at', 'updated_at'
+        ])
+        items = RowWriter(SaleItem, [
+            'sale', 'product', 'quantity', 'unit_price', 'subtotal', 'igv', 'total'
+        ])
+        invoices = RowWriter(Invoice, ['sale', 'invoice_type', 'series', 'number', 'issued_at'])
+        payments = RowWriter(Payment, ['sale', 'amount', 'method', 'user', 'paid_at', 'created_at'])
+        movements = RowWriter(InventoryMovement, [
+            'inventory', 'movement_type', 'quantity', 'previous_quantity', 'new_quantity',
+            'reason', 'user', 'created_at'
+        ])
+        writers = [sales, items, invoices, payments, movements]
+        
+        invoice_numbers = {}
+        for invoice_type in INVOICE_TYPES:
+            last = Invoice.objects.filter(invoice_type=invoice_type).order_by('-id').first()
+            invoice_numbers[invoice_type] = int(last.number) if last else 0
+        sale_id = self.next_id(Sale)
+        chunks = max(1, -(-count // self.batch_size))
+        span = (self.end - self.start) / chunks
+        started = time.monotonic()
+        
+        for chunk in range(chunks):
+            size = min(self.batch_size, count - chunk * self.batch_size)
+            chunk_start = self.start + span * chunk
+            moments = sorted(self.random_moment(chunk_start, chunk_start + span) for _ in range(size))
+            basket_sizes = rng.choices(BASKET_SIZES, BASKET_WEIGHTS, k=size)
+            touched = set()
+            
+            for created_at, basket_size in zip(moments, basket_sizes):
+                at = moment(created_at)
+                method = rng.choices(PAYMENT_METHODS, PAYMENT_WEIGHTS)[0]
+                client_id = (
+                    rng.choice(self.client_ids)
+                    if method == 'credit' or rng.random() < CLIENT_RATE else None
+                )
+                seller_id = rng.choice(self.seller_ids)
+                cancelled = rng.random() < CANCELLED_RATE
+                
+                lines = {}
+                for index in self.pick_products(basket_size):
+                    quantity = rng.choices(ITEM_QUANTITIES, ITEM_QUANTITY_WEIGHTS)[0]
+                    lines[index] = lines.get(index, 0) + quantity
+                
+                subtotal = igv = 0
+                for index, quantity in lines.items():
+                    line_subtotal, line_igv = self.line_amounts(index, quantity)
+                    subtotal += line_subtotal
+                    igv += line_igv
+                    items.add(
+                        sale_id, self.products[index].id, quantity, self.price_values[index],
+                        money(line_subtotal), money(line_igv), money(line_subtotal + line_igv)
+                    )
+                    if not cancelled:
+                        self.stock_movements(movements, index, quantity, sale_id, seller_id, at)
+                        touched.add(index)
+                total = subtotal + igv
+                
+                paid = rng.choice([0, total // 2, total, total]) if method == 'credit' else 0
+                sales.add(
+                    sale_id, client_id, seller_id, method,
+                    'cancelled' if cancelled else 'completed',
+                    money(subtotal), money(igv), money(total), money(paid), at, at
+                )
+                if paid:
+                    paid_at = moment(min(self.end, created_at + timedelta(days=rng.randint(0, 60))))
+                    payments.add(
+                        sale_id, money(paid), rng.choice(['cash', 'card', 'transfer']),
+                        seller_id, paid_at, paid_at
+                    )
+                
+                invoice_type = rng.choices(INVOICE_TYPES, INVOICE_WEIGHTS)[0]
+                invoice_numbers[invoice_type] += 1
+                invoices.add(
+                    sale_id, invoice_type, INVOICE_SERIES[invoice_type],
+                    str(invoice_numbers[invoice_type]).zfill(8), at
+                )
+                sale_id += 1
+            
+            with transaction.atomic(), connection.cursor() as cursor:
+                for writer in writers:
+                    writer.flush(cursor)
+                inventories = []
+                for index in touched:
+                    inventory = self.inventories[index]
+                    inventory.quantity = self.stock[index]
+                    inventory.updated_at = moments[-1]
+                    inventories.append(inventory)
+                Inventory.objects.bulk_update(
+                    inventories, ['quantity', 'updated_at'], batch_size=self.batch_size
+                )
+            
+            done = chunk * self.batch_size + size
+            self.stdout.write(
+                f'\rSales: {done}/{count} ({done / (time.monotonic() - started):.0f}/s)',
+                ending=''
+            )
+        self.stdout.write(
+            f'\nSales: {time.monotonic() - started:.1f}s '
+            f'({items.count} items, {movements.count} movements, {payments.count} payments)'
+        )
+    
+    def stock_movements(self, movements, index, quantity, sale_id, seller_id, at):
+        """OUT movement for a sale line, preceded by a restock when it runs short."""
+        inventory_id = self.inventories[index].id
+        if self.stock[index] < quantity:
+            previous = self.stock[index]
+            self.stock[index] += RESTOCK_UNITS
+            movements.add(
+                inventory_id, 'in', RESTOCK_UNITS, previous, self.stock[index],
+                'Reposición', seller_id, at
+            )
+        previous = self.stock[index]
+        self.stock[index] -= quantity
+        movements.add(
+            inventory_id, 'out', quantity, previous, self.stock[index],
+            f'Venta #{sale_id}', seller_id, at
+        )
+    
+    def create_quotes(self, count):
+        rng, money, moment = self.rng, self.money, self.moment
+        today = self.today
+        quotes = RowWriter(Quote, [
+            'id', 'client', 'user', 'quote_number', 'status', 'valid_until',
+            'subtotal', 'igv', 'total', 'created_at', 'updated_at'
+        ])
+        items = RowWriter(QuoteItem, [
+            'quote', 'product', 'quantity', 'unit_price', 'subtotal', 'igv', 'total'
+        ])
+        quote_id = self.next_id(Quote)
+        per_month = defaultdict(int)
+        
+        for created_at in sorted(self.random_moment(self.start, self.end) for _ in range(count)):
+            local = timezone.localtime(created_at)
+            # Same numbering as QuoteViewSet, continuing each month's sequence
+            prefix = f"COT-{local.strftime('%Y%m')}"
+            if prefix not in per_month:
+                per_month[prefix] = Quote.objects.filter(quote_number__startswith=prefix).count()
+            per_month[prefix] += 1
+            
+            valid_until = local.date() + timedelta(days=rng.choice([7, 15, 30]))
+            status = rng.choices(QUOTE_STATUSES, QUOTE_STATUS_WEIGHTS)[0]
+            if status in ('draft', 'sent') and valid_until < today:
+                status = 'expired'
+            
+            subtotal = igv = 0
+            for index in self.pick_products(rng.randint(1, 5)):
+                line_subtotal, line_igv = self.line_amounts(index, 1)
+                subtotal += line_subtotal
+                igv += line_igv
+                items.add(
+                    quote_id, self.products[index].id, 1, self.price_values[index],
+                    money(line_subtotal), money(line_igv), money(line_subtotal + line_igv)
+                )
+            at = moment(created_at)
+            quotes.add(
+                quote_id, rng.choice(self.client_ids), rng.choice(self.seller_ids),
+                f'{prefix}-{str(per_month[prefix]).zfill(4)}', status,
+                connection.ops.adapt_datefield_value(valid_until),
+                money(subtotal), money(igv), money(subtotal + igv), at, at
+            )
+            quote_id += 1
+        
+        with transaction.atomic(), connection.cursor() as cursor:
+            quotes.flush(cursor)
+            items.flush(cursor)
+    
+    def create_expenses(self, count):
+        rng = self.rng
+        expenses = RowWriter(Expense, [
+            'category', 'description', 'amount', 'payment_method', 'date', 'user',
+            'created_at', 'updated_at'
+        ])
+        for _ in range(count):
+            created_at = self.random_moment(self.start, self.end)
+            at = self.moment(created_at)
+            expenses.add(
+                rng.choice(self.expense_category_ids),
+                f'Gasto {rng.choice(PRODUCT_WORDS).lower()}',
+                self.money(max(500, int(rng.lognormvariate(5, 1.3) * 100))),
+                rng.choice(['cash', 'card', 'transfer']),
+                connection.ops.adapt_datefield_value(timezone.localtime(created_at).date()),
+                rng.choice(self.seller_ids), at, at
+            )
+        with transaction.atomic(), connection.cursor() as cursor:
+            expenses.flush(cursor)
@@ -0,0 +1,60 @@
+import os
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+
+class Command(BaseCommand):
+    help = 'Copy the SQLite database to the read replica with the online backup API'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Keep refreshing every N seconds instead of copying once'
+        )
+    
+    def handle(self, *args, **options):
+        source = settings.DATABASES[DEFAULT_DB_ALIAS]
+        target = settings.REPLICA_SQLITE_PATH
+        if 'sqlite3' not in source['ENGINE'] or not target:
+            raise CommandError(
+                'La réplica solo se copia con SQLite y DB_REPLICA_NAME definido'
+            )
+        
+        while True:
+            started = time.monotonic()
+            self.copy(str(source['NAME']), target)
+            self.stdout.write(self.style.SUCCESS(
+                f'Replica refreshed in {time.monotonic() - started:.2f}s'
+            ))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
+    
+    def copy(self, source_path, target_path):
+        """
+        Back up into a temporary file and rename it over the replica.
+
+        The backup API copies a consistent snapshot without blocking
+        writers for the whole copy, and the rename means readers see
+        either the old or the new copy, never a partial one.
+        """
+        tmp_path = f'{target_path}.tmp'
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(tmp_path)
+        try:
+            source.backup(target, pages=1024)
+            # A WAL-mode copy would need -wal/-shm files next to it
+            target.execute('PRAGMA journal_mode = DELETE')
+        finally:
+            target.close()
+            source.close()
+        os.replace(tmp_path, target_path)
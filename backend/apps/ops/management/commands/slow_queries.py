@@ -0,0 +1,60 @@
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Summarize the slow query log by SQL fingerprint'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--path', help='Log file (defaults to SLOW_QUERY_LOG_PATH)')
+        parser.add_argument('--top', type=int, default=10, help='Fingerprints to show')
+        parser.add_argument(
+            '--sort',
+            choices=['total', 'count', 'max', 'avg'],
+            default='total',
+            help='Order by total time (default), occurrences, worst or average duration'
+        )
+        parser.add_argument('--plans', action='store_true', help='Print the captured plans')
+    
+    def handle(self, *args, **options):
+        path = options['path'] or settings.SLOW_QUERY_LOG_PATH
+        try:
+            with open(path, encoding='utf-8') as log:
+                entries = [json.loads(line) for line in log if line.strip()]
+        except FileNotFoundError:
+            raise CommandError(f'No existe el registro {path}')
+        
+        groups = defaultdict(lambda: {
+            'count': 0, 'total': 0.0, 'max': 0.0, 'views': set(), 'sql': '', 'plan': None
+        })
+        for entry in entries:
+            group = groups[entry['fingerprint']]
+            group['count'] += 1
+            group['total'] += entry['duration_ms']
+            group['max'] = max(group['max'], entry['duration_ms'])
+            group['views'].add(entry['view'])
+            group['sql'] = entry['sql']
+            if entry.get('plan'):
+                group['plan'] = entry['plan']
+        
+        for group in groups.values():
+            group['avg'] = group['total'] / group['count']
+        ranked = sorted(groups.items(), key=lambda item: item[1][options['sort']], reverse=True)
+        
+        self.stdout.write(
+            f'{len(entries)} slow queries, {len(groups)} distinct statements in {path}\n'
+        )
+        for key, group in ranked[:options['top']]:
+            self.stdout.write(self.style.WARNING(
+                f"{key}  count={group['count']}  total={group['total']:.1f}ms  "
+                f"avg={group['avg']:.1f}ms  max={group['max']:.1f}ms"
+            ))
+            self.stdout.write(f"  views: {', '.join(sorted(group['views']))}")
+            self.stdout.write(f"  sql: {group['sql'][:300]}")
+            if options['plans'] and group['plan']:
+                for step in group['plan']:
+                    self.stdout.write(f'    {step}')
+            self.stdout.write('')
@@ -0,0 +1,22 @@
+from django.contrib import admin
+
+from .models import OutboxEvent
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ['id', 'topic', 'action', 'object_id', 'created_at']
+    list_filter = ['topic', 'action']
+    search_fields = ['object_id']
+    
+    # The feed is append-only: consumers may already have read any event
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
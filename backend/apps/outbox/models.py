@@ -0,0 +1,27 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class OutboxEvent(models.Model):
+    """Change to a sale, invoice or stock movement; the id is its sequence in the change feed."""
+    
+    class Action(models.TextChoices):
+        CREATED = 'created', 'Creado'
+        UPDATED = 'updated', 'Actualizado'
+        DELETED = 'deleted', 'Eliminado'
+    
+    topic = models.CharField(max_length=100, verbose_name='Tema')
+    action = models.CharField(max_length=20, choices=Action.choices, verbose_name='Acción')
+    object_id = models.BigIntegerField(verbose_name='ID del objeto')
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder, verbose_name='Datos')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Evento de cambio'
+        verbose_name_plural = 'Eventos de cambio'
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"#{self.id} {self.topic} {self.object_id} {self.action}"
+
+
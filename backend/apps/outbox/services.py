@@ -0,0 +1,52 @@
+"""
+Transactional outbox behind the change feed.
+
+Write paths describe what they changed with ``event`` and call ``publish``
+inside the transaction that made the change, so an event is committed
+together with its change or not at all. The event id is the feed sequence.
+
+Consumers read ``id > after``, so an event must never become visible after
+one with a higher id. SQLite serializes writers, which gives that for free;
+on PostgreSQL ``publish`` takes a transaction-level advisory lock, so
+publishing transactions allocate ids and commit one after another. Call it
+as the last write of the transaction to keep the locked stretch short.
+"""
+from django.db import transaction
+
+from .models import OutboxEvent
+
+# Arbitrary application-wide key for pg_advisory_xact_lock
+PUBLISH_LOCK_ID = 0x0B0C5E9
+
+
+def snapshot(instance):
+    """Column values of a model instance (foreign keys as ``<name>_id``)."""
+    return {field.attname: field.value_from_object(instance) for field in instance._meta.concrete_fields}
+
+
+def event(instance, action, **extra):
+    """Unsaved event for ``instance``; ``extra`` is merged into its snapshot."""
+    return OutboxEvent(
+        topic=instance._meta.label_lower,
+        action=action,
+        object_id=instance.pk,
+        payload={**snapshot(instance), **extra}
+    )
+
+
+def publish(*events):
+    """Write ``events`` in the current transaction, in sequence order."""
+    # No savepoint: the events go or stay with the caller's transaction
+    with transaction.atomic(savepoint=False):
+        connection = transaction.get_connection()
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s)', [PUBLISH_LOCK_ID])
+        return OutboxEvent.objects.bulk_create(events)
+
+
+def events_after(seq, limit):
+    """Up to ``limit`` events with a sequence above ``seq``, oldest first."""
+    return list(OutboxEvent.objects.filter(id__gt=seq).order_by('id')[:limit])
+
+
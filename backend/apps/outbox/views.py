@@ -0,0 +1,61 @@
+"""
+Change feed: ``GET /api/changes/?after=<seq>``.
+
+Returns the events after ``after`` in sequence order, at most ``limit`` per
+response. When there are none yet it long-polls, checking the outbox every
+``CHANGE_FEED_POLL_INTERVAL`` seconds for up to ``wait`` seconds, then
+answers with an empty batch. Consumers pass the ``last_seq`` of each
+response as the next ``after``, and ask again right away while ``has_more``
+is true.
+
+An async view, like the async reports, so a waiting consumer does not hold
+a worker thread under ASGI.
+"""
+import asyncio
+import time
+
+from django.conf import settings
+from rest_framework.exceptions import APIException, MethodNotAllowed
+
+from apps.reports.async_views import authenticate, int_param, json_response, run_query
+from .services import events_after
+
+
+def serialize(event):
+    return {
+        'seq': event.id,
+        'topic': event.topic,
+        'action': event.action,
+        'object_id': event.object_id,
+        'data': event.payload,
+        'created_at': event.created_at,
+    }
+
+
+async def change_feed(request):
+    """Events after ``?after=``, waiting up to ``?wait=`` seconds for new ones."""
+    try:
+        if request.method != 'GET':
+            raise MethodNotAllowed(request.method)
+        await authenticate(request)
+        after = max(int_param(request, 'after', 0), 0)
+        limit = min(max(int_param(request, 'limit', settings.CHANGE_FEED_BATCH_SIZE), 1), settings.CHANGE_FEED_MAX_BATCH_SIZE)
+        wait = min(max(int_param(request, 'wait', settings.CHANGE_FEED_WAIT), 0), settings.CHANGE_FEED_WAIT)
+        
+        deadline = time.monotonic() + wait
+        # One extra row tells whether another batch is waiting
+        events = await run_query(events_after, after, limit + 1)
+        while not events and time.monotonic() < deadline:
+            await asyncio.sleep(settings.CHANGE_FEED_POLL_INTERVAL)
+            events = await run_query(events_after, after, limit + 1)
+    except APIException as exc:
+        return json_response({'detail': exc.detail}, status=exc.status_code)
+    
+    batch = events[:limit]
+    return json_response({
+        'events': [serialize(event) for event in batch],
+        'last_seq': batch[-1].id if batch else after,
+        'has_more': len(events) > limit,
+    })
+
+
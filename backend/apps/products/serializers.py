@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from .models import Product, Category
+from store_backend.fieldsets import FieldsetSerializerMixin
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for Category model."""
     
     products_count = serializers.SerializerMethodField()
@@ -10,12 +11,16 @@ class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'description', 'products_count', 'created_at']
+        annotated_fields = ['products_count']
     
     def get_products_count(self, obj):
+        # Annotated by CategoryViewSet
+        if hasattr(obj, 'products_total'):
+            return obj.products_total
         return obj.products.count()
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for Product model."""
     
     category_name = serializers.CharField(source='category.name', read_only=True)
@@ -30,9 +35,10 @@ class ProductSerializer(serializers.ModelSerializer):
             'igv_amount', 'image', 'is_active', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = {'category': CategorySerializer}
 
 
-class ProductListSerializer(serializers.ModelSerializer):
+class ProductListSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Simplified serializer for product lists."""
     
     category_name = serializers.CharField(source='category.name', read_only=True)
@@ -44,6 +50,7 @@ class ProductListSerializer(serializers.ModelSerializer):
             'id', 'name', 'barcode', 'sku', 'category_name',
             'price', 'is_active', 'stock'
         ]
+        expandable_fields = {'category': CategorySerializer}
     
     def get_stock(self, obj):
         inventory = getattr(obj, 'inventory', None)
@@ -1,23 +1,28 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q
+from django.db.models import Count, Q
 
 from .models import Product, Category
 from .serializers import ProductSerializer, ProductListSerializer, CategorySerializer
+from store_backend.conditional import ConditionalGetMixin
+from store_backend.fieldsets import FieldsetViewMixin
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, FieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for Category management."""
     
-    queryset = Category.objects.all()
+    # Meta.ordering does not apply to aggregated querysets
+    queryset = Category.objects.annotate(products_total=Count('products')).order_by('name')
+    conditional_fields = ('updated_at', 'products__updated_at')
     serializer_class = CategorySerializer
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(ConditionalGetMixin, FieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for Product management."""
     
-    queryset = Product.objects.select_related('category').all()
+    queryset = Product.objects.select_related('category', 'inventory').all()
+    conditional_fields = ('updated_at', 'category__updated_at', 'inventory__updated_at')
     
     def get_serializer_class(self):
         if self.action == 'list':
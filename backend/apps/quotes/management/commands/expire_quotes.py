@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from apps.quotes.models import Quote
+from apps.quotes.services import expire_overdue_quotes
+
+
+class Command(BaseCommand):
+    help = 'Mark draft and sent quotes past their validity date as expired'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many quotes would be expired'
+        )
+    
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = Quote.objects.overdue().count()
+            self.stdout.write(f'{count} quotes would be expired')
+            return
+        
+        count = expire_overdue_quotes()
+        self.stdout.write(self.style.SUCCESS(f'Expired {count} quotes'))
+
+
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0002_initial'),
+        ('quotes', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quote',
+            name='sale',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='quote', to='sales.sale', verbose_name='Venta'),
+        ),
+    ]
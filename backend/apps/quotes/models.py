@@ -1,10 +1,36 @@
+from decimal import Decimal, ROUND_HALF_UP
+
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from apps.products.models import Product
 from apps.clients.models import Client
+from apps.sales.models import Sale
 from store_backend.config import get_config
 
 
+CENTS = Decimal('0.01')
+
+
+class QuoteQuerySet(models.QuerySet):
+    """Custom queryset for quotes."""
+    
+    def overdue(self, today=None):
+        """Open quotes whose validity date has passed."""
+        today = today or timezone.localdate()
+        return self.filter(
+            status__in=[Quote.Status.DRAFT, Quote.Status.SENT],
+            valid_until__lt=today
+        )
+    
+    def expire_overdue(self, today=None):
+        """Mark overdue quotes as expired with a single UPDATE. Returns rows touched."""
+        return self.overdue(today).update(
+            status=Quote.Status.EXPIRED,
+            updated_at=timezone.now()
+        )
+
+
 class Quote(models.Model):
     """Quote/Cotización model."""
     
@@ -64,22 +90,36 @@ class Quote(models.Model):
         blank=True,
         verbose_name='Válido hasta'
     )
+    sale = models.OneToOneField(
+        Sale,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='quote',
+        verbose_name='Venta'
+    )
     notes = models.TextField(blank=True, verbose_name='Notas')
     terms = models.TextField(blank=True, verbose_name='Términos y condiciones')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = QuoteQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Cotización'
         verbose_name_plural = 'Cotizaciones'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'valid_until'], name='quote_status_valid_idx'),
+        ]
     
     def __str__(self):
         return f"Cotización {self.quote_number}"
     
-    def calculate_totals(self):
-        """Calculate quote totals from items."""
-        items = self.items.all()
+    def calculate_totals(self, items=None):
+        """Calculate quote totals from items. Pass items already in memory to skip the query."""
+        if items is None:
+            items = self.items.all()
         self.subtotal = sum(item.subtotal for item in items)
         self.igv = sum(item.igv for item in items)
         self.total = sum(item.total for item in items)
@@ -131,15 +171,29 @@ class QuoteItem(models.Model):
     def __str__(self):
         return f"{self.product.name} x {self.quantity}"
     
-    def save(self, *args, **kwargs):
-        """Calculate item totals before saving."""
-        self.subtotal = self.quantity * self.unit_price
-        if self.product.apply_igv:
+    def calculate_totals(self, apply_igv=None, igv_rate=None):
+        """
+        Calculate item totals.
+        
+        Pass apply_igv and igv_rate when building many items at once so the
+        product and the configuration are not read again for every line.
+        """
+        if apply_igv is None:
+            apply_igv = self.product.apply_igv
+        if igv_rate is None:
             igv_rate = get_config('igv_rate', 0.18)
-            self.igv = float(self.subtotal) * igv_rate
+        self.subtotal = self.quantity * Decimal(str(self.unit_price))
+        if apply_igv:
+            self.igv = (self.subtotal * Decimal(str(igv_rate))).quantize(
+                CENTS, rounding=ROUND_HALF_UP
+            )
         else:
-            self.igv = 0
-        self.total = float(self.subtotal) + self.igv
+            self.igv = Decimal('0')
+        self.total = self.subtotal + self.igv
+    
+    def save(self, *args, **kwargs):
+        """Calculate item totals before saving."""
+        self.calculate_totals()
         super().save(*args, **kwargs)
 
 
@@ -1,8 +1,11 @@
 from rest_framework import serializers
 from .models import Quote, QuoteItem
+from apps.clients.serializers import ClientSerializer
+from apps.sales.models import Sale, Invoice
+from store_backend.fieldsets import FieldsetSerializerMixin
 
 
-class QuoteItemSerializer(serializers.ModelSerializer):
+class QuoteItemSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for QuoteItem model."""
     
     product_name = serializers.CharField(source='product.name', read_only=True)
@@ -17,7 +20,7 @@ class QuoteItemSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'subtotal', 'igv', 'total']
 
 
-class QuoteSerializer(serializers.ModelSerializer):
+class QuoteSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for Quote model."""
     
     items = QuoteItemSerializer(many=True, read_only=True)
@@ -33,13 +36,28 @@ class QuoteSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'client', 'client_name', 'user', 'user_name',
             'quote_number', 'subtotal', 'igv', 'total', 'status',
-            'status_display', 'valid_until', 'notes', 'terms',
+            'status_display', 'valid_until', 'sale', 'notes', 'terms',
             'items', 'created_at', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'subtotal', 'igv', 'total', 'user',
+            'id', 'subtotal', 'igv', 'total', 'user', 'sale',
             'created_at', 'updated_at'
         ]
+        expandable_fields = {'client': ClientSerializer}
+
+
+class QuoteLineSerializer(serializers.Serializer):
+    """Serializer for quote lines sent on create and edit."""
+    
+    id = serializers.IntegerField(required=False)
+    product = serializers.IntegerField()
+    description = serializers.CharField(required=False, allow_blank=True)
+    quantity = serializers.IntegerField(min_value=1)
+    unit_price = serializers.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        required=False
+    )
 
 
 class CreateQuoteSerializer(serializers.Serializer):
@@ -49,9 +67,31 @@ class CreateQuoteSerializer(serializers.Serializer):
     valid_until = serializers.DateField(required=False, allow_null=True)
     notes = serializers.CharField(required=False, allow_blank=True)
     terms = serializers.CharField(required=False, allow_blank=True)
-    items = serializers.ListField(
-        child=serializers.DictField(),
-        min_length=1
+    items = QuoteLineSerializer(many=True, allow_empty=False)
+
+
+class EditQuoteItemsSerializer(serializers.Serializer):
+    """
+    Serializer for editing quote lines.
+    
+    Lines with an id update the existing item, lines without id are created
+    and existing items not listed are removed.
+    """
+    
+    items = QuoteLineSerializer(many=True, allow_empty=False)
+
+
+class ConvertQuoteSerializer(serializers.Serializer):
+    """Serializer for converting a quote into a sale."""
+    
+    payment_method = serializers.ChoiceField(
+        choices=Sale.PaymentMethod.choices,
+        default=Sale.PaymentMethod.CASH
+    )
+    notes = serializers.CharField(required=False, allow_blank=True)
+    invoice_type = serializers.ChoiceField(
+        choices=Invoice.InvoiceType.choices,
+        default=Invoice.InvoiceType.BOLETA
     )
 
 
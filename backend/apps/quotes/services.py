@@ -0,0 +1,99 @@
+import logging
+
+from django.core.cache import cache
+
+from .models import Quote, QuoteItem
+from apps.products.models import Product
+from store_backend.config import get_config
+
+logger = logging.getLogger(__name__)
+
+EXPIRE_THROTTLE_KEY = 'quotes:expire-overdue'
+EXPIRE_THROTTLE_SECONDS = 300
+
+
+def expire_overdue_quotes(today=None):
+    """Expire every overdue quote. Returns the number of rows touched."""
+    expired = Quote.objects.expire_overdue(today)
+    if expired:
+        logger.info('Expired %s overdue quotes', expired)
+    return expired
+
+
+def expire_overdue_quotes_lazily():
+    """
+    Expire overdue quotes on read paths, at most once per throttle window.
+
+    Keeps list filters and the pending quotes count accurate even when no
+    run_tasks worker is running the scheduled quotes.expire_overdue task.
+    """
+    if not cache.add(EXPIRE_THROTTLE_KEY, True, EXPIRE_THROTTLE_SECONDS):
+        return 0
+    return expire_overdue_quotes()
+
+
+def load_line_products(lines):
+    """
+    Fetch every product referenced by quote lines with a single query.
+    
+    Returns the products by id and the sorted ids that do not exist.
+    """
+    product_ids = {line['product'] for line in lines}
+    products = Product.objects.only('id', 'price', 'apply_igv').in_bulk(product_ids)
+    missing = sorted(product_ids - products.keys())
+    return products, missing
+
+
+def stored_values(item):
+    return (
+        item.product_id, item.description, item.quantity, item.unit_price,
+        item.subtotal, item.igv, item.total
+    )
+
+
+def build_quote_items(quote, lines, products, existing=None):
+    """
+    Build quote items from validated lines without touching the database.
+    
+    Lines with an id update the matching item from ``existing``; the rest
+    become new items. Returns ``(items, to_create, to_update)`` where
+    ``items`` is the final list of lines with their totals calculated.
+    An existing item is in ``to_update`` when any stored value changes,
+    totals included (e.g. after an IGV rate change), so the quote totals
+    always add up the saved lines.
+    """
+    existing = existing or {}
+    igv_rate = get_config('igv_rate', 0.18)
+    items, to_create, to_update = [], [], []
+    
+    for line in lines:
+        product = products[line['product']]
+        item = existing.get(line.get('id'))
+        
+        if item is None:
+            item = QuoteItem(
+                quote=quote,
+                product=product,
+                description=line.get('description', ''),
+                quantity=line['quantity'],
+                unit_price=line.get('unit_price', product.price)
+            )
+            to_create.append(item)
+        else:
+            before = stored_values(item)
+            if 'unit_price' in line:
+                item.unit_price = line['unit_price']
+            elif item.product_id != product.id:
+                item.unit_price = product.price
+            item.product = product
+            item.description = line.get('description', item.description)
+            item.quantity = line['quantity']
+        
+        item.calculate_totals(product.apply_igv, igv_rate)
+        if item.pk is not None and stored_values(item) != before:
+            to_update.append(item)
+        items.append(item)
+    
+    return items, to_create, to_update
+
+
@@ -0,0 +1,11 @@
+from apps.tasks.services import task
+
+from .services import expire_overdue_quotes
+
+
+@task('quotes.expire_overdue')
+def expire_overdue_task():
+    """Mark draft and sent quotes past their validity date as expired."""
+    expire_overdue_quotes()
+
+
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .models import Quote
+from apps.inventory.models import Inventory
+from apps.products.models import Category, Product
+from apps.users.models import User
+
+
+class ConvertQuoteTests(APITestCase):
+    """Converting quotes into sales."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='vendedor', password='clave', role=User.Role.SELLER)
+        self.client.force_authenticate(self.user)
+        self.product = Product.objects.create(
+            name='Teclado', sku='TEC-001', category=Category.objects.create(name='Accesorios'),
+            price='50.00', cost='30.00'
+        )
+        Inventory.objects.create(product=self.product, quantity=10)
+    
+    def create_quote(self, **data):
+        response = self.client.post('/api/quotes/', {
+            'items': [{'product': self.product.id, 'quantity': 2}], **data
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['id']
+    
+    def convert(self, quote_id):
+        return self.client.post(f'/api/quotes/{quote_id}/convert/', {}, format='json')
+    
+    def test_convert_quote_without_validity_date(self):
+        quote_id = self.create_quote()
+        
+        response = self.convert(quote_id)
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Quote.objects.get(pk=quote_id).sale_id, response.data['id'])
+    
+    def test_convert_overdue_quote_is_rejected(self):
+        quote_id = self.create_quote(valid_until=str(timezone.localdate() - timedelta(days=1)))
+        
+        response = self.convert(quote_id)
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Quote.objects.get(pk=quote_id).status, Quote.Status.EXPIRED)
+
+
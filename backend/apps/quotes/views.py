@@ -2,16 +2,34 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db import transaction
+from django.utils import timezone
 from django.db.models import Q
 from datetime import datetime
 
 from .models import Quote, QuoteItem
-from .serializers import QuoteSerializer, CreateQuoteSerializer
-from apps.products.models import Product
+from .serializers import (
+    QuoteSerializer,
+    CreateQuoteSerializer,
+    EditQuoteItemsSerializer,
+    ConvertQuoteSerializer
+)
+from .services import (
+    expire_overdue_quotes_lazily,
+    load_line_products,
+    build_quote_items
+)
 from apps.clients.models import Client
+from apps.clients.services import register_purchase
+from apps.sales.models import Sale, SaleItem
+from apps.sales.serializers import SaleSerializer
+from apps.sales.services import create_invoice, register_stock_out
+from apps.documents.rendering import render_quote, document_response
+from apps.outbox.models import OutboxEvent
+from apps.outbox.services import event, publish, snapshot
+from store_backend.fieldsets import FieldsetViewMixin
 
 
-class QuoteViewSet(viewsets.ModelViewSet):
+class QuoteViewSet(FieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for Quote management."""
     
     queryset = Quote.objects.select_related('client', 'user').prefetch_related('items__product').all()
@@ -40,6 +58,14 @@ class QuoteViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    def list(self, request, *args, **kwargs):
+        expire_overdue_quotes_lazily()
+        return super().list(request, *args, **kwargs)
+    
+    def retrieve(self, request, *args, **kwargs):
+        expire_overdue_quotes_lazily()
+        return super().retrieve(request, *args, **kwargs)
+    
     @transaction.atomic
     def create(self, request, *args, **kwargs):
         """Create a new quote with items."""
@@ -71,8 +97,15 @@ class QuoteViewSet(viewsets.ModelViewSet):
             except Client.DoesNotExist:
                 pass
         
-        # Create quote
-        quote = Quote.objects.create(
+        # Fetch every product once and build the lines in memory
+        products, missing = load_line_products(data['items'])
+        if missing:
+            return Response(
+                {'error': f'Producto {missing[0]} no encontrado'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        quote = Quote(
             client=client,
             user=request.user,
             quote_number=quote_number,
@@ -81,34 +114,69 @@ class QuoteViewSet(viewsets.ModelViewSet):
             terms=data.get('terms', ''),
             status=Quote.Status.DRAFT
         )
+        items, _, _ = build_quote_items(quote, data['items'], products)
         
-        # Create quote items
-        for item_data in data['items']:
-            try:
-                product = Product.objects.get(id=item_data['product'])
-            except Product.DoesNotExist:
-                quote.delete()
-                return Response(
-                    {'error': f'Producto {item_data["product"]} no encontrado'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            QuoteItem.objects.create(
-                quote=quote,
-                product=product,
-                description=item_data.get('description', ''),
-                quantity=item_data['quantity'],
-                unit_price=item_data.get('unit_price', product.price)
-            )
-        
-        # Calculate totals
-        quote.calculate_totals()
+        # Save quote with its totals, then insert all items at once
+        quote.calculate_totals(items)
+        for item in items:
+            item.quote = quote
+        QuoteItem.objects.bulk_create(items)
         
         return Response(
-            QuoteSerializer(quote).data,
+            QuoteSerializer(self.queryset.get(pk=quote.pk)).data,
             status=status.HTTP_201_CREATED
         )
     
+    @action(detail=True, methods=['put'], url_path='items')
+    def edit_items(self, request, pk=None):
+        """Apply line changes to a quote instead of recreating it."""
+        quote = self.get_object()
+        
+        if quote.sale_id or quote.status not in (Quote.Status.DRAFT, Quote.Status.SENT):
+            return Response(
+                {'error': 'Solo se pueden editar cotizaciones en borrador o enviadas'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        serializer = EditQuoteItemsSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        lines = serializer.validated_data['items']
+        existing = {item.id: item for item in quote.items.all()}
+        line_ids = [line['id'] for line in lines if 'id' in line]
+        
+        unknown = [item_id for item_id in line_ids if item_id not in existing]
+        if unknown or len(line_ids) != len(set(line_ids)):
+            return Response(
+                {'error': f'Item {unknown[0] if unknown else line_ids[0]} inválido para esta cotización'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        products, missing = load_line_products(lines)
+        if missing:
+            return Response(
+                {'error': f'Producto {missing[0]} no encontrado'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        items, to_create, to_update = build_quote_items(quote, lines, products, existing)
+        removed = existing.keys() - set(line_ids)
+        
+        with transaction.atomic():
+            if removed:
+                QuoteItem.objects.filter(id__in=removed).delete()
+            if to_update:
+                QuoteItem.objects.bulk_update(to_update, [
+                    'product', 'description', 'quantity', 'unit_price',
+                    'subtotal', 'igv', 'total'
+                ])
+            if to_create:
+                QuoteItem.objects.bulk_create(to_create)
+            quote.calculate_totals(items)
+        
+        return Response(QuoteSerializer(self.queryset.get(pk=quote.pk)).data)
+    
     @action(detail=True, methods=['post'])
     def send(self, request, pk=None):
         """Mark quote as sent."""
@@ -132,5 +200,114 @@ class QuoteViewSet(viewsets.ModelViewSet):
         quote.status = Quote.Status.REJECTED
         quote.save()
         return Response(QuoteSerializer(quote).data)
+    
+    @action(detail=True, methods=['post'])
+    def convert(self, request, pk=None):
+        """Convert quote into a sale, discounting stock and issuing its invoice."""
+        serializer = ConvertQuoteSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        data = serializer.validated_data
+        quote = self.get_object()
+        
+        if quote.sale_id:
+            return Response(
+                {'error': 'La cotización ya fue convertida en venta'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if quote.status in (Quote.Status.REJECTED, Quote.Status.EXPIRED):
+            return Response(
+                {'error': f'No se puede convertir una cotización {quote.get_status_display().lower()}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if (
+            quote.status in (Quote.Status.DRAFT, Quote.Status.SENT)
+            and quote.valid_until is not None
+            and quote.valid_until < timezone.localdate()
+        ):
+            # Open past its validity: expire it now rather than wait for the
+            # periodic expiry (accepted quotes stay convertible)
+            Quote.objects.filter(pk=quote.pk).expire_overdue()
+            return Response(
+                {'error': f'La cotización venció el {quote.valid_until:%d/%m/%Y}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Items come from the viewset prefetch, no extra product queries
+        quote_items = list(quote.items.all())
+        if not quote_items:
+            return Response(
+                {'error': 'La cotización no tiene items'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        with transaction.atomic():
+            sale = Sale.objects.create(
+                client=quote.client,
+                seller=request.user,
+                payment_method=data['payment_method'],
+                notes=data.get('notes', f'Generada desde {quote}'),
+                status=Sale.Status.COMPLETED,
+                subtotal=sum(item.subtotal for item in quote_items),
+                igv=sum(item.igv for item in quote_items),
+                total=sum(item.total for item in quote_items)
+            )
+            
+            # Totals are copied from the quote lines, bulk_create skips save()
+            sale_items = SaleItem.objects.bulk_create([
+                SaleItem(
+                    sale=sale,
+                    product=item.product,
+                    quantity=item.quantity,
+                    unit_price=item.unit_price,
+                    subtotal=item.subtotal,
+                    igv=item.igv,
+                    total=item.total
+                )
+                for item in quote_items
+            ])
+            movements = register_stock_out(sale, sale_items, request.user)
+            invoice = create_invoice(sale, data['invoice_type'])
+            register_purchase(sale)
+            
+            # Guarded update so concurrent requests cannot convert twice
+            converted = Quote.objects.filter(pk=quote.pk, sale__isnull=True).update(
+                sale=sale,
+                status=Quote.Status.ACCEPTED,
+                updated_at=timezone.now()
+            )
+            if not converted:
+                transaction.set_rollback(True)
+                return Response(
+                    {'error': 'La cotización ya fue convertida en venta'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            publish(
+                event(sale, OutboxEvent.Action.CREATED, items=[snapshot(item) for item in sale_items]),
+                event(invoice, OutboxEvent.Action.CREATED),
+                *(event(movement, OutboxEvent.Action.CREATED) for movement in movements)
+            )
+        
+        return Response(
+            SaleSerializer(sale).data,
+            status=status.HTTP_201_CREATED
+        )
+    
+    @action(detail=True, methods=['get'])
+    def pdf(self, request, pk=None):
+        """Quote as PDF, ready to be emailed."""
+        quote = self.get_object()
+        path = render_quote(quote, 'pdf')
+        return document_response(path, 'pdf', quote.quote_number)
+    
+    @action(detail=True, methods=['get'])
+    def html(self, request, pk=None):
+        """Quote as HTML."""
+        quote = self.get_object()
+        path = render_quote(quote, 'html')
+        return document_response(path, 'html', quote.quote_number)
 
 
@@ -0,0 +1,150 @@
+"""
+Async versions of the dashboard report views.
+
+DRF views are synchronous, so these are plain Django async views that
+authenticate the JWT themselves and render like the sync endpoints (same
+JSON output). Independent queries run concurrently in
+separate threads, each with its own database connection, instead of
+serializing on the single thread Django's async ORM methods share.
+Served without blocking a worker thread when the project runs under ASGI
+(``make start-backend-asgi``).
+"""
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import HttpResponse
+from rest_framework.exceptions import (
+    APIException, MethodNotAllowed, NotAuthenticated, ParseError
+)
+
+from apps.users.authentication import CachedJWTAuthentication
+from store_backend.conditional import precondition, set_validators
+from store_backend.renderers import dumps
+from . import queries
+
+
+def run_query(func, *args):
+    """Run a report query in its own thread, releasing its connection after."""
+    def call():
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+    return sync_to_async(call, thread_sensitive=False)()
+
+
+def json_response(data, status=200):
+    # Same bytes as the sync endpoints' renderer
+    return HttpResponse(dumps(data), status=status, content_type='application/json')
+
+
+def int_param(request, name, default):
+    try:
+        return int(request.GET.get(name, default))
+    except ValueError:
+        raise ParseError(f'El parámetro {name} debe ser un número entero')
+
+
+async def authenticate(request):
+    result = await sync_to_async(CachedJWTAuthentication().authenticate)(request)
+    if result is None:
+        raise NotAuthenticated()
+    request.user, request.auth = result
+
+
+def async_report_view(*models):
+    """
+    Allow only authenticated GET requests, like the DRF report views.
+    
+    Answers 304 when the client's copy is still current for ``models``.
+    """
+    state = queries.report_state(*models)
+    
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                if request.method != 'GET':
+                    raise MethodNotAllowed(request.method)
+                await authenticate(request)
+                not_modified, etag, last_modified = precondition(
+                    request, await run_query(state, request)
+                )
+                if not_modified is not None:
+                    return set_validators(not_modified, etag, last_modified)
+                response = await view(request, *args, **kwargs)
+                if response.status_code == 200:
+                    set_validators(response, etag, last_modified)
+                return response
+            except APIException as exc:
+                return json_response({'detail': exc.detail}, status=exc.status_code)
+        return wrapper
+    return decorator
+
+
+async def gather_dict(calls):
+    """Run {name: (func, *args)} concurrently and return {name: result}."""
+    results = await asyncio.gather(*(run_query(*call) for call in calls.values()))
+    return dict(zip(calls, results))
+
+
+@async_report_view(*queries.DASHBOARD_MODELS)
+async def dashboard_summary(request):
+    """Get dashboard summary statistics."""
+    parts = await gather_dict({name: (query,) for name, query in queries.DASHBOARD_PARTS.items()})
+    return json_response(queries.build_dashboard(parts))
+
+
+@async_report_view(*queries.SALES_CHART_MODELS)
+async def sales_chart(request):
+    """Get sales data for charts."""
+    days = int_param(request, 'days', 30)
+    return json_response(await run_query(queries.sales_chart, days))
+
+
+@async_report_view(*queries.SALES_BY_CATEGORY_MODELS)
+async def sales_by_category(request):
+    """Get sales grouped by product category."""
+    days = int_param(request, 'days', 30)
+    return json_response(await run_query(queries.sales_by_category, days))
+
+
+@async_report_view(*queries.TOP_PRODUCTS_MODELS)
+async def top_products(request):
+    """Get top selling products."""
+    days = int_param(request, 'days', 30)
+    limit = int_param(request, 'limit', 10)
+    return json_response(await run_query(queries.top_products, days, limit))
+
+
+@async_report_view(*queries.SALES_BY_SELLER_MODELS)
+async def sales_by_seller(request):
+    """Get sales grouped by seller."""
+    days = int_param(request, 'days', 30)
+    return json_response(await run_query(queries.sales_by_seller, days))
+
+
+@async_report_view(*queries.DASHBOARD_BUNDLE_MODELS)
+async def dashboard_bundle(request):
+    """Everything the dashboard page shows, computed concurrently in one request."""
+    days = int_param(request, 'days', 30)
+    limit = int_param(request, 'limit', 5)
+    
+    calls = {name: (query,) for name, query in queries.DASHBOARD_PARTS.items()}
+    calls.update({
+        'sales_chart': (queries.sales_chart, days),
+        'sales_by_category': (queries.sales_by_category, days),
+        'top_products': (queries.top_products, days, limit),
+        'sales_by_seller': (queries.sales_by_seller, days),
+    })
+    results = await gather_dict(calls)
+    
+    return json_response({
+        'summary': queries.build_dashboard(results),
+        'sales_chart': results['sales_chart'],
+        'sales_by_category': results['sales_by_category'],
+        'top_products': results['top_products'],
+        'sales_by_seller': results['sales_by_seller'],
+    })
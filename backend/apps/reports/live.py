@@ -0,0 +1,289 @@
+"""
+Live dashboard: ``GET /api/reports/live/`` as a Server-Sent Events stream.
+
+Each process runs one ``Broadcaster`` while anyone is subscribed. It keeps
+the dashboard summary in memory and follows the change feed outbox: sale
+events recompute the sales totals, stock movements the low-stock count
+(listing the products that crossed the threshold), and a change in the
+quotes table the pending quotes. Every change is computed once and only the
+figures that moved are pushed, already encoded, to all subscribers, so open
+dashboards do not add queries. A new subscriber gets the cached summary
+without touching the database.
+
+Browsers cannot set headers on an ``EventSource``, and an access token in
+the URL would end up in access logs and browser history. Clients first
+``POST /api/reports/live/ticket/`` with their Bearer token and open the
+stream with the returned ``?ticket=``, signed for this stream only and
+valid for ``LIVE_TICKET_SECONDS``.
+
+Streaming needs ASGI (``make start-backend-asgi``). Under WSGI a stream
+would hold a worker thread: the ticket response says ``stream: false`` and
+the stream answers 204, which tells ``EventSource`` not to reconnect, so
+dashboards keep the figures they loaded.
+"""
+import asyncio
+import contextvars
+import logging
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Max
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import APIException, AuthenticationFailed, MethodNotAllowed
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.inventory.models import Inventory
+from apps.outbox.models import OutboxEvent
+from apps.outbox.services import events_after
+from apps.quotes.models import Quote
+from apps.users.models import User
+from store_backend.conditional import tables_state
+from store_backend.config import get_config
+from store_backend.renderers import dumps
+from . import queries
+from .async_views import gather_dict, json_response, run_query
+
+logger = logging.getLogger(__name__)
+
+SALE_TOPIC = 'sales.sale'
+MOVEMENT_TOPIC = 'inventory.inventorymovement'
+# Outbox events read per poll; a larger backlog is read over the next polls
+POLL_BATCH_SIZE = 1000
+# Signing salt, so a stream ticket is valid for nothing else
+TICKET_SCOPE = 'reports.live'
+
+
+def last_seq():
+    return OutboxEvent.objects.aggregate(seq=Max('id'))['seq'] or 0
+
+
+def quotes_state():
+    return tables_state(Quote)
+
+
+def low_stock_transitions(events):
+    """Inventories whose movements in ``events`` took them into or out of low stock."""
+    before = {}
+    after = {}
+    for event in events:
+        inventory_id = event.payload['inventory_id']
+        before.setdefault(inventory_id, event.payload['previous_quantity'])
+        after[inventory_id] = event.payload['new_quantity']
+    
+    threshold = get_config('low_stock_threshold', 10)
+    inventories = Inventory.objects.select_related('product').filter(id__in=after).only(
+        'id', 'min_quantity', 'product__id', 'product__name'
+    ).order_by('id')
+    transitions = []
+    for inventory in inventories:
+        # Same rule as Inventory.is_low_stock
+        limit = inventory.min_quantity or threshold
+        low = after[inventory.id] <= limit
+        if low != (before[inventory.id] <= limit):
+            transitions.append({
+                'inventory_id': inventory.id,
+                'product_id': inventory.product.id,
+                'product_name': inventory.product.name,
+                'quantity': after[inventory.id],
+                'low': low,
+            })
+    return transitions
+
+
+def sse(event, data, seq=None):
+    """One encoded Server-Sent Event."""
+    head = f'id: {seq}\n' if seq is not None else ''
+    return f'{head}event: {event}\ndata: '.encode() + dumps(data) + b'\n\n'
+
+
+class Broadcaster:
+    """Computes dashboard changes once per process and fans them out to the subscribed streams."""
+    
+    def __init__(self):
+        self.subscribers = set()
+        self.pump = None
+        self.loop = None
+        self.ready = None
+        self.parts = {}
+        self.summary = {}
+        self.seq = 0
+        self.quotes = None
+        self.refreshed_at = 0
+        self.day = None
+    
+    async def subscribe(self):
+        queue = asyncio.Queue(maxsize=settings.LIVE_QUEUE_SIZE)
+        loop = asyncio.get_running_loop()
+        if self.pump is None or self.pump.done() or self.loop is not loop:
+            self.subscribers = set()
+            self.loop = loop
+            self.ready = asyncio.Event()
+            # Empty context: the pump outlives this request, so it must not
+            # inherit its metrics collector or replica routing
+            self.pump = contextvars.Context().run(loop.create_task, self.run())
+        self.subscribers.add(queue)
+        await self.ready.wait()
+        if queue not in self.subscribers:
+            raise APIException('No se pudo calcular el resumen del panel')
+        return queue
+    
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+    
+    def close(self, queue):
+        """End a subscriber's stream; its browser reconnects and starts from a fresh summary."""
+        self.unsubscribe(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+    
+    def broadcast(self, message):
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Too far behind to catch up with deltas
+                self.close(queue)
+    
+    async def run(self):
+        try:
+            await self.start()
+            while self.subscribers:
+                await asyncio.sleep(settings.LIVE_POLL_INTERVAL)
+                changes = await self.poll()
+                if changes:
+                    self.broadcast(sse('delta', changes, self.seq))
+        except Exception:
+            logger.exception('Live dashboard updates stopped')
+            for queue in list(self.subscribers):
+                self.close(queue)
+        finally:
+            self.ready.set()
+    
+    async def start(self):
+        # Sequence first: an event committed meanwhile is processed again, never missed
+        self.seq = await run_query(last_seq)
+        self.quotes = await run_query(quotes_state)
+        await self.refresh(queries.DASHBOARD_PARTS)
+        self.ready.set()
+    
+    async def refresh(self, names):
+        """Recompute the named dashboard parts and return the summary fields that changed."""
+        self.parts.update(await gather_dict({name: (queries.DASHBOARD_PARTS[name],) for name in names}))
+        if len(names) == len(queries.DASHBOARD_PARTS):
+            self.refreshed_at = time.monotonic()
+            self.day = timezone.localdate()
+        summary = queries.build_dashboard(self.parts)
+        changed = {name: value for name, value in summary.items() if self.summary.get(name) != value}
+        self.summary = summary
+        return changed
+    
+    async def poll(self):
+        """Apply new outbox events and table changes; returns the delta to push, if any."""
+        events = await run_query(events_after, self.seq, POLL_BATCH_SIZE)
+        names = set()
+        movements = []
+        if events:
+            self.seq = events[-1].id
+            movements = [event for event in events if event.topic == MOVEMENT_TOPIC]
+            if any(event.topic == SALE_TOPIC for event in events):
+                names.update(('sales_today', 'sales_month'))
+            if movements:
+                names.add('low_stock_count')
+        
+        quotes = await run_query(quotes_state)
+        if quotes != self.quotes:
+            self.quotes = quotes
+            names.add('pending_quotes')
+        
+        # Expenses, clients and products have no change events; a new day
+        # resets the daily and monthly totals
+        if (
+            time.monotonic() - self.refreshed_at >= settings.LIVE_REFRESH_SECONDS
+            or timezone.localdate() != self.day
+        ):
+            names = set(queries.DASHBOARD_PARTS)
+        
+        changes = await self.refresh(names) if names else {}
+        if movements:
+            transitions = await run_query(low_stock_transitions, movements)
+            if transitions:
+                changes['low_stock'] = transitions
+        return changes
+
+
+broadcaster = Broadcaster()
+
+
+def streams(request):
+    """Whether the server can hold a stream open: ASGI, not a WSGI worker thread."""
+    return isinstance(request, ASGIRequest)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def dashboard_stream_ticket(request):
+    """Short-lived ticket to open the dashboard stream with."""
+    return Response({
+        'ticket': signing.dumps({'user': request.user.pk}, salt=TICKET_SCOPE),
+        'stream': streams(request._request),
+    })
+
+
+def ticket_user(ticket):
+    try:
+        data = signing.loads(ticket, salt=TICKET_SCOPE, max_age=settings.LIVE_TICKET_SECONDS)
+    except signing.BadSignature:
+        raise AuthenticationFailed('El ticket no es válido o ya venció')
+    user = User.objects.filter(pk=data['user'], is_active=True).first()
+    if user is None:
+        raise AuthenticationFailed('El ticket no es válido o ya venció')
+    return user
+
+
+async def stream(queue, first):
+    """Summary first, then deltas as they come, with keep-alive comments in between."""
+    deadline = time.monotonic() + settings.LIVE_STREAM_SECONDS
+    try:
+        yield first
+        # Django 4.2 does not notice a client that went away mid-stream, so
+        # streams end on their own and clients reconnect with a new ticket
+        while time.monotonic() < deadline:
+            try:
+                message = await asyncio.wait_for(queue.get(), settings.LIVE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield b': ping\n\n'
+                continue
+            if message is None:
+                break
+            yield message
+    finally:
+        broadcaster.unsubscribe(queue)
+
+
+async def dashboard_stream(request):
+    """Dashboard summary, then the figures that change, as Server-Sent Events."""
+    try:
+        if request.method != 'GET':
+            raise MethodNotAllowed(request.method)
+        request.user = await run_query(ticket_user, request.GET.get('ticket', ''))
+        if not streams(request):
+            # No Content: EventSource gives up instead of reconnecting
+            return HttpResponse(status=204)
+        queue = await broadcaster.subscribe()
+    except APIException as exc:
+        return json_response({'detail': exc.detail}, status=exc.status_code)
+    
+    first = sse('summary', broadcaster.summary, broadcaster.seq)
+    response = StreamingHttpResponse(stream(queue, first), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Proxies must pass events through as they are written
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
@@ -0,0 +1,210 @@
+"""
+Report queries shared by the sync (DRF) and async report views.
+
+Each function runs its own independent queries and returns plain data, so
+the async views can run several of them at the same time.
+"""
+from datetime import timedelta
+
+from django.db.models import Sum, Count, Avg, F, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.sales.models import Sale, SaleItem
+from apps.products.models import Category, Product
+from apps.inventory.models import Inventory
+from apps.expenses.models import Expense
+from apps.clients.models import Client
+from apps.quotes.models import Quote
+from apps.quotes.services import expire_overdue_quotes_lazily
+from apps.users.models import User
+from store_backend.conditional import tables_state
+from store_backend.config import get_config
+
+
+def start_date(days):
+    return timezone.now().date() - timedelta(days=days)
+
+
+def sales_totals(**filters):
+    totals = Sale.objects.filter(
+        status=Sale.Status.COMPLETED, **filters
+    ).aggregate(
+        total=Sum('total'),
+        count=Count('id')
+    )
+    return {'total': totals['total'] or 0, 'count': totals['count'] or 0}
+
+
+def sales_today():
+    return sales_totals(created_at__date=timezone.now().date())
+
+
+def sales_month():
+    return sales_totals(created_at__date__gte=timezone.now().date().replace(day=1))
+
+
+def expenses_month():
+    month_start = timezone.now().date().replace(day=1)
+    return Expense.objects.filter(
+        date__gte=month_start
+    ).aggregate(total=Sum('amount'))['total'] or 0
+
+
+def low_stock_count():
+    """Same rule as Inventory.is_low_stock, counted in the database."""
+    threshold = get_config('low_stock_threshold', 10)
+    return Inventory.objects.filter(
+        Q(quantity__lte=F('min_quantity')) & ~Q(min_quantity=0) |
+        Q(min_quantity=0, quantity__lte=threshold)
+    ).count()
+
+
+def active_clients():
+    return Client.objects.filter(is_active=True).count()
+
+
+def active_products():
+    return Product.objects.filter(is_active=True).count()
+
+
+def pending_quotes():
+    expire_overdue_quotes_lazily()
+    # Overdue quotes the periodic expiry has not reached yet are not pending;
+    # quotes without a validity date never expire
+    return Quote.objects.filter(
+        Q(valid_until__isnull=True) | Q(valid_until__gte=timezone.localdate()),
+        status__in=[Quote.Status.DRAFT, Quote.Status.SENT]
+    ).count()
+
+
+# Independent parts of the dashboard summary, in response order
+DASHBOARD_PARTS = {
+    'sales_today': sales_today,
+    'sales_month': sales_month,
+    'expenses_month': expenses_month,
+    'low_stock_count': low_stock_count,
+    'active_clients': active_clients,
+    'active_products': active_products,
+    'pending_quotes': pending_quotes,
+}
+
+
+def build_dashboard(parts):
+    """Assemble the dashboard payload from the computed parts."""
+    return {
+        'sales_today': parts['sales_today'],
+        'sales_month': parts['sales_month'],
+        'expenses_month': parts['expenses_month'],
+        'profit_month': parts['sales_month']['total'] - parts['expenses_month'],
+        'low_stock_count': parts['low_stock_count'],
+        'active_clients': parts['active_clients'],
+        'active_products': parts['active_products'],
+        'pending_quotes': parts['pending_quotes'],
+    }
+
+
+def dashboard_summary():
+    return build_dashboard({name: query() for name, query in DASHBOARD_PARTS.items()})
+
+
+def sales_chart(days):
+    return list(Sale.objects.filter(
+        created_at__date__gte=start_date(days),
+        status=Sale.Status.COMPLETED
+    ).annotate(
+        date=TruncDate('created_at')
+    ).values('date').annotate(
+        total=Sum('total'),
+        count=Count('id')
+    ).order_by('date'))
+
+
+def sales_by_category(days):
+    return list(SaleItem.objects.filter(
+        sale__created_at__date__gte=start_date(days),
+        sale__status=Sale.Status.COMPLETED
+    ).values(
+        category_name=F('product__category__name')
+    ).annotate(
+        total=Sum('total'),
+        quantity=Sum('quantity')
+    ).order_by('-total'))
+
+
+def top_products(days, limit):
+    top = SaleItem.objects.filter(
+        sale__created_at__date__gte=start_date(days),
+        sale__status=Sale.Status.COMPLETED
+    ).values(
+        'product__id',
+        'product__name',
+        'product__sku'
+    ).annotate(
+        total_sold=Sum('quantity'),
+        total_revenue=Sum('total')
+    ).order_by('-total_sold')[:limit]
+    
+    # Rename fields to match frontend expectations
+    return [
+        {
+            'product_id': item['product__id'],
+            'product_name': item['product__name'],
+            'product_sku': item['product__sku'],
+            'total_sold': item['total_sold'],
+            'total_revenue': float(item['total_revenue']) if item['total_revenue'] else 0
+        }
+        for item in top
+    ]
+
+
+def sales_by_seller(days):
+    by_seller = Sale.objects.filter(
+        created_at__date__gte=start_date(days),
+        status=Sale.Status.COMPLETED
+    ).values(
+        'seller__id',
+        'seller__username',
+        'seller__first_name',
+        'seller__last_name'
+    ).annotate(
+        # Before total=Sum('total'), which would shadow the field for Avg
+        avg_sale=Avg('total'),
+        total=Sum('total'),
+        count=Count('id')
+    ).order_by('-total')
+    
+    # Rename fields to match frontend expectations
+    return [
+        {
+            'seller_id': item['seller__id'],
+            'seller_name': item['seller__username'],
+            'seller_first_name': item['seller__first_name'],
+            'seller_last_name': item['seller__last_name'],
+            'total': float(item['total']) if item['total'] else 0,
+            'count': item['count'],
+            'avg_sale': float(item['avg_sale']) if item['avg_sale'] else 0
+        }
+        for item in by_seller
+    ]
+
+
+def report_state(*models):
+    """
+    Validator state for a report reading ``models``.
+
+    Today's date (reports are relative to it) plus the row count and latest
+    ``updated_at`` of each table, for ``store_backend.conditional``.
+    """
+    def state(request, *args, **kwargs):
+        return [str(timezone.now().date()), tables_state(*models)]
+    return state
+
+
+# Tables each report reads
+DASHBOARD_MODELS = (Sale, Expense, Inventory, Client, Product, Quote)
+SALES_CHART_MODELS = (Sale,)
+SALES_BY_CATEGORY_MODELS = (Sale, Product, Category)
+TOP_PRODUCTS_MODELS = (Sale, Product)
+SALES_BY_SELLER_MODELS = (Sale, User)
+DASHBOARD_BUNDLE_MODELS = DASHBOARD_MODELS + (Category, User)
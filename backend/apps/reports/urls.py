@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import views, async_views, live
 
 urlpatterns = [
     path('dashboard/', views.dashboard_summary, name='dashboard_summary'),
@@ -10,6 +10,17 @@ urlpatterns = [
     path('inventory/', views.inventory_report, name='inventory_report'),
     path('monthly-comparison/', views.monthly_comparison, name='monthly_comparison'),
     path('accounting/', views.accounting_report, name='accounting_report'),
+    path('receivables/', views.receivables_report, name='receivables_report'),
+    # Async variants for the ASGI server
+    path('async/dashboard/', async_views.dashboard_summary, name='async_dashboard_summary'),
+    path('async/sales-chart/', async_views.sales_chart, name='async_sales_chart'),
+    path('async/sales-by-category/', async_views.sales_by_category, name='async_sales_by_category'),
+    path('async/top-products/', async_views.top_products, name='async_top_products'),
+    path('async/sales-by-seller/', async_views.sales_by_seller, name='async_sales_by_seller'),
+    path('async/dashboard-bundle/', async_views.dashboard_bundle, name='async_dashboard_bundle'),
+    # Server-Sent Events for the open dashboards
+    path('live/', live.dashboard_stream, name='dashboard_stream'),
+    path('live/ticket/', live.dashboard_stream_ticket, name='dashboard_stream_ticket'),
 ]
 
 
@@ -1,202 +1,70 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.db.models import Sum, Count, Avg, F
-from django.db.models.functions import TruncDate, TruncMonth
+from django.db.models import Sum, Count, F, Min, Q
+from django.db.models.functions import TruncMonth
 from django.utils import timezone
 from datetime import timedelta
 from decimal import Decimal
 
-from apps.sales.models import Sale, SaleItem
-from apps.products.models import Product, Category
+from apps.sales.models import Sale
 from apps.inventory.models import Inventory
-from apps.expenses.models import Expense
+from apps.expenses.models import Expense, ExpenseCategory
 from apps.clients.models import Client
-from apps.quotes.models import Quote
+from apps.products.models import Category, Product
+from store_backend.conditional import condition
+from . import queries
+from .queries import report_state
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(report_state(*queries.DASHBOARD_MODELS))
 def dashboard_summary(request):
     """Get dashboard summary statistics."""
-    today = timezone.now().date()
-    month_start = today.replace(day=1)
-    
-    # Sales today
-    sales_today = Sale.objects.filter(
-        created_at__date=today,
-        status=Sale.Status.COMPLETED
-    ).aggregate(
-        total=Sum('total'),
-        count=Count('id')
-    )
-    
-    # Sales this month
-    sales_month = Sale.objects.filter(
-        created_at__date__gte=month_start,
-        status=Sale.Status.COMPLETED
-    ).aggregate(
-        total=Sum('total'),
-        count=Count('id')
-    )
-    
-    # Expenses this month
-    expenses_month = Expense.objects.filter(
-        date__gte=month_start
-    ).aggregate(total=Sum('amount'))
-    
-    # Low stock products
-    low_stock_count = sum(
-        1 for inv in Inventory.objects.all() 
-        if inv.is_low_stock
-    )
-    
-    # Active clients
-    active_clients = Client.objects.filter(is_active=True).count()
-    
-    # Active products
-    active_products = Product.objects.filter(is_active=True).count()
-    
-    # Pending quotes
-    pending_quotes = Quote.objects.filter(
-        status__in=[Quote.Status.DRAFT, Quote.Status.SENT]
-    ).count()
-    
-    return Response({
-        'sales_today': {
-            'total': sales_today['total'] or 0,
-            'count': sales_today['count'] or 0
-        },
-        'sales_month': {
-            'total': sales_month['total'] or 0,
-            'count': sales_month['count'] or 0
-        },
-        'expenses_month': expenses_month['total'] or 0,
-        'profit_month': (sales_month['total'] or 0) - (expenses_month['total'] or 0),
-        'low_stock_count': low_stock_count,
-        'active_clients': active_clients,
-        'active_products': active_products,
-        'pending_quotes': pending_quotes
-    })
+    return Response(queries.dashboard_summary())
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(report_state(*queries.SALES_CHART_MODELS))
 def sales_chart(request):
     """Get sales data for charts."""
     days = int(request.query_params.get('days', 30))
-    end_date = timezone.now().date()
-    start_date = end_date - timedelta(days=days)
-    
-    sales_by_day = Sale.objects.filter(
-        created_at__date__gte=start_date,
-        status=Sale.Status.COMPLETED
-    ).annotate(
-        date=TruncDate('created_at')
-    ).values('date').annotate(
-        total=Sum('total'),
-        count=Count('id')
-    ).order_by('date')
-    
-    return Response(list(sales_by_day))
+    return Response(queries.sales_chart(days))
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(report_state(*queries.SALES_BY_CATEGORY_MODELS))
 def sales_by_category(request):
     """Get sales grouped by product category."""
     days = int(request.query_params.get('days', 30))
-    end_date = timezone.now().date()
-    start_date = end_date - timedelta(days=days)
-    
-    sales_by_cat = SaleItem.objects.filter(
-        sale__created_at__date__gte=start_date,
-        sale__status=Sale.Status.COMPLETED
-    ).values(
-        category_name=F('product__category__name')
-    ).annotate(
-        total=Sum('total'),
-        quantity=Sum('quantity')
-    ).order_by('-total')
-    
-    return Response(list(sales_by_cat))
+    return Response(queries.sales_by_category(days))
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(report_state(*queries.TOP_PRODUCTS_MODELS))
 def top_products(request):
     """Get top selling products."""
     days = int(request.query_params.get('days', 30))
     limit = int(request.query_params.get('limit', 10))
-    end_date = timezone.now().date()
-    start_date = end_date - timedelta(days=days)
-    
-    top = SaleItem.objects.filter(
-        sale__created_at__date__gte=start_date,
-        sale__status=Sale.Status.COMPLETED
-    ).values(
-        'product__id',
-        'product__name',
-        'product__sku'
-    ).annotate(
-        total_sold=Sum('quantity'),
-        total_revenue=Sum('total')
-    ).order_by('-total_sold')[:limit]
-    
-    # Rename fields to match frontend expectations
-    result = []
-    for item in top:
-        result.append({
-            'product_id': item['product__id'],
-            'product_name': item['product__name'],
-            'product_sku': item['product__sku'],
-            'total_sold': item['total_sold'],
-            'total_revenue': float(item['total_revenue']) if item['total_revenue'] else 0
-        })
-    
-    return Response(result)
+    return Response(queries.top_products(days, limit))
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(report_state(*queries.SALES_BY_SELLER_MODELS))
 def sales_by_seller(request):
     """Get sales grouped by seller."""
     days = int(request.query_params.get('days', 30))
-    end_date = timezone.now().date()
-    start_date = end_date - timedelta(days=days)
-    
-    by_seller = Sale.objects.filter(
-        created_at__date__gte=start_date,
-        status=Sale.Status.COMPLETED
-    ).values(
-        'seller__id',
-        'seller__username',
-        'seller__first_name',
-        'seller__last_name'
-    ).annotate(
-        total=Sum('total'),
-        count=Count('id'),
-        avg_sale=Avg('total')
-    ).order_by('-total')
-    
-    # Rename fields to match frontend expectations
-    result = []
-    for item in by_seller:
-        result.append({
-            'seller_id': item['seller__id'],
-            'seller_name': item['seller__username'],
-            'seller_first_name': item['seller__first_name'],
-            'seller_last_name': item['seller__last_name'],
-            'total': float(item['total']) if item['total'] else 0,
-            'count': item['count'],
-            'avg_sale': float(item['avg_sale']) if item['avg_sale'] else 0
-        })
-    
-    return Response(result)
+    return Response(queries.sales_by_seller(days))
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(report_state(Inventory, Product, Category))
 def inventory_report(request):
     """Get inventory status report."""
     inventories = Inventory.objects.select_related('product', 'product__category').all()
@@ -231,6 +99,7 @@ def inventory_report(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(report_state(Sale, Expense))
 def monthly_comparison(request):
     """Get monthly sales comparison."""
     months = int(request.query_params.get('months', 12))
@@ -258,6 +127,7 @@ def monthly_comparison(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(report_state(Sale, Expense, ExpenseCategory))
 def accounting_report(request):
     """Get accounting summary for accountants."""
     date_from = request.query_params.get('date_from')
@@ -320,3 +190,60 @@ def accounting_report(request):
     })
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@condition(report_state(Sale, Client))
+def receivables_report(request):
+    """Get accounts receivable by client with aging buckets for credit sales."""
+    now = timezone.now()
+    d30, d60, d90 = (now - timedelta(days=days) for days in (30, 60, 90))
+    
+    outstanding = Sale.objects.filter(
+        client__isnull=False,
+        payment_method=Sale.PaymentMethod.CREDIT,
+        status=Sale.Status.COMPLETED,
+        total__gt=F('amount_paid')
+    )
+    client = request.query_params.get('client')
+    if client:
+        outstanding = outstanding.filter(client_id=client)
+    
+    # Single conditional aggregation over the outstanding credit sales
+    balance = F('total') - F('amount_paid')
+    by_client = outstanding.values(
+        'client_id',
+        'client__name',
+        'client__document_number'
+    ).annotate(
+        current=Sum(balance, filter=Q(created_at__gte=d30)),
+        days_31_60=Sum(balance, filter=Q(created_at__lt=d30, created_at__gte=d60)),
+        days_61_90=Sum(balance, filter=Q(created_at__lt=d60, created_at__gte=d90)),
+        over_90=Sum(balance, filter=Q(created_at__lt=d90)),
+        balance_total=Sum(balance),
+        sales_count=Count('id'),
+        oldest_sale=Min('created_at')
+    ).order_by('-balance_total')
+    
+    buckets = ['current', 'days_31_60', 'days_61_90', 'over_90']
+    totals = dict.fromkeys(buckets + ['total'], 0.0)
+    result = []
+    for item in by_client:
+        row = {
+            'client_id': item['client_id'],
+            'client_name': item['client__name'],
+            'client_document': item['client__document_number'],
+            **{bucket: float(item[bucket] or 0) for bucket in buckets},
+            'total': float(item['balance_total']),
+            'sales_count': item['sales_count'],
+            'oldest_sale': item['oldest_sale'],
+        }
+        for key in totals:
+            totals[key] += row[key]
+        result.append(row)
+    
+    return Response({
+        'clients': result,
+        'totals': totals
+    })
+
+
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Sale, SaleItem, Invoice
+from .models import Sale, SaleItem, Invoice, Payment
 
 
 class SaleItemInline(admin.TabularInline):
@@ -22,3 +22,10 @@ class InvoiceAdmin(admin.ModelAdmin):
     search_fields = ['series', 'number']
 
 
+@admin.register(Payment)
+class PaymentAdmin(admin.ModelAdmin):
+    list_display = ['sale', 'amount', 'method', 'paid_at', 'user']
+    list_filter = ['method', 'paid_at']
+    search_fields = ['sale__client__name', 'reference']
+
+
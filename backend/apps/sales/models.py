@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from apps.products.models import Product
 from apps.clients.models import Client
 from store_backend.config import get_config
@@ -64,6 +65,12 @@ class Sale(models.Model):
         default=Status.COMPLETED,
         verbose_name='Estado'
     )
+    amount_paid = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name='Monto pagado'
+    )
     notes = models.TextField(blank=True, verbose_name='Notas')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -72,10 +79,23 @@ class Sale(models.Model):
         verbose_name = 'Venta'
         verbose_name_plural = 'Ventas'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['client', 'payment_method', 'created_at'],
+                name='sale_client_method_date_idx'
+            ),
+            # Latest change for conditional GET validators
+            models.Index(fields=['updated_at'], name='sale_updated_at_idx'),
+        ]
     
     def __str__(self):
         return f"Venta #{self.id} - {self.total}"
     
+    @property
+    def balance(self):
+        """Amount still owed on a credit sale."""
+        return self.total - self.amount_paid
+    
     def calculate_totals(self):
         """Calculate sale totals from items."""
         items = self.items.all()
@@ -175,3 +195,49 @@ class Invoice(models.Model):
         return f"{self.get_invoice_type_display()} {self.series}-{self.number}"
 
 
+class Payment(models.Model):
+    """Payment applied to a credit sale."""
+    
+    class Method(models.TextChoices):
+        CASH = 'cash', 'Efectivo'
+        CARD = 'card', 'Tarjeta'
+        TRANSFER = 'transfer', 'Transferencia'
+    
+    sale = models.ForeignKey(
+        Sale,
+        on_delete=models.CASCADE,
+        related_name='payments',
+        verbose_name='Venta'
+    )
+    amount = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        verbose_name='Monto'
+    )
+    method = models.CharField(
+        max_length=20,
+        choices=Method.choices,
+        default=Method.CASH,
+        verbose_name='Método de pago'
+    )
+    reference = models.CharField(max_length=50, blank=True, verbose_name='Referencia')
+    notes = models.TextField(blank=True, verbose_name='Notas')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='payments',
+        verbose_name='Usuario'
+    )
+    paid_at = models.DateTimeField(default=timezone.now, verbose_name='Fecha de pago')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Pago'
+        verbose_name_plural = 'Pagos'
+        ordering = ['-paid_at']
+    
+    def __str__(self):
+        return f"Pago {self.amount} - Venta #{self.sale_id}"
+
+
@@ -1,9 +1,11 @@
 from rest_framework import serializers
-from .models import Sale, SaleItem, Invoice
+from .models import Sale, SaleItem, Invoice, Payment
+from apps.clients.serializers import ClientSerializer
 from apps.products.serializers import ProductSerializer
+from store_backend.fieldsets import FieldsetSerializerMixin
 
 
-class SaleItemSerializer(serializers.ModelSerializer):
+class SaleItemSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for SaleItem model."""
     
     product_name = serializers.CharField(source='product.name', read_only=True)
@@ -18,7 +20,7 @@ class SaleItemSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'subtotal', 'igv', 'total']
 
 
-class InvoiceSerializer(serializers.ModelSerializer):
+class InvoiceSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for Invoice model."""
     
     invoice_type_display = serializers.CharField(
@@ -35,7 +37,7 @@ class InvoiceSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'issued_at']
 
 
-class SaleSerializer(serializers.ModelSerializer):
+class SaleSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for Sale model."""
     
     items = SaleItemSerializer(many=True, read_only=True)
@@ -57,11 +59,13 @@ class SaleSerializer(serializers.ModelSerializer):
             'id', 'client', 'client_name', 'seller', 'seller_name',
             'subtotal', 'igv', 'total', 'payment_method',
             'payment_method_display', 'status', 'status_display',
-            'notes', 'items', 'invoice', 'created_at', 'updated_at'
+            'amount_paid', 'notes', 'items', 'invoice', 'created_at', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'subtotal', 'igv', 'total', 'seller', 'created_at', 'updated_at'
+            'id', 'subtotal', 'igv', 'total', 'seller', 'amount_paid',
+            'created_at', 'updated_at'
         ]
+        expandable_fields = {'client': ClientSerializer}
 
 
 class CreateSaleSerializer(serializers.Serializer):
@@ -83,3 +87,38 @@ class CreateSaleSerializer(serializers.Serializer):
     )
 
 
+class PaymentSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
+    """Serializer for payments on credit sales."""
+    
+    method_display = serializers.CharField(source='get_method_display', read_only=True)
+    client_name = serializers.CharField(source='sale.client.name', read_only=True)
+    user_name = serializers.CharField(source='user.username', read_only=True)
+    
+    class Meta:
+        model = Payment
+        fields = [
+            'id', 'sale', 'client_name', 'amount', 'method', 'method_display',
+            'reference', 'notes', 'user', 'user_name', 'paid_at', 'created_at'
+        ]
+        read_only_fields = ['id', 'user', 'created_at']
+    
+    def validate_amount(self, value):
+        if value <= 0:
+            raise serializers.ValidationError('El monto debe ser mayor a cero')
+        return value
+    
+    def validate(self, attrs):
+        sale = attrs.get('sale', getattr(self.instance, 'sale', None))
+        if sale.payment_method != Sale.PaymentMethod.CREDIT:
+            raise serializers.ValidationError({'sale': 'Solo se registran pagos de ventas al crédito'})
+        if sale.status == Sale.Status.CANCELLED:
+            raise serializers.ValidationError({'sale': 'La venta está anulada'})
+        
+        balance = sale.balance
+        if self.instance is not None and self.instance.sale_id == sale.pk:
+            balance += self.instance.amount
+        if attrs.get('amount', 0) > balance:
+            raise serializers.ValidationError({'amount': f'El monto excede el saldo pendiente ({balance})'})
+        return attrs
+
+
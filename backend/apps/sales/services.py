@@ -0,0 +1,94 @@
+from collections import Counter
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Sale, Invoice
+from apps.inventory.models import Inventory, InventoryMovement
+from apps.tasks.services import enqueue
+
+
+INVOICE_SERIES = {
+    Invoice.InvoiceType.BOLETA: 'B001',
+    Invoice.InvoiceType.FACTURA: 'F001',
+    Invoice.InvoiceType.NOTA_VENTA: 'NV01',
+}
+
+
+def create_invoice(sale, invoice_type=Invoice.InvoiceType.BOLETA):
+    """Create the next correlative invoice for a sale."""
+    last_invoice = Invoice.objects.filter(
+        invoice_type=invoice_type
+    ).order_by('-id').first()
+
+    if last_invoice:
+        number = str(int(last_invoice.number) + 1).zfill(8)
+    else:
+        number = '00000001'
+
+    invoice = Invoice.objects.create(
+        sale=sale,
+        invoice_type=invoice_type,
+        series=INVOICE_SERIES.get(invoice_type, 'B001'),
+        number=number
+    )
+    if getattr(settings, 'DOCUMENT_PRERENDER', False):
+        # A run_tasks worker renders the PDF, so printing the ticket is a file read
+        enqueue('documents.render_invoice', {'invoice_id': invoice.pk})
+    return invoice
+
+
+def register_stock_out(sale, items, user):
+    """
+    Discount stock for the given sale items.
+
+    Inventories are read with a single query and written back with
+    bulk_update/bulk_create, so the cost does not grow in queries
+    with the number of lines.
+    """
+    quantities = Counter()
+    for item in items:
+        quantities[item.product_id] += item.quantity
+
+    inventories = list(
+        Inventory.objects.select_for_update().filter(product_id__in=quantities)
+    )
+    now = timezone.now()
+    movements = []
+    for inventory in inventories:
+        previous_qty = inventory.quantity
+        inventory.quantity -= quantities[inventory.product_id]
+        inventory.updated_at = now
+        movements.append(InventoryMovement(
+            inventory=inventory,
+            movement_type=InventoryMovement.MovementType.OUT,
+            quantity=quantities[inventory.product_id],
+            previous_quantity=previous_qty,
+            new_quantity=inventory.quantity,
+            reason=f'Venta #{sale.id}',
+            user=user
+        ))
+
+    Inventory.objects.bulk_update(inventories, ['quantity', 'updated_at'])
+    InventoryMovement.objects.bulk_create(movements)
+    return movements
+
+
+def apply_payment(sale_id, amount):
+    """
+    Add (or with a negative amount, remove) a payment from a sale balance.
+
+    Returns False when a payment does not fit the sale's pending balance
+    or the sale is cancelled. The check is part of the UPDATE, so two
+    concurrent payments cannot both pass it and overpay the sale.
+    """
+    sales = Sale.objects.filter(pk=sale_id)
+    if amount > 0:
+        sales = sales.filter(amount_paid__lte=F('total') - amount).exclude(status=Sale.Status.CANCELLED)
+    return sales.update(
+        amount_paid=F('amount_paid') + amount,
+        updated_at=timezone.now()
+    ) == 1
+
+
@@ -1,9 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import SaleViewSet, InvoiceViewSet
+from .views import SaleViewSet, InvoiceViewSet, PaymentViewSet
 
 router = DefaultRouter()
 router.register('invoices', InvoiceViewSet, basename='invoices')
+router.register('payments', PaymentViewSet, basename='payments')
 router.register('', SaleViewSet, basename='sales')
 
 urlpatterns = [
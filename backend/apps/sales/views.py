@@ -1,20 +1,35 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from django.db import transaction
 from django.db.models import Q
+from django.utils import timezone
 
-from .models import Sale, SaleItem, Invoice
-from .serializers import SaleSerializer, CreateSaleSerializer, InvoiceSerializer
+from .models import Sale, SaleItem, Invoice, Payment
+from .serializers import (
+    SaleSerializer,
+    CreateSaleSerializer,
+    InvoiceSerializer,
+    PaymentSerializer
+)
+from .services import create_invoice, apply_payment
 from apps.products.models import Product
 from apps.clients.models import Client
+from apps.clients.services import register_purchase, revert_purchase
 from apps.inventory.models import Inventory, InventoryMovement
+from apps.documents.rendering import render_invoice, document_response
+from apps.outbox.models import OutboxEvent
+from apps.outbox.services import event, publish, snapshot
+from store_backend.fieldsets import FieldsetViewMixin
 
 
-class SaleViewSet(viewsets.ModelViewSet):
+class SaleViewSet(FieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for Sale management."""
     
-    queryset = Sale.objects.select_related('client', 'seller').prefetch_related('items__product').all()
+    queryset = Sale.objects.select_related(
+        'client', 'seller', 'invoice'
+    ).prefetch_related('items__product').all()
     serializer_class = SaleSerializer
     
     def get_queryset(self):
@@ -72,6 +87,8 @@ class SaleViewSet(viewsets.ModelViewSet):
         )
         
         # Create sale items and update inventory
+        items = []
+        movements = []
         for item_data in data['items']:
             try:
                 product = Product.objects.get(id=item_data['product'])
@@ -82,12 +99,12 @@ class SaleViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            SaleItem.objects.create(
+            items.append(SaleItem.objects.create(
                 sale=sale,
                 product=product,
                 quantity=item_data['quantity'],
                 unit_price=item_data.get('unit_price', product.price)
-            )
+            ))
             
             # Update inventory
             try:
@@ -96,7 +113,7 @@ class SaleViewSet(viewsets.ModelViewSet):
                 inventory.quantity -= item_data['quantity']
                 inventory.save()
                 
-                InventoryMovement.objects.create(
+                movements.append(InventoryMovement.objects.create(
                     inventory=inventory,
                     movement_type=InventoryMovement.MovementType.OUT,
                     quantity=item_data['quantity'],
@@ -104,7 +121,7 @@ class SaleViewSet(viewsets.ModelViewSet):
                     new_quantity=inventory.quantity,
                     reason=f'Venta #{sale.id}',
                     user=request.user
-                )
+                ))
             except Inventory.DoesNotExist:
                 pass
         
@@ -112,27 +129,15 @@ class SaleViewSet(viewsets.ModelViewSet):
         sale.calculate_totals()
         
         # Create invoice
-        invoice_type = data.get('invoice_type', Invoice.InvoiceType.BOLETA)
-        last_invoice = Invoice.objects.filter(
-            invoice_type=invoice_type
-        ).order_by('-id').first()
-        
-        if last_invoice:
-            number = str(int(last_invoice.number) + 1).zfill(8)
-        else:
-            number = '00000001'
-        
-        series_prefix = {
-            Invoice.InvoiceType.BOLETA: 'B001',
-            Invoice.InvoiceType.FACTURA: 'F001',
-            Invoice.InvoiceType.NOTA_VENTA: 'NV01',
-        }
-        
-        Invoice.objects.create(
-            sale=sale,
-            invoice_type=invoice_type,
-            series=series_prefix.get(invoice_type, 'B001'),
-            number=number
+        invoice = create_invoice(sale, data.get('invoice_type', Invoice.InvoiceType.BOLETA))
+        
+        # Update client purchase statistics
+        register_purchase(sale)
+        
+        publish(
+            event(sale, OutboxEvent.Action.CREATED, items=[snapshot(item) for item in items]),
+            event(invoice, OutboxEvent.Action.CREATED),
+            *(event(movement, OutboxEvent.Action.CREATED) for movement in movements)
         )
         
         return Response(
@@ -152,7 +157,21 @@ class SaleViewSet(viewsets.ModelViewSet):
             )
         
         with transaction.atomic():
+            # Guarded update: of two concurrent cancels only one restores
+            # the stock and the client statistics
+            now = timezone.now()
+            cancelled = Sale.objects.filter(pk=sale.pk, status=sale.status).update(
+                status=Sale.Status.CANCELLED,
+                updated_at=now
+            )
+            if not cancelled:
+                return Response(
+                    {'error': 'La venta ya está anulada'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
             # Restore inventory
+            movements = []
             for item in sale.items.all():
                 try:
                     inventory = Inventory.objects.get(product=item.product)
@@ -160,7 +179,7 @@ class SaleViewSet(viewsets.ModelViewSet):
                     inventory.quantity += item.quantity
                     inventory.save()
                     
-                    InventoryMovement.objects.create(
+                    movements.append(InventoryMovement.objects.create(
                         inventory=inventory,
                         movement_type=InventoryMovement.MovementType.IN,
                         quantity=item.quantity,
@@ -168,17 +187,51 @@ class SaleViewSet(viewsets.ModelViewSet):
                         new_quantity=inventory.quantity,
                         reason=f'Anulación de venta #{sale.id}',
                         user=request.user
-                    )
+                    ))
                 except Inventory.DoesNotExist:
                     pass
             
+            if sale.status == Sale.Status.COMPLETED:
+                revert_purchase(sale)
             sale.status = Sale.Status.CANCELLED
-            sale.save()
+            sale.updated_at = now
+            publish(
+                event(sale, OutboxEvent.Action.UPDATED),
+                *(event(movement, OutboxEvent.Action.CREATED) for movement in movements)
+            )
         
         return Response(SaleSerializer(sale).data)
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        # Locked: a concurrent cancel must not revert the statistics as well
+        previous = Sale.objects.select_for_update().get(pk=serializer.instance.pk)
+        sale = serializer.save()
+        # Client statistics count the completed sales of each client
+        if (previous.client_id, previous.status) != (sale.client_id, sale.status):
+            if previous.status == Sale.Status.COMPLETED:
+                revert_purchase(previous)
+            if sale.status == Sale.Status.COMPLETED:
+                register_purchase(sale)
+        publish(event(sale, OutboxEvent.Action.UPDATED))
+    
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        current = Sale.objects.select_for_update().filter(pk=instance.pk).values_list('status', flat=True).first()
+        if current == Sale.Status.COMPLETED:
+            revert_purchase(instance)
+        # Captured first: the rows lose their pk on delete, and the invoice
+        # and items go with the sale
+        items = [snapshot(item) for item in instance.items.all()]
+        deleted = [event(instance, OutboxEvent.Action.DELETED, items=items)]
+        invoice = Invoice.objects.filter(sale=instance).first()
+        if invoice is not None:
+            deleted.append(event(invoice, OutboxEvent.Action.DELETED))
+        instance.delete()
+        publish(*deleted)
 
 
-class InvoiceViewSet(viewsets.ReadOnlyModelViewSet):
+class InvoiceViewSet(FieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for Invoice (read-only)."""
     
     queryset = Invoice.objects.select_related('sale__client').all()
@@ -193,5 +246,75 @@ class InvoiceViewSet(viewsets.ReadOnlyModelViewSet):
             queryset = queryset.filter(invoice_type=invoice_type)
         
         return queryset
+    
+    @action(detail=True, methods=['get'])
+    def pdf(self, request, pk=None):
+        """Printable invoice as PDF."""
+        invoice = self.get_object()
+        path = render_invoice(invoice, 'pdf')
+        return document_response(path, 'pdf', f'{invoice.series}-{invoice.number}')
+    
+    @action(detail=True, methods=['get'])
+    def html(self, request, pk=None):
+        """Printable invoice as HTML."""
+        invoice = self.get_object()
+        path = render_invoice(invoice, 'html')
+        return document_response(path, 'html', f'{invoice.series}-{invoice.number}')
+
+
+class PaymentViewSet(FieldsetViewMixin, viewsets.ModelViewSet):
+    """ViewSet for payments on credit sales."""
+    
+    queryset = Payment.objects.select_related('sale__client', 'user').all()
+    serializer_class = PaymentSerializer
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        
+        # Filter by sale
+        sale = self.request.query_params.get('sale')
+        if sale:
+            queryset = queryset.filter(sale_id=sale)
+        
+        # Filter by client
+        client = self.request.query_params.get('client')
+        if client:
+            queryset = queryset.filter(sale__client_id=client)
+        
+        return queryset
+    
+    @transaction.atomic
+    def perform_create(self, serializer):
+        payment = serializer.save(user=self.request.user)
+        self.apply(payment)
+        self.publish_sales(payment.sale_id)
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        previous = Payment.objects.get(pk=serializer.instance.pk)
+        payment = serializer.save()
+        apply_payment(previous.sale_id, -previous.amount)
+        self.apply(payment)
+        self.publish_sales(previous.sale_id, payment.sale_id)
+    
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        apply_payment(instance.sale_id, -instance.amount)
+        instance.delete()
+        self.publish_sales(instance.sale_id)
+    
+    def apply(self, payment):
+        # The serializer checked the balance before any lock; a concurrent
+        # payment may have used it since, which rolls this one back
+        if not apply_payment(payment.sale_id, payment.amount):
+            sale = Sale.objects.get(pk=payment.sale_id)
+            if sale.status == Sale.Status.CANCELLED:
+                raise ValidationError({'sale': ['La venta está anulada']})
+            raise ValidationError({'amount': [f'El monto excede el saldo pendiente ({sale.balance})']})
+    
+    def publish_sales(self, *sale_ids):
+        # Re-read: amount_paid was updated with F()
+        sales = Sale.objects.filter(pk__in=set(sale_ids)).order_by('id')
+        publish(*(event(sale, OutboxEvent.Action.UPDATED) for sale in sales))
 
 
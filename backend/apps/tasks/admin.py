@@ -0,0 +1,31 @@
+from django.contrib import admin
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'key', 'status', 'priority', 'attempts', 'run_at', 'created_at', 'finished_at']
+    list_filter = ['status', 'priority', 'name']
+    search_fields = ['name', 'key']
+    readonly_fields = ['locked_by', 'locked_until', 'last_error', 'created_at', 'finished_at']
+    actions = ['retry']
+    
+    @admin.action(description='Reintentar las tareas fallidas seleccionadas')
+    def retry(self, request, queryset):
+        retried = 0
+        for task in queryset.filter(status=Task.Status.FAILED):
+            try:
+                with transaction.atomic():
+                    Task.objects.filter(pk=task.pk).update(
+                        status=Task.Status.PENDING, attempts=0, run_at=timezone.now(), finished_at=None
+                    )
+                retried += 1
+            except IntegrityError:
+                # Another task with the same key is already pending
+                pass
+        self.message_user(request, f'{retried} tareas reprogramadas')
+
+
@@ -0,0 +1,77 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.tasks.services import claim, purge_finished, run, schedule_periodic, worker_name
+
+PURGE_INTERVAL = 3600
+SCHEDULE_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    help = 'Run queued background tasks'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit when no task is due instead of waiting for more'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=2.0,
+            help='Seconds to wait between polls when the queue is empty'
+        )
+        parser.add_argument(
+            '--max-tasks',
+            type=int,
+            default=0,
+            help='Exit after running this many tasks (0 = no limit)'
+        )
+    
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        
+        worker = worker_name()
+        ran = failed = 0
+        purged_at = scheduled_at = 0
+        self.stdout.write(f'Worker {worker} started')
+        while not self.stopping:
+            # Same connection housekeeping as between requests
+            close_old_connections()
+            task = claim(worker)
+            if task is None:
+                if time.monotonic() - purged_at > PURGE_INTERVAL:
+                    purge_finished()
+                    purged_at = time.monotonic()
+                if time.monotonic() - scheduled_at > SCHEDULE_INTERVAL:
+                    schedule_periodic()
+                    scheduled_at = time.monotonic()
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+            
+            started = time.monotonic()
+            ok = run(task)
+            ran += 1
+            failed += not ok
+            self.stdout.write(
+                f"{task.name} #{task.pk} {'ok' if ok else 'failed'} "
+                f'in {time.monotonic() - started:.2f}s (attempt {task.attempts})'
+            )
+            if options['max_tasks'] and ran >= options['max_tasks']:
+                break
+        
+        self.stdout.write(self.style.SUCCESS(f'Ran {ran} tasks, {failed} failed'))
+    
+    def stop(self, signum, frame):
+        # Finish the current task, then exit
+        self.stopping = True
+
+
@@ -0,0 +1,67 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """Deferred call of a registered task function, run by the run_tasks worker."""
+    
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pendiente'
+        RUNNING = 'running', 'En ejecución'
+        DONE = 'done', 'Completada'
+        FAILED = 'failed', 'Fallida'
+    
+    class Priority(models.IntegerChoices):
+        LOW = 0, 'Baja'
+        NORMAL = 5, 'Normal'
+        HIGH = 10, 'Alta'
+    
+    name = models.CharField(max_length=200, verbose_name='Tarea')
+    kwargs = models.JSONField(default=dict, blank=True, verbose_name='Argumentos')
+    key = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name='Clave',
+        help_text='Solo una tarea pendiente por clave'
+    )
+    priority = models.SmallIntegerField(
+        choices=Priority.choices,
+        default=Priority.NORMAL,
+        verbose_name='Prioridad'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Estado'
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')
+    max_attempts = models.PositiveSmallIntegerField(default=3, verbose_name='Intentos máximos')
+    run_at = models.DateTimeField(default=timezone.now, verbose_name='Ejecutar desde')
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name='Worker')
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, verbose_name='Último error')
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'Tarea'
+        verbose_name_plural = 'Tareas'
+        ordering = ['-created_at']
+        indexes = [
+            # Next due task: status, then highest priority, then oldest
+            models.Index(fields=['status', '-priority', 'run_at'], name='task_queue_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['key'],
+                condition=Q(status='pending') & ~Q(key=''),
+                name='task_pending_key_unique'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
+
+
@@ -0,0 +1,170 @@
+"""
+Database-backed task queue.
+
+Task functions are registered with ``@task`` in a ``tasks.py`` module of any
+app and queued with ``enqueue``; the row is written in the caller's
+transaction, so a task only becomes visible to workers if that transaction
+commits. ``run_tasks`` workers claim due tasks by priority with a
+conditional UPDATE (no row locks, works the same on SQLite and PostgreSQL)
+and hold them for a lease: a task whose worker died is picked up again when
+the lease expires. Failures are retried with exponential backoff up to the
+task's ``max_attempts``. Periodic tasks in ``TASK_SCHEDULE`` are queued by
+the workers themselves, so no cron entry is needed.
+"""
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+def task(name=None, *, priority=Task.Priority.NORMAL, max_attempts=3):
+    """Register a function as a task; it is called with the keyword arguments it was queued with."""
+    def decorator(func):
+        func.task_name = name or f'{func.__module__}.{func.__name__}'
+        func.priority = priority
+        func.max_attempts = max_attempts
+        registry[func.task_name] = func
+        return func
+    return decorator
+
+
+def enqueue(func, kwargs=None, *, key='', priority=None, delay=None):
+    """
+    Queue a call of the task ``func`` (or its registered name).
+
+    ``kwargs`` must be JSON-serializable. With a ``key``, a task still pending
+    under the same key is returned instead of queueing a second one.
+    """
+    func = registry[func] if isinstance(func, str) else func
+    fields = {
+        'name': func.task_name,
+        'kwargs': kwargs or {},
+        'key': key,
+        'priority': func.priority if priority is None else priority,
+        'max_attempts': func.max_attempts,
+        'run_at': timezone.now() + (delay or timedelta()),
+    }
+    if not key:
+        return Task.objects.create(**fields)
+    
+    pending = Task.objects.filter(key=key, status=Task.Status.PENDING).first()
+    if pending is not None:
+        return pending
+    try:
+        with transaction.atomic():
+            return Task.objects.create(**fields)
+    except IntegrityError:
+        # Queued by someone else since the lookup
+        return Task.objects.get(key=key, status=Task.Status.PENDING)
+
+
+def schedule_periodic():
+    """Queue each task of ``TASK_SCHEDULE`` not pending yet, due one interval from now."""
+    for name, interval in getattr(settings, 'TASK_SCHEDULE', {}).items():
+        if name in registry:
+            enqueue(name, key=f'schedule:{name}', delay=timedelta(seconds=interval))
+        else:
+            logger.warning('Scheduled task %s is not registered', name)
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def lease_seconds():
+    return getattr(settings, 'TASK_LEASE_SECONDS', 300)
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt: doubles per attempt, capped at an hour."""
+    base = getattr(settings, 'TASK_RETRY_DELAY', 30)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), 3600))
+
+
+def claim(worker):
+    """Mark the next due task as running for ``worker`` and return it, or None."""
+    now = timezone.now()
+    expired = Q(status=Task.Status.RUNNING, locked_until__lt=now)
+    # Workers that died on their last attempt leave nothing to retry
+    Task.objects.filter(expired, attempts__gte=F('max_attempts')).update(
+        status=Task.Status.FAILED,
+        last_error='El worker no terminó la tarea antes de que venciera su plazo',
+        finished_at=now
+    )
+    
+    due = Q(status=Task.Status.PENDING, run_at__lte=now) | (expired & Q(attempts__lt=F('max_attempts')))
+    candidates = Task.objects.filter(due).order_by('-priority', 'run_at', 'id').values_list('id', flat=True)[:10]
+    for task_id in candidates:
+        # Only one worker's UPDATE still matches the row
+        claimed = Task.objects.filter(due, pk=task_id).update(
+            status=Task.Status.RUNNING,
+            locked_by=worker,
+            locked_until=now + timedelta(seconds=lease_seconds()),
+            attempts=F('attempts') + 1
+        )
+        if claimed:
+            return Task.objects.get(pk=task_id)
+    return None
+
+
+def run(task_row):
+    """Run a claimed task and record the outcome. Returns whether it succeeded."""
+    func = registry.get(task_row.name)
+    error = None
+    if func is None:
+        error = f'Tarea no registrada: {task_row.name}'
+    else:
+        try:
+            with transaction.atomic():
+                func(**task_row.kwargs)
+        except Exception:
+            error = traceback.format_exc()
+    
+    now = timezone.now()
+    mine = Task.objects.filter(pk=task_row.pk, status=Task.Status.RUNNING, locked_by=task_row.locked_by)
+    if error is None:
+        mine.update(status=Task.Status.DONE, last_error='', locked_until=None, finished_at=now)
+        return True
+    
+    if func is not None and task_row.attempts < task_row.max_attempts:
+        logger.warning('Task %s #%s failed, retrying', task_row.name, task_row.pk)
+        try:
+            with transaction.atomic():
+                mine.update(
+                    status=Task.Status.PENDING,
+                    last_error=error,
+                    locked_until=None,
+                    run_at=now + retry_delay(task_row.attempts)
+                )
+            return False
+        except IntegrityError:
+            # The same key was queued again meanwhile; that task does the work
+            pass
+    
+    logger.error('Task %s #%s failed: %s', task_row.name, task_row.pk, error)
+    mine.update(status=Task.Status.FAILED, last_error=error, locked_until=None, finished_at=now)
+    return False
+
+
+def purge_finished(days=None):
+    """Delete tasks that finished successfully more than ``days`` ago."""
+    days = getattr(settings, 'TASK_RETENTION_DAYS', 7) if days is None else days
+    deleted, _ = Task.objects.filter(
+        status=Task.Status.DONE,
+        finished_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+    return deleted
+
+
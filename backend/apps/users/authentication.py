@@ -0,0 +1,60 @@
+import copy
+import threading
+import time
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from .serializers import TOKEN_VERSION_CLAIM
+
+
+# user_id -> (token_version, expires_at, user). Entries are per process, so
+# a change made in another worker is seen at most AUTH_USER_CACHE_TTL later;
+# password changes bump token_version and are rejected as soon as the
+# database is consulted.
+_users = {}
+_lock = threading.Lock()
+
+
+def invalidate_user(user_id):
+    """Drop the cached user so the next request reloads it."""
+    with _lock:
+        _users.pop(str(user_id), None)
+
+
+def clear_user_cache():
+    with _lock:
+        _users.clear()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves users from a short-lived in-process cache.
+
+    Entries are keyed by user id and token version, so tokens issued before
+    a password change never match a cached user.
+    """
+    
+    def get_user(self, validated_token):
+        ttl = getattr(settings, 'AUTH_USER_CACHE_TTL', 60)
+        version = validated_token.get(TOKEN_VERSION_CLAIM, 0)
+        user_id = str(validated_token.get(api_settings.USER_ID_CLAIM))
+        now = time.monotonic()
+        
+        entry = _users.get(user_id)
+        if entry and entry[0] == version and entry[1] > now:
+            return copy.copy(entry[2])
+        
+        user = super().get_user(validated_token)
+        if user.token_version != version:
+            raise AuthenticationFailed('El token ya no es válido', code='token_not_valid')
+        
+        if ttl:
+            with _lock:
+                _users[user_id] = (version, now + ttl, copy.copy(user))
+        return user
+    
+
+
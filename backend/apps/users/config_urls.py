@@ -2,11 +2,14 @@ from django.urls import path
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from store_backend.conditional import condition
 from store_backend.config import APP_CONFIG
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+# Static for the life of the process: the ETag is the configuration's hash
+@condition(lambda request: [])
 def get_app_config(request):
     """Return public app configuration."""
     public_config = {
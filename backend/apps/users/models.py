@@ -18,6 +18,11 @@ class User(AbstractUser):
     )
     phone = models.CharField(max_length=20, blank=True, verbose_name='Teléfono')
     avatar = models.FileField(upload_to='avatars/', blank=True, null=True)
+    token_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Versión de token'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
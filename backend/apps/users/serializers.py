@@ -1,10 +1,16 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer as BaseTokenObtainPairSerializer
+)
 from django.contrib.auth import get_user_model
+from store_backend.fieldsets import FieldsetSerializerMixin
 
 User = get_user_model()
 
+TOKEN_VERSION_CLAIM = 'ver'
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UserSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for User model."""
     
     role_display = serializers.CharField(source='get_role_display', read_only=True)
@@ -19,7 +25,7 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class UserCreateSerializer(serializers.ModelSerializer):
+class UserCreateSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for creating users."""
     
     password = serializers.CharField(write_only=True, min_length=4)
@@ -46,3 +52,13 @@ class ChangePasswordSerializer(serializers.Serializer):
     new_password = serializers.CharField(required=True, min_length=4)
 
 
+class TokenObtainPairSerializer(BaseTokenObtainPairSerializer):
+    """Token pair serializer that stamps the user's token version."""
+    
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
@@ -4,12 +4,17 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.contrib.auth import get_user_model
 
-from .serializers import UserSerializer, UserCreateSerializer, ChangePasswordSerializer
+from .serializers import (
+    UserSerializer, UserCreateSerializer, ChangePasswordSerializer,
+    TokenObtainPairSerializer
+)
+from store_backend.conditional import ConditionalGetMixin
+from store_backend.fieldsets import FieldsetViewMixin
 
 User = get_user_model()
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, FieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for User management."""
     
     queryset = User.objects.all()
@@ -46,8 +51,15 @@ class UserViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             request.user.set_password(serializer.data['new_password'])
+            # Invalidates every token issued before the change
+            request.user.token_version += 1
             request.user.save()
-            return Response({'message': 'Contraseña actualizada correctamente'})
+            refresh = TokenObtainPairSerializer.get_token(request.user)
+            return Response({
+                'message': 'Contraseña actualizada correctamente',
+                'refresh': str(refresh),
+                'access': str(refresh.access_token),
+            })
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -0,0 +1,139 @@
+"""
+Concurrent checkout benchmark for the database configurations.
+
+Each worker process posts sales through the real ``POST /api/sales/`` view
+(serializer, stock discount, invoice) and records latency and lock errors.
+SQLite engines run against a fresh temporary file; ``postgresql`` uses the
+DB_* variables from the environment and writes into that database, so point
+it at a scratch database.
+
+    python benchmarks/checkout_concurrency.py --engines sqlite-default sqlite
+    DB_NAME=store_bench python benchmarks/checkout_concurrency.py --engines postgresql
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+PRODUCTS = 20
+
+
+def setup_django(engine, db_name):
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'store_backend.settings'
+    os.environ['DB_ENGINE'] = engine
+    if db_name:
+        os.environ['DB_NAME'] = db_name
+    import django
+    django.setup()
+
+
+def prepare(engine, db_name):
+    """Migrate the database and create the products the workers sell."""
+    setup_django(engine, db_name)
+    from decimal import Decimal
+    from django.core.management import call_command
+    from apps.users.models import User
+    from apps.products.models import Product
+    from apps.inventory.models import Inventory
+    
+    call_command('migrate', verbosity=0)
+    User.objects.get_or_create(username='bench', defaults={'role': User.Role.SELLER})
+    for index in range(PRODUCTS):
+        product, _ = Product.objects.get_or_create(
+            sku=f'BENCH-{index:03d}',
+            defaults={'name': f'Producto {index}', 'price': Decimal('10.00')}
+        )
+        Inventory.objects.update_or_create(product=product, defaults={'quantity': 10 ** 6})
+
+
+def worker(args):
+    engine, db_name, worker_id, checkouts = args
+    setup_django(engine, db_name)
+    from django.db import OperationalError
+    from rest_framework.test import APIClient
+    from apps.users.models import User
+    from apps.products.models import Product
+    
+    client = APIClient()
+    client.force_authenticate(User.objects.get(username='bench'))
+    product_ids = list(
+        Product.objects.filter(sku__startswith='BENCH-').values_list('id', flat=True)
+    )
+    
+    latencies, errors = [], 0
+    for index in range(checkouts):
+        items = [
+            {'product': product_ids[(worker_id + index + offset) % len(product_ids)], 'quantity': 1}
+            for offset in range(3)
+        ]
+        started = time.perf_counter()
+        try:
+            # A POS terminal looks products up before every checkout
+            response = client.get('/api/products/', HTTP_HOST='localhost')
+            ok = response.status_code == 200
+            if ok:
+                response = client.post(
+                    '/api/sales/', {'items': items}, format='json', HTTP_HOST='localhost'
+                )
+                ok = response.status_code == 201
+        except OperationalError:
+            ok = False
+        if ok:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors += 1
+    return latencies, errors
+
+
+def run(engine, workers, checkouts):
+    db_name = None
+    if engine.startswith('sqlite'):
+        db_name = os.path.join(tempfile.mkdtemp(prefix='store-bench-'), 'bench.sqlite3')
+    
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        pool.apply(prepare, (engine, db_name))
+    
+    started = time.perf_counter()
+    with context.Pool(workers) as pool:
+        results = pool.map(worker, [(engine, db_name, i, checkouts) for i in range(workers)])
+    elapsed = time.perf_counter() - started
+    
+    latencies = sorted(l for worker_latencies, _ in results for l in worker_latencies)
+    errors = sum(worker_errors for _, worker_errors in results)
+    return {
+        'engine': engine,
+        'ok': len(latencies),
+        'errors': errors,
+        'throughput': len(latencies) / elapsed,
+        'p50': statistics.median(latencies) * 1000 if latencies else 0,
+        'p95': latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--engines', nargs='+', default=['sqlite-default', 'sqlite'],
+                        choices=['sqlite-default', 'sqlite', 'postgresql'])
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--checkouts', type=int, default=50, help='Sales per worker')
+    options = parser.parse_args()
+    
+    print(f"{'engine':<16}{'ok':>7}{'errors':>8}{'sales/s':>10}{'p50 ms':>9}{'p95 ms':>9}")
+    for engine in options.engines:
+        result = run(engine, options.workers, options.checkouts)
+        print(
+            f"{result['engine']:<16}{result['ok']:>7}{result['errors']:>8}"
+            f"{result['throughput']:>10.1f}{result['p50']:>9.1f}{result['p95']:>9.1f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
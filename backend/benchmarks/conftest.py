@@ -0,0 +1,403 @@
+"""
+Endpoint benchmark suite.
+
+Generates a dataset with ``generate_load_data`` in the test database, then
+each test drives one endpoint through the full middleware stack with a real
+JWT and records latency percentiles, SQL queries per request and peak
+Python memory (tracemalloc). Results are compared with ``baselines.json``:
+a test fails when it runs more queries than its baseline. Query counts are
+deterministic; latency and memory on a shared machine are not, so growth
+beyond the tolerance is listed in the summary instead, and only fails with
+``--bench-strict`` (for a quiet machine), after a second measurement:
+
+    cd backend/benchmarks && pytest
+    pytest --update-baselines            # accept the current numbers
+    pytest --bench-sales 100000 -k reports
+    pytest --bench-strict                # also fail on latency and memory
+"""
+import json
+import re
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+
+BASELINES_PATH = Path(__file__).with_name('baselines.json')
+WARMUP_ROUNDS = 2
+# Absolute slack on top of the relative tolerance, so sub-millisecond
+# endpoints and small allocations do not fail on noise
+LATENCY_SLACK_MS = 2.0
+MEMORY_SLACK_KIB = 64
+# MetricsMiddleware counts queries on every alias and thread, including the
+# worker threads of the async report views
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+results_key = pytest.StashKey[dict]()
+warnings_key = pytest.StashKey[dict]()
+tempdir_key = pytest.StashKey[tempfile.TemporaryDirectory]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmarks')
+    group.addoption('--bench-rounds', type=int, default=15, help='Timed requests per endpoint')
+    group.addoption('--bench-sales', type=int, default=10000, help='Sales in the generated dataset')
+    group.addoption('--bench-seed', type=int, default=42)
+    group.addoption(
+        '--bench-end', default=None,
+        help='Last day of the dataset (YYYY-MM-DD, default today); reports measure windows ending today'
+    )
+    group.addoption(
+        '--bench-tolerance', type=float, default=0.5,
+        help='Allowed relative growth of median latency (0.5 = 50%%)'
+    )
+    group.addoption(
+        '--bench-memory-tolerance', type=float, default=1.0,
+        help='Allowed relative growth of peak memory; one traced request varies more than a median'
+    )
+    group.addoption(
+        '--bench-strict', action='store_true',
+        help='Fail on latency and memory growth too, not only on extra queries'
+    )
+    group.addoption(
+        '--update-baselines', action='store_true',
+        help='Write this run as the new baselines instead of comparing'
+    )
+    group.addoption('--bench-output', help='Also write this run results as JSON to this path')
+
+
+def pytest_configure(config):
+    from django.conf import settings
+    
+    config.stash[results_key] = {}
+    config.stash[warnings_key] = {}
+    database = settings.DATABASES['default']
+    if 'sqlite' in database['ENGINE']:
+        # A file in WAL mode like production, instead of the shared-cache
+        # in-memory database whose table locks block the async views' threads
+        config.stash[tempdir_key] = tempfile.TemporaryDirectory(prefix='store-bench-')
+        database.setdefault('TEST', {})['NAME'] = str(
+            Path(config.stash[tempdir_key].name) / 'bench.sqlite3'
+        )
+        # Each test runs inside one transaction; opened IMMEDIATE it would
+        # hold the write lock against the async views' worker connections
+        if 'transaction_mode' in database.get('OPTIONS', {}):
+            database['OPTIONS']['transaction_mode'] = 'DEFERRED'
+
+
+def pytest_unconfigure(config):
+    tempdir = config.stash.get(tempdir_key, None)
+    if tempdir is not None:
+        tempdir.cleanup()
+
+
+def dataset_options(config):
+    sales = config.getoption('--bench-sales')
+    return {
+        'products': 1000,
+        'clients': 2000,
+        'suppliers': 100,
+        'sellers': 5,
+        'sales': sales,
+        'quotes': max(100, sales // 10),
+        'expenses': max(100, sales // 10),
+        'days': 365,
+        'end': config.getoption('--bench-end') or timezone.localdate().isoformat(),
+        'seed': config.getoption('--bench-seed'),
+    }
+
+
+def load_baselines():
+    if BASELINES_PATH.exists():
+        return json.loads(BASELINES_PATH.read_text())
+    return {'dataset': None, 'results': {}}
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker, request):
+    """Test database filled with the generated dataset, shared by every test."""
+    # Render documents in-process so their cost is part of the request
+    overrides = override_settings(
+        DOCUMENTS_ROOT=Path(tempfile.mkdtemp(dir=request.config.stash[tempdir_key].name)),
+        DOCUMENT_RENDER_WORKERS=0,
+        SLOW_QUERY_THRESHOLD_MS=0,
+        # The cached user expiring mid-run adds a query to whichever request
+        # comes next, making query counts depend on timing
+        AUTH_USER_CACHE_TTL=24 * 3600,
+        # The test client connects from 127.0.0.1
+        METRICS_ALLOWED_IPS=['127.0.0.1'],
+    )
+    overrides.enable()
+    options = dataset_options(request.config)
+    # call_command does not apply argparse types to keyword options
+    options['end'] = date.fromisoformat(options['end'])
+    with django_db_blocker.unblock():
+        call_command('generate_load_data', verbosity=0, **options)
+    yield
+    overrides.disable()
+
+
+@pytest.fixture(scope='session')
+def data(django_db_setup, django_db_blocker, request):
+    """Ids of the objects the benchmark cases act on."""
+    from django.db.models import Count, F
+    from apps.users.models import User
+    from apps.users.serializers import TokenObtainPairSerializer
+    from apps.products.models import Category, Product
+    from apps.inventory.models import Inventory
+    from apps.clients.models import Client, Supplier
+    from apps.sales.models import Sale, Invoice, Payment
+    from apps.quotes.models import Quote
+    from apps.expenses.models import Expense, ExpenseCategory, RecurringExpense
+    
+    # Objects that a case consumes (cancel, convert) need one per request,
+    # for the measurement and a possible confirmation run
+    needed = 2 * (request.config.getoption('--bench-rounds') + WARMUP_ROUNDS + 1)
+    
+    with django_db_blocker.unblock():
+        admin = User.objects.create_user(
+            username='bench_admin', password='bench-password', role=User.Role.ADMIN
+        )
+        refresh = TokenObtainPairSerializer.get_token(admin)
+        product = Product.objects.filter(inventory__isnull=False).order_by('id').first()
+        recurring = RecurringExpense.objects.create(
+            category=ExpenseCategory.objects.order_by('id').first(),
+            description='Alquiler local',
+            amount='1500.00',
+            start_date='2024-01-01',
+            user=admin
+        )
+        return SimpleNamespace(
+            user=admin,
+            password='bench-password',
+            access=str(refresh.access_token),
+            refresh=str(refresh),
+            product=product.id,
+            barcode=product.barcode,
+            # Best stocked products, so checkouts never run out
+            stocked_products=list(
+                Inventory.objects.order_by('-quantity').values_list('product_id', flat=True)[:20]
+            ),
+            category=Category.objects.order_by('id').first().id,
+            inventory=product.inventory.id,
+            client=Client.objects.order_by('-purchase_count').first().id,
+            supplier=Supplier.objects.order_by('id').first().id,
+            sale=Sale.objects.order_by('-id').first().id,
+            # Same shape each round, so the query count does not vary
+            completed_sales=list(
+                Sale.objects.filter(status=Sale.Status.COMPLETED, client__isnull=False)
+                .annotate(lines=Count('items')).filter(lines=3)
+                .order_by('-id').values_list('id', flat=True)[:needed]
+            ),
+            credit_sale=Sale.objects.filter(
+                payment_method=Sale.PaymentMethod.CREDIT,
+                status=Sale.Status.COMPLETED,
+                total__gt=F('amount_paid') + 100
+            ).order_by('-id').first().id,
+            invoice=Invoice.objects.order_by('-id').first().id,
+            payment=Payment.objects.order_by('-id').first().id,
+            # Still editable: draft or sent and not yet due
+            quote=Quote.objects.filter(
+                status__in=[Quote.Status.DRAFT, Quote.Status.SENT],
+                valid_until__gte=date.today()
+            ).order_by('-id').first().id,
+            accepted_quotes=list(
+                Quote.objects.filter(status=Quote.Status.ACCEPTED, sale__isnull=True)
+                .annotate(lines=Count('items')).filter(lines=3)
+                .order_by('-id').values_list('id', flat=True)[:needed]
+            ),
+            expense=Expense.objects.order_by('-id').first().id,
+            expense_category=ExpenseCategory.objects.order_by('id').first().id,
+            recurring=recurring.id,
+        )
+
+
+def calibrate():
+    """Milliseconds for a fixed pure-Python workload: how fast the machine is right now."""
+    samples = []
+    for _ in range(5):
+        started = time.perf_counter()
+        rows = json.loads(json.dumps([
+            {'id': index, 'name': f'item {index}', 'price': index * 1.5} for index in range(2000)
+        ]))
+        sorted(rows, key=lambda row: row['name'])
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def percentile(samples, pct):
+    return statistics.quantiles(samples, n=100, method='inclusive')[pct - 1]
+
+
+def query_regressions(result, baseline):
+    if result['queries'] > baseline['queries']:
+        return [f"queries {result['queries']} > {baseline['queries']}"]
+    return []
+
+
+def resource_regressions(result, baseline, tolerance, memory_tolerance, same_dataset):
+    """Messages for latency and memory over their baseline limits."""
+    problems = []
+    if not same_dataset:
+        # Timings and memory depend on the data volume
+        return problems
+    # Latency is scaled up when the machine ran the calibration workload
+    # slower than when the baseline was taken; a quicker calibration never
+    # tightens the limit. p95/p99 of a few rounds swing with noise; they are
+    # reported, not gated.
+    speed = max(result['calibration_ms'] / baseline['calibration_ms'], 1.0)
+    limit = baseline['p50_ms'] * speed * (1 + tolerance) + LATENCY_SLACK_MS
+    if result['p50_ms'] > limit:
+        problems.append(f"p50_ms {result['p50_ms']:.2f} > {limit:.2f} (baseline {baseline['p50_ms']:.2f})")
+    limit = baseline['peak_kib'] * (1 + memory_tolerance) + MEMORY_SLACK_KIB
+    if result['peak_kib'] > limit:
+        problems.append(f"peak_kib {result['peak_kib']:.0f} > {limit:.0f} (baseline {baseline['peak_kib']:.0f})")
+    return problems
+
+
+class Bench:
+    """Measures one endpoint case and checks it against its baseline."""
+    
+    def __init__(self, config, client):
+        self.config = config
+        self.client = client
+        self.rounds = config.getoption('--bench-rounds')
+    
+    def request(self, method, path, data=None, format='json'):
+        if method == 'get':
+            return self.client.get(path, data)
+        return getattr(self.client, method)(path, data, format=format)
+    
+    def run(self, build, rounds, offset=0):
+        """
+        Run ``build(round) -> (method, path, data)`` for the warmup and timed
+        rounds, keep the SQL count of the last one and trace memory of one more.
+        """
+        timings = []
+        calibration = calibrate()
+        for index in range(WARMUP_ROUNDS + rounds + 1):
+            method, path, data = build(offset + index)
+            traced = index == WARMUP_ROUNDS + rounds
+            if traced:
+                tracemalloc.start()
+                before = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            response = self.request(method, path, data)
+            elapsed = time.perf_counter() - started
+            if traced:
+                peak = tracemalloc.get_traced_memory()[1] - before
+                tracemalloc.stop()
+            
+            assert response.status_code < 400, (
+                f'{method.upper()} {path} -> {response.status_code}: {response.content[:500]!r}'
+            )
+            if index >= WARMUP_ROUNDS and not traced:
+                timings.append(elapsed * 1000)
+                queries = int(SERVER_TIMING_QUERIES.search(response['Server-Timing']).group(1))
+        
+        return {
+            'p50_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'p99_ms': round(percentile(timings, 99), 3),
+            'queries': queries,
+            'peak_kib': round(peak / 1024, 1),
+            'rounds': rounds,
+            'calibration_ms': round((calibration + calibrate()) / 2, 3),
+        }
+    
+    def measure(self, name, build, rounds=None):
+        rounds = max(rounds or self.rounds, 2)
+        result = self.run(build, rounds)
+        
+        baselines = load_baselines()
+        baseline = baselines['results'].get(name)
+        if baseline is not None and not self.config.getoption('--update-baselines'):
+            same_dataset = baselines['dataset'] == dataset_options(self.config)
+            tolerance = (
+                self.config.getoption('--bench-tolerance'),
+                self.config.getoption('--bench-memory-tolerance'),
+            )
+            strict = self.config.getoption('--bench-strict')
+            problems = query_regressions(result, baseline)
+            slower = resource_regressions(result, baseline, *tolerance, same_dataset)
+            if slower and strict and not problems:
+                # A slow stretch on a shared machine looks like a regression;
+                # only fail if a second measurement confirms it
+                retry = self.run(build, rounds, offset=WARMUP_ROUNDS + rounds + 1)
+                result = {
+                    **result,
+                    'p50_ms': min(result['p50_ms'], retry['p50_ms']),
+                    'peak_kib': min(result['peak_kib'], retry['peak_kib']),
+                }
+                slower = resource_regressions(result, baseline, *tolerance, same_dataset)
+            if strict:
+                problems += slower
+            elif slower:
+                self.config.stash[warnings_key][name] = slower
+            if problems:
+                self.config.stash[results_key][name] = result
+                pytest.fail(f'{name} regressed: ' + '; '.join(problems), pytrace=False)
+        
+        self.config.stash[results_key][name] = result
+        return result
+
+
+@pytest.fixture
+def bench(db, data, request):
+    from rest_framework.test import APIClient
+    
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {data.access}')
+    return Bench(request.config, client)
+
+
+def pytest_sessionfinish(session):
+    results = session.config.stash.get(results_key, {})
+    if not results:
+        return
+    
+    output = session.config.getoption('--bench-output')
+    if output:
+        Path(output).write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
+    
+    if session.config.getoption('--update-baselines'):
+        baselines = load_baselines()
+        dataset = dataset_options(session.config)
+        if baselines['dataset'] != dataset:
+            # Numbers from another dataset are not comparable
+            baselines = {'dataset': dataset, 'results': {}}
+        baselines['results'].update(results)
+        baselines['results'] = dict(sorted(baselines['results'].items()))
+        BASELINES_PATH.write_text(json.dumps(baselines, indent=2) + '\n')
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.stash.get(results_key, {})
+    if not results:
+        return
+    baselines = load_baselines()['results']
+    terminalreporter.section('endpoint benchmarks')
+    terminalreporter.write_line(
+        f"{'case':<40} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'peak KiB':>9} {'vs p50':>7}"
+    )
+    for name, result in sorted(results.items()):
+        baseline = baselines.get(name)
+        ratio = f"{result['p50_ms'] / baseline['p50_ms']:.2f}x" if baseline and baseline['p50_ms'] else '-'
+        terminalreporter.write_line(
+            f"{name:<40} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+            f"{result['queries']:>8} {result['peak_kib']:>9.0f} {ratio:>7}"
+        )
+    
+    warnings = config.stash.get(warnings_key, {})
+    if warnings:
+        terminalreporter.section('over tolerance (not gated, see --bench-strict)')
+        for name, problems in sorted(warnings.items()):
+            terminalreporter.write_line(f"{name:<40} {'; '.join(problems)}")
@@ -0,0 +1,118 @@
+"""
+DRF's JSON renderer and parser against store_backend.renderers.
+
+Takes the response payloads of ``/api/sales/`` (one page of ``--page-size``
+sales) and ``/api/reports/inventory/`` from a generate_load_data dataset in a
+fresh temporary SQLite database, checks both renderers produce the same
+bytes, and times rendering, parsing the rendered body back, and the whole
+request with each renderer (best of ``--rounds``).
+
+    python benchmarks/json_rendering.py --sales 20000 --page-size 500
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+ENDPOINTS = ['/api/sales/', '/api/reports/inventory/']
+STDLIB = ('rest_framework.renderers.JSONRenderer', 'rest_framework.parsers.JSONParser')
+FAST = ('store_backend.renderers.FastJSONRenderer', 'store_backend.renderers.FastJSONParser')
+
+
+def setup(sales):
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'store_backend.settings'
+    os.environ['DB_NAME'] = os.path.join(tempfile.mkdtemp(prefix='store-bench-'), 'bench.sqlite3')
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from apps.users.models import User
+    
+    call_command('migrate', verbosity=0)
+    call_command('generate_load_data', sales=sales, verbosity=0)
+    return User.objects.create(username='bench', role=User.Role.ADMIN)
+
+
+def best_of(rounds, iterations, func, *args):
+    """Best time per call in microseconds."""
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func(*args)
+        best = min(best, (time.perf_counter() - started) / iterations)
+    return best * 1e6
+
+
+def rest_framework_settings(page_size, classes=None):
+    from django.conf import settings
+    overrides = {'PAGE_SIZE': page_size}
+    if classes:
+        overrides['DEFAULT_RENDERER_CLASSES'] = classes[:1]
+        overrides['DEFAULT_PARSER_CLASSES'] = classes[1:]
+    return dict(settings.REST_FRAMEWORK, **overrides)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sales', type=int, default=10000, help='Sales in the dataset')
+    parser.add_argument('--page-size', type=int, default=500, help='Sales in the /api/sales/ payload')
+    parser.add_argument('--iterations', type=int, default=20, help='Calls per round')
+    parser.add_argument('--rounds', type=int, default=5)
+    options = parser.parse_args()
+    
+    user = setup(options.sales)
+    from django.test import override_settings
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIClient
+    from store_backend import renderers
+    
+    if renderers.orjson is None:
+        print('orjson is not installed: FastJSONRenderer falls back to the stdlib encoder\n')
+    
+    client = APIClient()
+    client.force_authenticate(user)
+    
+    print(f"{'payload':<34}{'KiB':>8}{'':>3}{'drf us':>10}{'fast us':>10}{'speedup':>9}")
+    for path in ENDPOINTS:
+        with override_settings(REST_FRAMEWORK=rest_framework_settings(options.page_size)):
+            data = client.get(path, HTTP_HOST='localhost').data
+        drf_body = JSONRenderer().render(data)
+        fast_body = renderers.FastJSONRenderer().render(data)
+        assert drf_body == fast_body, f'{path}: rendered bytes differ'
+        assert JSONParser().parse(io.BytesIO(drf_body)) == renderers.FastJSONParser().parse(io.BytesIO(fast_body))
+        
+        timings = {
+            'render': (
+                best_of(options.rounds, options.iterations, JSONRenderer().render, data),
+                best_of(options.rounds, options.iterations, renderers.FastJSONRenderer().render, data),
+            ),
+            'parse': (
+                best_of(options.rounds, options.iterations,
+                        lambda: JSONParser().parse(io.BytesIO(drf_body))),
+                best_of(options.rounds, options.iterations,
+                        lambda: renderers.FastJSONParser().parse(io.BytesIO(drf_body))),
+            ),
+        }
+        request = []
+        for classes in (STDLIB, FAST):
+            with override_settings(REST_FRAMEWORK=rest_framework_settings(options.page_size, classes)):
+                request.append(best_of(
+                    options.rounds, max(1, options.iterations // 4),
+                    lambda: client.get(path, HTTP_HOST='localhost')
+                ))
+        timings['request'] = tuple(request)
+        
+        size = len(drf_body) / 1024
+        for step, (drf, fast) in timings.items():
+            print(f"{path + ' ' + step:<34}{size:>8.0f}{'':>3}{drf:>10.0f}{fast:>10.0f}{drf / fast:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+"""
+Offline load test for one node: cashiers and dashboards against a live server.
+
+Loads a generate_load_data dataset into a fresh temporary SQLite file (or the
+DB_* database with ``--engine postgresql``), starts ``manage.py runserver`` on
+a free local port and drives it from client processes that only use urllib.
+
+Cashier processes scan barcodes, post a sale with the scanned products and
+now and then cancel one of their earlier sales. Dashboard processes poll the
+dashboard report. Each ``--cashiers`` step runs for ``--duration`` seconds
+against the same server, so the steps show where throughput stops growing
+and whether lock errors or server CPU is the limit.
+
+    python benchmarks/load_test.py --cashiers 1 2 4 8 --dashboards 2
+    python benchmarks/load_test.py --cashiers 8 --duration 60 --json load.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+USERNAME = 'loadtest'
+PASSWORD = 'loadtest-password'
+OPERATIONS = ['scan', 'checkout', 'cancel', 'dashboard']
+
+
+def setup_django(engine, db_name):
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'store_backend.settings'
+    os.environ['DB_ENGINE'] = engine
+    if db_name:
+        os.environ['DB_NAME'] = db_name
+    import django
+    django.setup()
+
+
+def prepare(engine, db_name, sales, seed):
+    """Migrate, load the dataset and return the barcodes cashiers scan."""
+    setup_django(engine, db_name)
+    from django.core.management import call_command
+    from apps.users.models import User
+    from apps.inventory.models import Inventory
+    from apps.products.models import Product
+    
+    call_command('migrate', verbosity=0)
+    call_command(
+        'generate_load_data', sales=sales, quotes=max(100, sales // 10),
+        expenses=max(100, sales // 10), seed=seed, verbosity=0
+    )
+    User.objects.create_user(username=USERNAME, password=PASSWORD, role=User.Role.SELLER)
+    # Out-of-stock rejections would hide the errors this test is after
+    Inventory.objects.update(quantity=10 ** 6)
+    return list(
+        Product.objects.filter(is_active=True, barcode__isnull=False, inventory__isnull=False)
+        .exclude(barcode='').values_list('barcode', flat=True)
+    )
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(engine, db_name, port, log):
+    env = dict(os.environ, DB_ENGINE=engine)
+    if db_name:
+        env['DB_NAME'] = db_name
+    server = subprocess.Popen(
+        [sys.executable, 'manage.py', 'runserver', '--noreload', f'127.0.0.1:{port}'],
+        cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f'runserver exited with code {server.returncode}')
+        try:
+            urllib.request.urlopen(f'{base_url}/api/config/', timeout=1).close()
+            return server, base_url
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit('runserver did not answer within 30 seconds')
+
+
+def server_cpu_seconds(pid):
+    """User plus system CPU time of a process, or None where /proc is missing."""
+    try:
+        fields = Path(f'/proc/{pid}/stat').read_text().rsplit(')', 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+class Client:
+    """Minimal JSON client that records latency and outcome per operation."""
+    
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.token = None
+        self.samples = {operation: [] for operation in OPERATIONS}
+        self.errors = {operation: {} for operation in OPERATIONS}
+    
+    def call(self, method, path, body=None):
+        request = urllib.request.Request(
+            self.base_url + path, method=method,
+            data=json.dumps(body).encode() if body is not None else None,
+            headers={'Content-Type': 'application/json', 'Accept': 'application/json'}
+        )
+        if self.token:
+            request.add_header('Authorization', f'Bearer {self.token}')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, json.loads(response.read() or b'null')
+        except urllib.error.HTTPError as error:
+            error.read()
+            return error.code, None
+    
+    def login(self):
+        status, payload = self.call('POST', '/api/token/', {'username': USERNAME, 'password': PASSWORD})
+        if status != 200:
+            raise RuntimeError(f'login failed with HTTP {status}')
+        self.token = payload['access']
+    
+    def timed(self, operation, method, path, body=None, expected=200):
+        started = time.perf_counter()
+        try:
+            status, payload = self.call(method, path, body)
+        except (urllib.error.URLError, OSError) as error:
+            status, payload = type(error).__name__, None
+        self.samples[operation].append(time.perf_counter() - started)
+        if status != expected:
+            errors = self.errors[operation]
+            errors[str(status)] = errors.get(str(status), 0) + 1
+            return None
+        return payload
+
+
+def cashier(client, rng, deadline, barcodes, options):
+    sales = []
+    while time.monotonic() < deadline:
+        items = []
+        for _ in range(rng.randint(1, options.max_lines)):
+            product = client.timed('scan', 'GET', f'/api/products/by_barcode/?code={rng.choice(barcodes)}')
+            if product:
+                items.append({'product': product['id'], 'quantity': 1})
+        if items:
+            sale = client.timed(
+                'checkout', 'POST', '/api/sales/',
+                {'items': items, 'payment_method': 'cash'}, expected=201
+            )
+            if sale:
+                sales.append(sale['id'])
+        if sales and rng.random() < options.cancel_rate:
+            sale_id = sales.pop(rng.randrange(len(sales)))
+            client.timed('cancel', 'POST', f'/api/sales/{sale_id}/cancel/', {})
+        if options.think:
+            time.sleep(options.think)
+
+
+def dashboard(client, rng, deadline, barcodes, options):
+    while time.monotonic() < deadline:
+        client.timed('dashboard', 'GET', '/api/reports/dashboard/')
+        # Jitter so pollers do not hit the server in lockstep
+        time.sleep(options.poll_interval * rng.uniform(0.5, 1.5))
+
+
+def worker(args):
+    role, index, base_url, start_at, barcodes, options = args
+    rng = random.Random(options.seed * 1000 + index)
+    client = Client(base_url, options.timeout)
+    client.login()
+    # Every process starts at the same instant, after logging in
+    time.sleep(max(0.0, start_at - time.time()))
+    deadline = time.monotonic() + options.duration
+    (cashier if role == 'cashier' else dashboard)(client, rng, deadline, barcodes, options)
+    return client.samples, client.errors
+
+
+def percentile(samples, pct):
+    if len(samples) < 2:
+        return samples[0] * 1000 if samples else 0.0
+    return statistics.quantiles(samples, n=100, method='inclusive')[pct - 1] * 1000
+
+
+def run_step(cashiers, base_url, server, barcodes, options):
+    roles = ['cashier'] * cashiers + ['dashboard'] * options.dashboards
+    start_at = time.time() + 2 + 0.05 * len(roles)
+    cpu_before = server_cpu_seconds(server.pid)
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(len(roles)) as pool:
+        results = pool.map(worker, [
+            (role, index, base_url, start_at, barcodes, options) for index, role in enumerate(roles)
+        ])
+    cpu_after = server_cpu_seconds(server.pid)
+    
+    operations = {}
+    for operation in OPERATIONS:
+        samples = [sample for worker_samples, _ in results for sample in worker_samples[operation]]
+        errors = {}
+        for _, worker_errors in results:
+            for status, count in worker_errors[operation].items():
+                errors[status] = errors.get(status, 0) + count
+        failed = sum(errors.values())
+        operations[operation] = {
+            'requests': len(samples),
+            'errors': failed,
+            'error_rate': failed / len(samples) if samples else 0.0,
+            'errors_by_status': errors,
+            'per_second': (len(samples) - failed) / options.duration,
+            'p50_ms': percentile(samples, 50),
+            'p95_ms': percentile(samples, 95),
+            'p99_ms': percentile(samples, 99),
+        }
+    return {
+        'cashiers': cashiers,
+        'dashboards': options.dashboards,
+        'sales_per_second': operations['checkout']['per_second'],
+        'server_cpu': (
+            (cpu_after - cpu_before) / options.duration
+            if cpu_before is not None and cpu_after is not None else None
+        ),
+        'operations': operations,
+    }
+
+
+def print_step(step):
+    cpu = f"{step['server_cpu']:.0%}" if step['server_cpu'] is not None else 'n/a'
+    print(
+        f"\n{step['cashiers']} cashiers, {step['dashboards']} dashboards: "
+        f"{step['sales_per_second']:.1f} sales/s, server CPU {cpu} of one core"
+    )
+    print(f"{'operation':<11}{'ok/s':>8}{'requests':>10}{'errors':>8}{'err %':>7}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}  errors by status")
+    for operation, stats in step['operations'].items():
+        if not stats['requests']:
+            continue
+        by_status = ', '.join(f'{status}: {count}' for status, count in sorted(stats['errors_by_status'].items()))
+        print(
+            f"{operation:<11}{stats['per_second']:>8.1f}{stats['requests']:>10}{stats['errors']:>8}"
+            f"{stats['error_rate']:>7.1%}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}"
+            f"{stats['p99_ms']:>9.1f}  {by_status}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--engine', default='sqlite', choices=['sqlite-default', 'sqlite', 'postgresql'])
+    parser.add_argument('--cashiers', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='Cashier processes per step')
+    parser.add_argument('--dashboards', type=int, default=2, help='Dashboard pollers in every step')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds per step')
+    parser.add_argument('--max-lines', type=int, default=5, help='Most products scanned per sale')
+    parser.add_argument('--cancel-rate', type=float, default=0.05, help='Chance of cancelling after a sale')
+    parser.add_argument('--think', type=float, default=0, help='Seconds a cashier waits between sales')
+    parser.add_argument('--poll-interval', type=float, default=5, help='Seconds between dashboard polls')
+    parser.add_argument('--timeout', type=float, default=30, help='Client timeout per request')
+    parser.add_argument('--sales', type=int, default=20000, help='Historical sales in the dataset')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--server-log', help='Write runserver output here instead of discarding it')
+    parser.add_argument('--json', help='Also write the results to this file')
+    options = parser.parse_args()
+    
+    db_name = None
+    if options.engine.startswith('sqlite'):
+        db_name = os.path.join(tempfile.mkdtemp(prefix='store-load-'), 'load.sqlite3')
+    
+    print(f'Loading {options.sales} sales into {db_name or "the DB_* database"}...')
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        barcodes = pool.apply(prepare, (options.engine, db_name, options.sales, options.seed))
+    
+    log = open(options.server_log, 'w') if options.server_log else subprocess.DEVNULL
+    server, base_url = start_server(options.engine, db_name, free_port(), log)
+    steps = []
+    try:
+        for cashiers in options.cashiers:
+            step = run_step(cashiers, base_url, server, barcodes, options)
+            print_step(step)
+            steps.append(step)
+    finally:
+        server.terminate()
+        server.wait()
+        if options.server_log:
+            log.close()
+    
+    if options.json:
+        Path(options.json).write_text(json.dumps({'engine': options.engine, 'steps': steps}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
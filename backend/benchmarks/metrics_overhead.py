@@ -0,0 +1,116 @@
+"""
+Overhead of MetricsMiddleware per request.
+
+First measures the middleware's own cost in isolation (fixed cost per
+request and per SQL query), then runs the same requests through the full
+stack with and without it (alternating rounds, best of each) against a
+fresh temporary SQLite database.
+
+    python benchmarks/metrics_overhead.py --requests 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+ENDPOINTS = ['/api/config/', '/api/products/', '/api/reports/dashboard/']
+METRICS_MIDDLEWARE = 'store_backend.metrics.MetricsMiddleware'
+
+
+def setup():
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'store_backend.settings'
+    os.environ['DB_NAME'] = os.path.join(tempfile.mkdtemp(prefix='store-bench-'), 'bench.sqlite3')
+    import django
+    django.setup()
+    from decimal import Decimal
+    from django.core.management import call_command
+    from apps.users.models import User
+    from apps.products.models import Product
+    from apps.inventory.models import Inventory
+    
+    call_command('migrate', verbosity=0)
+    for index in range(20):
+        product = Product.objects.create(
+            sku=f'BENCH-{index:03d}', name=f'Producto {index}', price=Decimal('10.00')
+        )
+        Inventory.objects.create(product=product, quantity=100)
+    return User.objects.create(username='bench', role=User.Role.ADMIN)
+
+
+def timed_round(client, path, requests):
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get(path, HTTP_HOST='localhost')
+    return (time.perf_counter() - started) / requests
+
+
+def intrinsic_cost(iterations):
+    """Microseconds per request and per query added by the middleware."""
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+    from store_backend.metrics import MetricsMiddleware, record_query, registry, _current, RequestStats
+    
+    request = RequestFactory().get('/api/config/')
+    response = HttpResponse(b'{}')
+    middleware = MetricsMiddleware(lambda request: response)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        middleware(request)
+    per_request = (time.perf_counter() - started) / iterations
+    
+    execute = lambda sql, params, many, context: None
+    token = _current.set(RequestStats())
+    started = time.perf_counter()
+    for _ in range(iterations):
+        record_query(execute, 'SELECT 1', (), False, {})
+    per_query = (time.perf_counter() - started) / iterations
+    _current.reset(token)
+    
+    started = time.perf_counter()
+    for _ in range(iterations):
+        execute('SELECT 1', (), False, {})
+    per_query -= (time.perf_counter() - started) / iterations
+    registry.reset()
+    return per_request * 1e6, per_query * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=1000, help='Requests per round')
+    parser.add_argument('--rounds', type=int, default=5)
+    options = parser.parse_args()
+    
+    user = setup()
+    from django.conf import settings
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+    
+    per_request, per_query = intrinsic_cost(100000)
+    print(f'middleware: {per_request:.1f} us per request + {per_query:.2f} us per SQL query\n')
+    
+    clients = {'on': APIClient(), 'off': APIClient()}
+    without = [m for m in settings.MIDDLEWARE if m != METRICS_MIDDLEWARE]
+    # The test client builds its middleware chain once; build each under its settings
+    with override_settings(MIDDLEWARE=without):
+        clients['off'].handler.load_middleware()
+    clients['on'].handler.load_middleware()
+    for client in clients.values():
+        client.force_authenticate(user)
+    
+    print(f"{'endpoint':<28}{'off us':>10}{'on us':>10}{'overhead':>10}")
+    for path in ENDPOINTS:
+        best = {'off': float('inf'), 'on': float('inf')}
+        for _ in range(options.rounds):
+            for mode, client in clients.items():
+                best[mode] = min(best[mode], timed_round(client, path, options.requests))
+        overhead = (best['on'] - best['off']) / best['off'] * 100
+        print(f"{path:<28}{best['off'] * 1e6:>10.0f}{best['on'] * 1e6:>10.0f}{overhead:>9.2f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+"""
+One benchmark per endpoint in store_backend/urls.py.
+
+Each case builds the request for a given round, so cases that consume an
+object (cancelling a sale, converting a quote) act on a different one each
+time. ``test_every_endpoint_is_benchmarked`` fails when a route is added
+without a case here or an entry in EXCLUDED.
+"""
+from datetime import date
+from typing import Callable, NamedTuple, Optional
+
+import pytest
+from django.urls import get_resolver
+from django.urls.resolvers import URLResolver
+
+
+class Case(NamedTuple):
+    url_name: str
+    build: Callable
+    # Fewer rounds for endpoints dominated by password hashing
+    rounds: Optional[int] = None
+
+
+def get(path):
+    return lambda data, index: ('get', path.format(**vars(data)), None)
+
+
+def post(path, payload=None, method='post'):
+    def build(data, index):
+        body = payload(data, index) if callable(payload) else payload
+        return method, path.format(**vars(data)), body
+    return build
+
+
+def sale_payload(lines):
+    def payload(data, index):
+        return {
+            'payment_method': 'cash',
+            'client': data.client,
+            'items': [
+                {'product': product, 'quantity': 1}
+                for product in data.stocked_products[:lines]
+            ],
+        }
+    return payload
+
+
+def import_rows(kind):
+    def payload(data, index):
+        if kind == 'clients':
+            return {'rows': [
+                {'name': f'Cliente bench {index}-{row}', 'document_type': 'dni',
+                 'document_number': f'B{index:03d}{row:05d}'}
+                for row in range(50)
+            ]}
+        return {'rows': [
+            {'name': f'Proveedor bench {index}-{row}', 'ruc': f'2{index:04d}{row:06d}'}
+            for row in range(50)
+        ]}
+    return payload
+
+
+def nth(attribute, path):
+    """POST to an object that is used up by the request, a new one per round."""
+    def build(data, index):
+        return 'post', path.format(id=getattr(data, attribute)[index]), {}
+    return build
+
+
+CASES = {
+    # Authentication
+    'token-obtain': Case('token_obtain_pair', post(
+        '/api/token/', lambda data, index: {'username': data.user.username, 'password': data.password}
+    ), rounds=3),
+    'token-refresh': Case('token_refresh', post(
+        '/api/token/refresh/', lambda data, index: {'refresh': data.refresh}
+    )),
+    'config': Case('app_config', get('/api/config/')),
+    'metrics': Case('metrics', get('/api/metrics/')),
+    
+    # Users
+    'users-list': Case('users-list', get('/api/users/')),
+    'users-detail': Case('users-detail', get('/api/users/{user.id}/')),
+    'users-me': Case('users-me', get('/api/users/me/')),
+    'users-update-profile': Case('users-update-profile', post(
+        '/api/users/update_profile/', {'first_name': 'Bench'}, method='put'
+    )),
+    'users-create': Case('users-list', post('/api/users/', lambda data, index: {
+        'username': f'bench_user_{index}', 'password': 'bench-password', 'role': 'seller'
+    }), rounds=3),
+    
+    # Products
+    'products-list': Case('products-list', get('/api/products/')),
+    'products-search': Case('products-list', get('/api/products/?search=Premium')),
+    'products-by-barcode': Case('products-by-barcode', get('/api/products/by_barcode/?code={barcode}')),
+    'products-detail': Case('products-detail', get('/api/products/{product}/')),
+    'products-create': Case('products-list', post('/api/products/', lambda data, index: {
+        'name': f'Producto bench {index}', 'sku': f'BENCH-{index:05d}',
+        'price': '19.90', 'cost': '12.00', 'category': data.category
+    })),
+    'categories-list': Case('categories-list', get('/api/products/categories/')),
+    'categories-detail': Case('categories-detail', get('/api/products/categories/{category}/')),
+    
+    # Inventory
+    'inventory-list': Case('inventory-list', get('/api/inventory/')),
+    'inventory-low-stock': Case('inventory-low-stock', get('/api/inventory/low_stock/')),
+    'inventory-movements': Case('inventory-movements', get('/api/inventory/movements/')),
+    'inventory-detail': Case('inventory-detail', get('/api/inventory/{inventory}/')),
+    'inventory-adjust': Case('inventory-adjust', post(
+        '/api/inventory/{inventory}/adjust/',
+        {'movement_type': 'in', 'quantity': 1, 'reason': 'Benchmark'}
+    )),
+    
+    # Sales
+    'sales-list': Case('sales-list', get('/api/sales/')),
+    'sales-list-fields': Case('sales-list', get('/api/sales/?fields=id,total,status,created_at')),
+    'sales-list-expand-client': Case('sales-list', get('/api/sales/?omit=items,invoice&expand=client')),
+    'sales-detail': Case('sales-detail', get('/api/sales/{sale}/')),
+    'sales-create-1-item': Case('sales-list', post('/api/sales/', sale_payload(1))),
+    'sales-create-5-items': Case('sales-list', post('/api/sales/', sale_payload(5))),
+    'sales-create-20-items': Case('sales-list', post('/api/sales/', sale_payload(20))),
+    'sales-cancel': Case('sales-cancel', nth('completed_sales', '/api/sales/{id}/cancel/')),
+    'invoices-list': Case('invoices-list', get('/api/sales/invoices/')),
+    'invoices-detail': Case('invoices-detail', get('/api/sales/invoices/{invoice}/')),
+    'invoices-html': Case('invoices-html', get('/api/sales/invoices/{invoice}/html/')),
+    'invoices-pdf': Case('invoices-pdf', get('/api/sales/invoices/{invoice}/pdf/')),
+    'payments-list': Case('payments-list', get('/api/sales/payments/')),
+    'payments-detail': Case('payments-detail', get('/api/sales/payments/{payment}/')),
+    'payments-create': Case('payments-list', post('/api/sales/payments/', lambda data, index: {
+        'sale': data.credit_sale, 'amount': '1.00', 'method': 'cash'
+    })),
+    
+    # Clients and suppliers
+    'clients-list': Case('clients-list', get('/api/clients/')),
+    'clients-search': Case('clients-list', get('/api/clients/?search=Quispe')),
+    'clients-autocomplete': Case('clients-autocomplete', get('/api/clients/autocomplete/?q=Gar')),
+    'clients-detail': Case('clients-detail', get('/api/clients/{client}/')),
+    'clients-create': Case('clients-list', post('/api/clients/', lambda data, index: {
+        'name': f'Cliente bench {index}', 'document_type': 'dni', 'document_number': f'BENCH{index:05d}'
+    })),
+    'clients-import-50': Case('clients-bulk-import', post('/api/clients/import/', import_rows('clients'))),
+    'suppliers-list': Case('suppliers-list', get('/api/clients/suppliers/')),
+    'suppliers-detail': Case('suppliers-detail', get('/api/clients/suppliers/{supplier}/')),
+    'suppliers-import-50': Case('suppliers-bulk-import', post(
+        '/api/clients/suppliers/import/', import_rows('suppliers')
+    )),
+    
+    # Expenses
+    'expenses-list': Case('expenses-list', get('/api/expenses/')),
+    'expenses-detail': Case('expenses-detail', get('/api/expenses/{expense}/')),
+    'expenses-create': Case('expenses-list', post('/api/expenses/', lambda data, index: {
+        'category': data.expense_category, 'description': f'Gasto bench {index}',
+        'amount': '45.50', 'payment_method': 'cash', 'date': date.today().isoformat()
+    })),
+    'expense-categories-list': Case('expense-categories-list', get('/api/expenses/categories/')),
+    'expense-categories-detail': Case(
+        'expense-categories-detail', get('/api/expenses/categories/{expense_category}/')
+    ),
+    'recurring-expenses-list': Case('recurring-expenses-list', get('/api/expenses/recurring/')),
+    'recurring-expenses-detail': Case(
+        'recurring-expenses-detail', get('/api/expenses/recurring/{recurring}/')
+    ),
+    'recurring-expenses-generate': Case('recurring-expenses-generate', post(
+        '/api/expenses/recurring/generate/', {}
+    )),
+    
+    # Quotes
+    'quotes-list': Case('quotes-list', get('/api/quotes/')),
+    'quotes-detail': Case('quotes-detail', get('/api/quotes/{quote}/')),
+    'quotes-create': Case('quotes-list', post('/api/quotes/', lambda data, index: {
+        'client': data.client,
+        'items': [{'product': product, 'quantity': 2} for product in data.stocked_products[:3]],
+    })),
+    'quotes-edit-items': Case('quotes-edit-items', post(
+        '/api/quotes/{quote}/items/',
+        lambda data, index: {'items': [
+            {'product': product, 'quantity': index + 1} for product in data.stocked_products[:3]
+        ]},
+        method='put'
+    )),
+    'quotes-send': Case('quotes-send', post('/api/quotes/{quote}/send/', {})),
+    'quotes-accept': Case('quotes-accept', post('/api/quotes/{quote}/accept/', {})),
+    'quotes-reject': Case('quotes-reject', post('/api/quotes/{quote}/reject/', {})),
+    'quotes-convert': Case('quotes-convert', nth('accepted_quotes', '/api/quotes/{id}/convert/')),
+    'quotes-html': Case('quotes-html', get('/api/quotes/{quote}/html/')),
+    'quotes-pdf': Case('quotes-pdf', get('/api/quotes/{quote}/pdf/')),
+    
+    # Reports
+    'reports-dashboard': Case('dashboard_summary', get('/api/reports/dashboard/')),
+    'reports-sales-chart': Case('sales_chart', get('/api/reports/sales-chart/')),
+    'reports-sales-chart-365': Case('sales_chart', get('/api/reports/sales-chart/?days=365')),
+    'reports-sales-by-category': Case('sales_by_category', get('/api/reports/sales-by-category/')),
+    'reports-top-products': Case('top_products', get('/api/reports/top-products/')),
+    'reports-sales-by-seller': Case('sales_by_seller', get('/api/reports/sales-by-seller/')),
+    'reports-inventory': Case('inventory_report', get('/api/reports/inventory/')),
+    'reports-monthly-comparison': Case('monthly_comparison', get('/api/reports/monthly-comparison/')),
+    'reports-accounting': Case('accounting_report', get('/api/reports/accounting/')),
+    'reports-receivables': Case('receivables_report', get('/api/reports/receivables/')),
+    'reports-async-dashboard': Case('async_dashboard_summary', get('/api/reports/async/dashboard/')),
+    'reports-async-sales-chart': Case('async_sales_chart', get('/api/reports/async/sales-chart/')),
+    'reports-async-sales-by-category': Case(
+        'async_sales_by_category', get('/api/reports/async/sales-by-category/')
+    ),
+    'reports-async-top-products': Case('async_top_products', get('/api/reports/async/top-products/')),
+    'reports-async-sales-by-seller': Case(
+        'async_sales_by_seller', get('/api/reports/async/sales-by-seller/')
+    ),
+    'reports-async-dashboard-bundle': Case(
+        'async_dashboard_bundle', get('/api/reports/async/dashboard-bundle/')
+    ),
+    'reports-live-ticket': Case('dashboard_stream_ticket', post('/api/reports/live/ticket/')),
+    # Without waiting: an empty feed would long-poll for CHANGE_FEED_WAIT
+    'changes-feed': Case('change_feed', get('/api/changes/?wait=0&limit=100')),
+}
+
+# Routes deliberately left out, with the reason
+EXCLUDED = {
+    'api-root': 'DRF browsable index',
+    'users-change-password': 'revokes the token the suite authenticates with',
+    'dashboard_stream': 'event stream, its cost is per change rather than per request',
+}
+
+
+def url_names(resolver=None):
+    for pattern in (resolver or get_resolver()).url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.app_name != 'admin':
+                yield from url_names(pattern)
+        elif pattern.name:
+            yield pattern.name
+
+
+def test_every_endpoint_is_benchmarked():
+    covered = {case.url_name for case in CASES.values()} | set(EXCLUDED)
+    missing = sorted(set(url_names()) - covered)
+    assert not missing, f'Endpoints without a benchmark case: {missing}'
+
+
+@pytest.mark.parametrize('name', CASES)
+def test_endpoint(bench, data, name):
+    case = CASES[name]
+    bench.measure(name, lambda index: case.build(data, index), rounds=case.rounds)
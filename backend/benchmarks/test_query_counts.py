@@ -0,0 +1,145 @@
+"""
+N+1 guard for every router list route.
+
+Each GET route of the viewsets that takes no URL arguments is requested with
+a page of 1 and a page of 50 rows; both must run the same number of SQL
+queries. Every query is attributed to the serializer field being rendered
+when it ran (``SaleSerializer.items > SaleItemSerializer.product_name``), or
+to the view itself, and a failure lists the fields whose query count grows
+with the page:
+
+    cd backend/benchmarks && pytest test_query_counts.py
+"""
+import sys
+import warnings
+from collections import Counter
+from contextlib import contextmanager
+
+import pytest
+from django.core.paginator import UnorderedObjectListWarning
+from django.db import connections
+from django.urls import get_resolver, reverse
+from django.urls.resolvers import URLResolver
+from rest_framework.serializers import Serializer
+
+PAGE_SIZES = (1, 50)
+VIEW = '(view)'
+
+# Routes that need query parameters to answer with a list
+PARAMS = {
+    'clients-autocomplete': {'q': 'ma'},
+    'products-by-barcode': lambda data: {'code': data.barcode},
+}
+# Routes sized by their own parameter instead of ?page_size=
+SIZE_PARAMS = {
+    'clients-autocomplete': 'limit',
+}
+
+SERIALIZER_TO_REPRESENTATION = Serializer.to_representation.__code__
+
+
+def router_routes(resolver=None):
+    """Names of the viewset GET routes without URL arguments (lists and detail=False actions)."""
+    for pattern in (resolver or get_resolver()).url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.app_name != 'admin':
+                yield from router_routes(pattern)
+        elif 'get' in (getattr(pattern.callback, 'actions', None) or {}) and not pattern.pattern.regex.groups:
+            yield pattern.name
+
+
+def rendered_fields(frame):
+    """``Serializer.field`` chain being rendered in ``frame`` and its callers."""
+    chain = []
+    while frame is not None:
+        if frame.f_code is SERIALIZER_TO_REPRESENTATION and 'field' in frame.f_locals:
+            serializer = frame.f_locals['self']
+            chain.append(f"{type(serializer).__name__}.{frame.f_locals['field'].field_name}")
+        frame = frame.f_back
+    return ' > '.join(reversed(chain)) or VIEW
+
+
+class QueryRecorder:
+    """Execute wrapper counting queries per rendered serializer field."""
+    
+    def __init__(self):
+        self.sources = Counter()
+    
+    def __call__(self, execute, sql, params, many, context):
+        self.sources[rendered_fields(sys._getframe(1))] += 1
+        return execute(sql, params, many, context)
+    
+    @property
+    def total(self):
+        return sum(self.sources.values())
+
+
+def rows(body):
+    if isinstance(body, dict) and isinstance(body.get('results'), list):
+        return len(body['results'])
+    if isinstance(body, list):
+        return len(body)
+    return None
+
+
+@contextmanager
+def recording(recorder):
+    # Not connection.execute_wrapper(): it pops the last wrapper, and the
+    # metrics recorder is appended on every reconnect in the middle of a request
+    for connection in connections.all():
+        connection.execute_wrappers.append(recorder)
+    try:
+        yield recorder
+    finally:
+        for connection in connections.all():
+            if recorder in connection.execute_wrappers:
+                connection.execute_wrappers.remove(recorder)
+
+
+def request(client, name, params):
+    with recording(QueryRecorder()) as recorder, warnings.catch_warnings():
+        # Unordered pagination gives pages that overlap or skip rows
+        warnings.simplefilter('error', UnorderedObjectListWarning)
+        response = client.get(reverse(name), params)
+    assert response.status_code == 200, f'{name} -> {response.status_code}: {response.content[:500]!r}'
+    return recorder, rows(response.json())
+
+
+def report(name, small, large):
+    lines = [f'{name}: {small.total} queries for {PAGE_SIZES[0]} row(s), {large.total} for {PAGE_SIZES[1]}']
+    lines.append(f"{'source':<72}{PAGE_SIZES[0]:>6}{PAGE_SIZES[1]:>6}")
+    for source in sorted(set(small.sources) | set(large.sources)):
+        if small.sources[source] != large.sources[source]:
+            lines.append(f'{source:<72}{small.sources[source]:>6}{large.sources[source]:>6}')
+    return '\n'.join(lines)
+
+
+@pytest.fixture
+def api_client(db, data):
+    from rest_framework.test import APIClient
+    
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {data.access}')
+    return client
+
+
+@pytest.mark.parametrize('name', sorted(set(router_routes())))
+def test_query_count_is_constant(api_client, data, name):
+    params = PARAMS.get(name, {})
+    if callable(params):
+        params = params(data)
+    size_param = SIZE_PARAMS.get(name, 'page_size')
+    
+    # Fewest queries of two runs per size: per-process caches with a TTL
+    # (lazy quote expiry) refresh in either of them
+    runs = [
+        request(api_client, name, dict(params, **{size_param: size}))
+        for _ in range(2) for size in PAGE_SIZES
+    ]
+    (small, small_rows), (large, large_rows) = [
+        min(runs[index::len(PAGE_SIZES)], key=lambda run: run[0].total)
+        for index in range(len(PAGE_SIZES))
+    ]
+    if small_rows is None or small_rows == large_rows:
+        pytest.skip(f'{name} does not page: the row count does not follow ?{size_param}=')
+    assert small.total == large.total, report(name, small, large)
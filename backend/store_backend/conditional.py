@@ -0,0 +1,166 @@
+"""
+Conditional GET (ETag/Last-Modified) for read endpoints.
+
+Validators come from aggregates over the rows a response is built from
+(row count and latest ``updated_at``, including related rows the response
+shows) rather than from the rendered body, so a client that already has the
+current version gets ``304 Not Modified`` before the view runs its own
+queries or serializes anything. Responses are marked ``private, no-cache``:
+browsers keep them and revalidate on every use.
+"""
+import hashlib
+import json
+from calendar import timegm
+from datetime import datetime
+from functools import wraps
+
+from django.core.exceptions import ValidationError
+from django.db import connections, router
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+
+from store_backend.config import APP_CONFIG
+
+# Serializers read the configuration (IGV rate, currency), so it is part of
+# every validator
+CONFIG_VERSION = hashlib.md5(
+    json.dumps(APP_CONFIG, sort_keys=True, default=str).encode()
+).hexdigest()
+
+
+def queryset_state(queryset, fields=('updated_at',)):
+    """Row count and latest value of each field path, in one query."""
+    aggregates = {}
+    for index, path in enumerate(fields):
+        aggregates[f'count_{index}'] = Count(path)
+        aggregates[f'max_{index}'] = Max(path)
+    state = queryset.order_by().aggregate(**aggregates)
+    return [state[key] for key in sorted(state)]
+
+
+def tables_state(*models):
+    """
+    Row count and latest ``updated_at`` of whole tables, in one query per database.
+
+    Every value is its own scalar subquery so the database can answer it
+    from an index; ``COUNT`` and ``MAX`` in one aggregate would scan the table.
+    """
+    by_alias = {}
+    for model in models:
+        by_alias.setdefault(router.db_for_read(model), []).append(model)
+    state = []
+    for alias, alias_models in by_alias.items():
+        connection = connections[alias]
+        quote = connection.ops.quote_name
+        columns = []
+        for model in alias_models:
+            table = quote(model._meta.db_table)
+            column = quote(model._meta.get_field('updated_at').column)
+            columns += [f'(SELECT COUNT(*) FROM {table})', f'(SELECT MAX({column}) FROM {table})']
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT ' + ', '.join(columns))
+            row = cursor.fetchone()
+        for index, model in enumerate(alias_models):
+            count, latest = row[2 * index:2 * index + 2]
+            # SQLite returns the timestamp as text
+            state.append([model._meta.label, count, parse_datetime(str(latest)) if latest else None])
+    return state
+
+
+def validators(request, state):
+    """Weak ETag and Last-Modified timestamp for a response built from ``state``."""
+    user = getattr(request, 'user', None)
+    key = json.dumps(
+        [CONFIG_VERSION, request.get_full_path(), getattr(user, 'pk', None), state],
+        default=str
+    )
+    etag = f'W/"{hashlib.md5(key.encode()).hexdigest()}"'
+    moments = [value for value in flatten(state) if isinstance(value, datetime)]
+    last_modified = timegm(max(moments).utctimetuple()) if moments else None
+    return etag, last_modified
+
+
+def flatten(values):
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            yield from flatten(value)
+        else:
+            yield value
+
+
+def precondition(request, state):
+    """Validators for ``state``, and the 304 to send if the client's copy is current."""
+    etag, last_modified = validators(request, state)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    return response, etag, last_modified
+
+
+def set_validators(response, etag, last_modified):
+    response.headers['ETag'] = etag
+    if last_modified is not None:
+        response.headers['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_response(request, state, view):
+    """``view()`` with validators for ``state``, or a 304 without calling it."""
+    response, etag, last_modified = precondition(request, state)
+    if response is None:
+        response = view()
+        if response.status_code != 200:
+            return response
+    return set_validators(response, etag, last_modified)
+
+
+def condition(state_func):
+    """Decorator for function views; ``state_func(request, ...)`` returns what the response depends on."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            return conditional_response(
+                request,
+                state_func(request, *args, **kwargs),
+                lambda: view(request, *args, **kwargs)
+            )
+        return wrapper
+    return decorator
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin adding validators and 304 responses to ``list`` and ``retrieve``.
+
+    ``conditional_fields`` lists the field paths whose count and latest value
+    identify a version of the response: the model's own ``updated_at`` plus
+    the related rows the serializer shows.
+    """
+    
+    conditional_fields = ('updated_at',)
+    
+    def list(self, request, *args, **kwargs):
+        def view():
+            return super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        return conditional_response(request, queryset_state(queryset, self.conditional_fields), view)
+    
+    def retrieve(self, request, *args, **kwargs):
+        def view():
+            return super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+        
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            state = queryset_state(
+                queryset.filter(**{self.lookup_field: kwargs[lookup_url_kwarg]}),
+                self.conditional_fields
+            )
+        except (TypeError, ValueError, ValidationError):
+            # Malformed lookup: let the view answer with its usual 404
+            return view()
+        return conditional_response(request, state, view)
@@ -0,0 +1,170 @@
+"""
+Sparse fieldsets: ``?fields=``, ``?omit=`` and ``?expand=`` on GET responses.
+
+``FieldsetSerializerMixin`` trims the fields a ModelSerializer renders:
+
+- ``fields=id,total,status`` keeps only those fields
+- ``omit=items,invoice`` drops fields
+- ``expand=client`` replaces a relation's id with the nested serializer
+  declared in ``Meta.expandable_fields``
+
+Unknown names answer 400. An expanded serializer leaves out its
+``Meta.annotated_fields``: aggregates its own viewset annotates, which
+would cost a query per row when nested.
+
+``FieldsetViewMixin`` is the queryset side for ``list``/``retrieve``: it
+drops ``select_related``/``prefetch_related`` lookups for relations the
+response no longer renders and, when every rendered field is a model field,
+loads only those columns. Writes and custom actions are left alone.
+"""
+import re
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+from rest_framework.serializers import ListSerializer, ValidationError
+
+FIELDSET_PARAMS = ('fields', 'omit', 'expand')
+
+DISPLAY_METHOD = re.compile(r'get_(\w+)_display')
+
+
+def requested_names(request, param):
+    return {name.strip() for name in request.query_params.get(param, '').split(',') if name.strip()}
+
+
+def fieldset_request(serializer):
+    """The request whose query string shapes ``serializer``, or None."""
+    request = serializer.context.get('request')
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None
+    # Only the top-level serializer (or the child of a top-level many=True)
+    root = serializer.root
+    if root is not serializer and not (isinstance(root, ListSerializer) and serializer.parent is root):
+        return None
+    if not any(param in request.query_params for param in FIELDSET_PARAMS):
+        return None
+    return request
+
+
+class FieldsetSerializerMixin:
+    """ModelSerializer mixin applying ``?fields=``, ``?omit=`` and ``?expand=``."""
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        if getattr(self, 'expanded', False):
+            for name in getattr(self.Meta, 'annotated_fields', ()):
+                fields.pop(name, None)
+        request = fieldset_request(self)
+        if request is None:
+            return fields
+        
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        expand = requested_names(request, 'expand')
+        check_names('expand', expand, expandable.keys())
+        for name in expand:
+            fields[name] = expandable[name](read_only=True)
+            fields[name].expanded = True
+        
+        wanted = requested_names(request, 'fields')
+        omitted = requested_names(request, 'omit')
+        check_names('fields', wanted, fields.keys())
+        check_names('omit', omitted, fields.keys())
+        if wanted:
+            fields = {name: field for name, field in fields.items() if name in wanted}
+        for name in omitted:
+            fields.pop(name, None)
+        return fields
+
+
+def check_names(param, names, known):
+    unknown = sorted(names - set(known))
+    if unknown:
+        raise ValidationError({param: [f"Campos desconocidos: {', '.join(unknown)}"]})
+
+
+def select_related_lookups(tree, prefix=''):
+    for name, children in tree.items():
+        yield prefix + name
+        yield from select_related_lookups(children, f'{prefix}{name}__')
+
+
+def expansion_lookups(name, serializer):
+    """``select_related`` lookups for the foreign keys an expanded serializer renders through."""
+    model = serializer.Meta.model
+    for field in serializer.fields.values():
+        if field.source == '*':
+            continue
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            continue
+        if model_field.concrete and (model_field.many_to_one or model_field.one_to_one):
+            yield f'{name}__{model_field.name}'
+
+
+def trim_queryset(queryset, fields):
+    """Drop joins, prefetches and columns that ``fields`` do not render."""
+    model = queryset.model
+    relations = set()
+    columns = {model._meta.pk.name}
+    expansions = []
+    exact = True
+    # Method fields and the like may read anything, joins included
+    opaque = any(field.source == '*' for field in fields)
+    for field in fields:
+        if field.source == '*':
+            exact = False
+            continue
+        attribute = field.source_attrs[0]
+        display = DISPLAY_METHOD.fullmatch(attribute)
+        if display:
+            attribute = display.group(1)
+        try:
+            model_field = model._meta.get_field(attribute)
+        except FieldDoesNotExist:
+            # Property or method on the model
+            exact = False
+            continue
+        if model_field.is_relation:
+            relations.add(attribute)
+            if getattr(field, 'expanded', False) and model_field.concrete:
+                expansions.append((attribute, field))
+        if model_field.concrete:
+            columns.add(attribute)
+    
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict) and not opaque:
+        kept = [
+            lookup for lookup in select_related_lookups(select_related)
+            if lookup.split('__')[0] in relations
+        ]
+        queryset = queryset.select_related(None).select_related(*kept)
+    if queryset.query.select_related is not True:
+        # Expanded rows are joined, and so are the relations they render
+        for name, serializer in expansions:
+            queryset = queryset.select_related(name, *expansion_lookups(name, serializer))
+    
+    prefetches = queryset._prefetch_related_lookups
+    if prefetches and not opaque:
+        kept = [
+            lookup for lookup in prefetches
+            if (lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup).split('__')[0] in relations
+        ]
+        queryset = queryset.prefetch_related(None).prefetch_related(*kept)
+    
+    if exact:
+        queryset = queryset.only(*columns)
+    return queryset
+
+
+class FieldsetViewMixin:
+    """ViewSet mixin trimming the ``list``/``retrieve`` queryset to the requested fieldset."""
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in ('list', 'retrieve') or not isinstance(queryset, QuerySet):
+            return queryset
+        serializer = self.get_serializer()
+        if fieldset_request(serializer) is None:
+            return queryset
+        return trim_queryset(queryset, serializer.fields.values())
@@ -0,0 +1,265 @@
+"""
+In-process request metrics.
+
+``MetricsMiddleware`` times every request, counts the SQL it runs on any
+database alias and thread (including the worker threads used by the async
+report views) and the response size, aggregates them per route, and adds a
+``Server-Timing`` header. ``metrics_view`` exposes the aggregates in the
+Prometheus text format at ``/api/metrics/``. Each process keeps its own
+numbers; with several workers, scrape each one or sum them in Prometheus.
+"""
+import re
+import secrets
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import lru_cache
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+ROUTE_GROUP = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestStats:
+    """SQL counters for one request, shared with the threads it spawns."""
+    
+    __slots__ = ('queries', 'sql_time', 'lock')
+    
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.lock = threading.Lock()
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        with stats.lock:
+            stats.queries += 1
+            stats.sql_time += elapsed
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    # Fires on every (re)connect of every alias in every thread
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class Histogram:
+    """Prometheus-style histogram with fixed upper bounds."""
+    
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+    
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+    
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+
+
+class RouteMetrics:
+    """Aggregates for one (route, method) pair."""
+    
+    __slots__ = ('latency', 'queries', 'sql_seconds', 'response_bytes', 'statuses')
+    
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.sql_seconds = 0.0
+        self.response_bytes = 0
+        self.statuses = {}
+
+
+class MetricsRegistry:
+    """Process-wide store of route metrics."""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+    
+    def observe(self, route, method, status, duration, stats, size):
+        status_class = f'{status // 100}xx'
+        with self.lock:
+            metrics = self.routes.get((route, method))
+            if metrics is None:
+                metrics = self.routes[(route, method)] = RouteMetrics()
+            metrics.latency.observe(duration)
+            metrics.queries.observe(stats.queries)
+            metrics.sql_seconds += stats.sql_time
+            metrics.response_bytes += size
+            metrics.statuses[status_class] = metrics.statuses.get(status_class, 0) + 1
+    
+    def reset(self):
+        with self.lock:
+            self.routes.clear()
+    
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self.lock:
+            routes = sorted(self.routes.items())
+            lines = []
+            
+            def header(name, kind, help_text):
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+            
+            def histogram(name, attribute):
+                for (route, method), metrics in routes:
+                    labels = f'route="{route}",method="{method}"'
+                    hist = getattr(metrics, attribute)
+                    for bound, total in hist.cumulative():
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+                    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+                    lines.append(f'{name}_sum{{{labels}}} {hist.sum}')
+                    lines.append(f'{name}_count{{{labels}}} {hist.count}')
+            
+            header('store_http_requests_total', 'counter', 'Requests by route, method and status class.')
+            for (route, method), metrics in routes:
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(
+                        f'store_http_requests_total{{route="{route}",method="{method}",status="{status}"}} {count}'
+                    )
+            
+            header('store_http_request_duration_seconds', 'histogram', 'Request latency.')
+            histogram('store_http_request_duration_seconds', 'latency')
+            
+            header('store_db_queries_per_request', 'histogram', 'SQL queries executed per request.')
+            histogram('store_db_queries_per_request', 'queries')
+            
+            header('store_db_query_duration_seconds_total', 'counter', 'Time spent in SQL.')
+            for (route, method), metrics in routes:
+                lines.append(
+                    f'store_db_query_duration_seconds_total{{route="{route}",method="{method}"}} {metrics.sql_seconds}'
+                )
+            
+            header('store_http_response_size_bytes_total', 'counter', 'Response body bytes.')
+            for (route, method), metrics in routes:
+                lines.append(
+                    f'store_http_response_size_bytes_total{{route="{route}",method="{method}"}} {metrics.response_bytes}'
+                )
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+@lru_cache(maxsize=None)
+def clean_route(route):
+    """'api/sales/^(?P<pk>[^/.]+)/$' (DRF router regex) -> '/api/sales/<pk>/'."""
+    return '/' + ROUTE_GROUP.sub(r'<\1>', route).replace('^', '').replace('$', '')
+
+
+def route_of(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return clean_route(match.route) if match.route else match.view_name
+
+
+def response_size(response):
+    if response.streaming:
+        return int(response.get('Content-Length') or 0)
+    return len(response.content)
+
+
+class MetricsMiddleware:
+    """Record latency, SQL and response size per route; add Server-Timing."""
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        connection_created.connect(install_query_recorder, dispatch_uid='store_metrics')
+        # Connections opened before the middleware was loaded
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(None, connection)
+    
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, started, stats)
+    
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, started, stats)
+    
+    def finish(self, request, response, started, stats):
+        duration = time.perf_counter() - started
+        registry.observe(
+            route_of(request), request.method, response.status_code,
+            duration, stats, response_size(response)
+        )
+        response['Server-Timing'] = (
+            f'app;dur={duration * 1000:.1f}, '
+            f'db;dur={stats.sql_time * 1000:.1f};desc="{stats.queries} queries"'
+        )
+        return response
+
+
+def scrape_allowed(request):
+    """Whether the request carries METRICS_TOKEN or comes from METRICS_ALLOWED_IPS."""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token and secrets.compare_digest(
+        request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode()
+    ):
+        return True
+    return request.META.get('REMOTE_ADDR') in getattr(settings, 'METRICS_ALLOWED_IPS', [])
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint; hidden (404) from anyone not allowed to scrape."""
+    if not scrape_allowed(request):
+        raise Http404
+    return HttpResponse(
+        registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
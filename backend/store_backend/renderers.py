@@ -0,0 +1,92 @@
+"""
+JSON renderer and parser backed by orjson, with the stdlib as fallback.
+
+orjson is optional (``pip install orjson``). Without it, or for anything it
+cannot encode or decode the way DRF does, these classes defer to DRF's
+``JSONRenderer``/``JSONParser``, so output and error messages stay the same:
+Decimal, date/time, lazy translation strings and other non-native types go
+through DRF's ``JSONEncoder.default``, and U+2028/U+2029 are escaped as DRF
+does. The only difference is NaN/Infinity floats, which render as ``null``
+instead of raising.
+"""
+import codecs
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    # Dates and dataclasses go through DRF's encoder instead of orjson's own
+    # formatting; dict/list/str subclasses (ReturnDict, SafeString) stay native
+    OPTIONS = (
+        orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_NON_STR_KEYS
+    )
+
+
+_default = JSONEncoder().default
+
+# orjson reads integers past 64 bits as floats; the stdlib keeps them exact.
+# Bodies with a run of 19+ digits go to the stdlib (translate + find is far
+# cheaper than a regex over the whole body).
+DIGITS_TO_ZERO = bytes.maketrans(b'123456789', b'000000000')
+LONG_NUMBER = b'0' * 19
+
+
+def dumps(data):
+    """Compact UTF-8 JSON as bytes, encoded like DRF's ``JSONRenderer``."""
+    if orjson is not None:
+        try:
+            rendered = orjson.dumps(data, default=_default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            if b'\xe2\x80' in rendered:
+                rendered = rendered.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+            return rendered
+    return JSONRenderer().render(data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` that encodes with orjson when it is installed."""
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        fast = (
+            orjson is not None
+            and api_settings.COMPACT_JSON
+            and api_settings.UNICODE_JSON
+            and self.get_indent(accepted_media_type or '', renderer_context or {}) is None
+        )
+        if not fast:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    """``JSONParser`` that decodes UTF-8 bodies with orjson when it is installed."""
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        if LONG_NUMBER not in body.translate(DIGITS_TO_ZERO):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                # Let the stdlib decoder produce the usual error message
+                pass
+        return super().parse(io.BytesIO(body), media_type, parser_context)
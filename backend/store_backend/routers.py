@@ -0,0 +1,120 @@
+"""
+Read-replica routing.
+
+Reads go to the ``replica`` alias only while ``ReplicaRoutingMiddleware``
+has marked the current request as replica-safe: GET/HEAD on reports and
+list endpoints, from a client that has not written recently. Everything
+else, including all writes and anything outside a request (commands,
+workers, tests), stays on ``default``.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.urls import Resolver404, resolve
+
+
+REPLICA_DB_ALIAS = 'replica'
+PIN_COOKIE = 'use_primary'
+PRIMARY_HEADER = 'HTTP_X_READ_PRIMARY'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """Route reads in the block to the replica (when one is configured)."""
+    token = _use_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    
+    def db_for_read(self, model, **hints):
+        # Authentication must see new and deactivated users immediately
+        if model._meta.label == settings.AUTH_USER_MODEL:
+            return DEFAULT_DB_ALIAS
+        if _use_replica.get() and replica_configured():
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+    
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def is_replica_request(request):
+    """Whether a request may read from the replica."""
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    
+    # Explicit per-request override: ?primary=1 or X-Read-Primary: 1
+    if request.GET.get('primary') == '1' or request.META.get(PRIMARY_HEADER) == '1':
+        return False
+    # Read-your-writes: the client wrote recently
+    if request.COOKIES.get(PIN_COOKIE):
+        return False
+    
+    if request.path_info.startswith(tuple(settings.REPLICA_READ_PREFIXES)):
+        return True
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return False
+    return bool(match.url_name and match.url_name.endswith('-list'))
+
+
+class ReplicaRoutingMiddleware:
+    """Mark replica-safe requests and pin writers to the primary for a while."""
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not replica_configured():
+            return self.get_response(request)
+        
+        with use_replica(is_replica_request(request)):
+            response = self.get_response(request)
+        return self.pin_writer(request, response)
+    
+    async def __acall__(self, request):
+        if not replica_configured():
+            return await self.get_response(request)
+        
+        with use_replica(is_replica_request(request)):
+            response = await self.get_response(request)
+        return self.pin_writer(request, response)
+    
+    def pin_writer(self, request, response):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax'
+            )
+        return response
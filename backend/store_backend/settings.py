@@ -2,12 +2,18 @@
 Django settings for store_backend project.
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
+from dotenv import load_dotenv
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Values from backend/.env (see .env.example); real environment wins
+load_dotenv(BASE_DIR / '.env')
+
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = 'django-insecure-store-dev-key-change-in-production'
 
@@ -37,10 +43,18 @@ INSTALLED_APPS = [
     'apps.expenses',
     'apps.quotes',
     'apps.reports',
+    'apps.documents',
+    'apps.tasks',
+    'apps.outbox',
+    'apps.ops',
 ]
 
 MIDDLEWARE = [
+    'store_backend.metrics.MetricsMiddleware',
+    'store_backend.compression.CompressionMiddleware',
+    'store_backend.slow_queries.SlowQueryMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'store_backend.routers.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -71,12 +85,80 @@ TEMPLATES = [
 WSGI_APPLICATION = 'store_backend.wsgi.application'
 
 # Database
-DATABASES = {
-    'default': {
+# DB_ENGINE=sqlite (default) uses the tuned backend in store_backend/sqlite3,
+# DB_ENGINE=sqlite-default the stock one, DB_ENGINE=postgresql PostgreSQL.
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'store'),
+            'USER': os.getenv('DB_USER', 'store'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            # Keep connections open between requests, checking them first
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+elif DB_ENGINE == 'sqlite-default':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'store_backend.sqlite3',
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                'pragmas': {
+                    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', '15000')),
+                    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', '-65536')),
+                    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', '268435456')),
+                },
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
+    }
+
+# Optional read replica used for reports and list endpoints
+# (store_backend/routers.py). For SQLite it is a copy refreshed with
+# `manage.py refresh_replica`; for PostgreSQL a streaming replica host.
+REPLICA_SQLITE_PATH = os.getenv('DB_REPLICA_NAME')
+if DB_ENGINE == 'postgresql' and os.getenv('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+elif DB_ENGINE != 'postgresql' and REPLICA_SQLITE_PATH:
+    DATABASES['replica'] = {
+        # The copy is swapped in by rename and never written in place
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': f'file:{REPLICA_SQLITE_PATH}?mode=ro&immutable=1',
+        'OPTIONS': {'uri': True},
+        'TEST': {'MIRROR': 'default'},
     }
-}
+
+DATABASE_ROUTERS = ['store_backend.routers.ReplicaRouter']
+REPLICA_READ_PREFIXES = ['/api/reports/']
+# How long a client that wrote keeps reading from the primary
+REPLICA_PIN_SECONDS = int(os.getenv('DB_REPLICA_PIN_SECONDS', '300'))
+
+# /api/metrics/ answers 404 unless the scraper sends this Bearer token
+# (Prometheus scrape config) or connects from one of the allowed addresses
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.getenv('METRICS_ALLOWED_IPS', '').split(',') if ip.strip()]
+
+# Slow query log (store_backend/slow_queries.py): disabled unless a threshold is set
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', '0'))
+SLOW_QUERY_LOG_PATH = Path(os.getenv('SLOW_QUERY_LOG_PATH', BASE_DIR / 'logs' / 'slow_queries.jsonl'))
 
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
@@ -110,6 +192,40 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Rendered invoices and quotes (PDF/HTML), cached by document id and version
+DOCUMENTS_ROOT = MEDIA_ROOT / 'documents'
+DOCUMENT_RENDER_WORKERS = 2  # process pool size, 0 renders inside the request
+DOCUMENT_RENDER_TIMEOUT = 30  # seconds
+# Queue a PDF render task for every new invoice; needs a run_tasks worker
+DOCUMENT_PRERENDER = os.getenv('DOCUMENT_PRERENDER') == '1'
+
+# Background tasks (python manage.py run_tasks)
+TASK_LEASE_SECONDS = 300  # a running task is retried if its worker has not finished it by then
+TASK_RETRY_DELAY = 30  # seconds before the first retry, doubled on each further attempt
+TASK_RETENTION_DAYS = 7  # successful tasks are deleted after this many days
+# Periodic tasks: seconds between runs. Idle run_tasks workers queue each one
+# (once, under its own key) due an interval after the previous run
+# (clients.rebuild_stats rewrites every client in one transaction, so it
+# is queued on demand rather than scheduled)
+TASK_SCHEDULE = {
+    'quotes.expire_overdue': 300,
+    'expenses.generate_recurring': 3600,
+}
+
+# Change feed (/api/changes/)
+CHANGE_FEED_BATCH_SIZE = 100  # events per response unless ?limit= asks for fewer or more
+CHANGE_FEED_MAX_BATCH_SIZE = 1000
+CHANGE_FEED_WAIT = 25  # longest long-poll in seconds, below common proxy read timeouts
+CHANGE_FEED_POLL_INTERVAL = 0.5  # seconds between outbox checks while waiting
+
+# Live dashboard stream (/api/reports/live/, ASGI only)
+LIVE_POLL_INTERVAL = 1  # seconds between outbox checks while a dashboard is open
+LIVE_REFRESH_SECONDS = 60  # full recompute for figures without change events (expenses, clients, products)
+LIVE_KEEPALIVE_SECONDS = 15  # comment line sent on idle streams so proxies keep them open
+LIVE_STREAM_SECONDS = 300  # streams end after this long and the browser reconnects
+LIVE_TICKET_SECONDS = 60  # how long a stream ticket can be used to connect
+LIVE_QUEUE_SIZE = 100  # pending deltas per subscriber before it is dropped
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -126,12 +242,22 @@ CORS_ALLOW_CREDENTIALS = True
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # orjson-backed when installed, same output as DRF's JSON classes otherwise
+    'DEFAULT_RENDERER_CLASSES': (
+        'store_backend.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'store_backend.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'store_backend.pagination.StandardPagination',
     'PAGE_SIZE': 20,
 }
 
@@ -142,6 +268,13 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.users.serializers.TokenObtainPairSerializer',
 }
 
+# Seconds an authenticated user stays cached per process (0 disables it)
+AUTH_USER_CACHE_TTL = 60
+
+# Smallest JSON/HTML body worth compressing, in bytes
+COMPRESSION_MIN_SIZE = 1024
+
 
@@ -0,0 +1,139 @@
+"""
+Opt-in slow query log.
+
+With ``SLOW_QUERY_THRESHOLD_MS`` set, every SQL statement slower than the
+threshold is appended as a JSON line to ``SLOW_QUERY_LOG_PATH`` with its
+duration, the view that ran it and a fingerprint of the normalized SQL.
+The first time a fingerprint is seen in a process its plan is captured
+(``EXPLAIN QUERY PLAN`` on SQLite, ``EXPLAIN`` on PostgreSQL), so repeated
+offenders cost one line each. ``manage.py slow_queries`` summarizes the log.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+from django.utils.deprecation import MiddlewareMixin
+
+
+_view = ContextVar('slow_query_view', default=None)
+_explained = set()
+_lock = threading.Lock()
+
+NORMALIZE_PATTERNS = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'%s|\?'), '?'),
+    # IN (?, ?, ?) of any length is the same statement
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(?+)'),
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def fingerprint(sql):
+    """Normalized SQL (literals and parameters replaced) and its short hash."""
+    normalized = sql
+    for pattern, replacement in NORMALIZE_PATTERNS:
+        normalized = pattern.sub(replacement, normalized)
+    normalized = normalized.strip()
+    return normalized, hashlib.md5(normalized.encode()).hexdigest()[:12]
+
+
+def explain(connection, sql, params):
+    """Plan of a SELECT through the raw DB-API cursor (bypasses wrappers)."""
+    if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return None
+    
+    if connection.vendor == 'sqlite':
+        from django.db.backends.sqlite3.base import FORMAT_QMARK_REGEX
+        statement = 'EXPLAIN QUERY PLAN ' + FORMAT_QMARK_REGEX.sub('?', sql).replace('%%', '%')
+    elif connection.vendor == 'postgresql':
+        statement = 'EXPLAIN ' + sql
+    else:
+        return None
+    
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(statement, params or ())
+        rows = cursor.fetchall()
+    except Exception as exc:
+        return [f'EXPLAIN failed: {exc}']
+    finally:
+        cursor.close()
+    
+    if connection.vendor == 'sqlite':
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+def write_entry(entry):
+    path = settings.SLOW_QUERY_LOG_PATH
+    line = json.dumps(entry, ensure_ascii=False, default=str) + '\n'
+    with _lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as log:
+            log.write(line)
+
+
+def log_slow_queries(connection):
+    """Execute wrapper bound to one connection."""
+    def wrapper(execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+            return result
+        
+        normalized, key = fingerprint(sql)
+        entry = {
+            'at': timezone.now().isoformat(),
+            'fingerprint': key,
+            'duration_ms': round(duration_ms, 2),
+            'view': _view.get() or '-',
+            'alias': connection.alias,
+            'sql': normalized,
+        }
+        with _lock:
+            first_time = key not in _explained
+            _explained.add(key)
+        if first_time and not many:
+            entry['plan'] = explain(connection, sql, params)
+        write_entry(entry)
+        return result
+    
+    wrapper.slow_query_log = True
+    return wrapper
+
+
+def install_slow_query_log(sender, connection, **kwargs):
+    if not any(getattr(w, 'slow_query_log', False) for w in connection.execute_wrappers):
+        connection.execute_wrappers.append(log_slow_queries(connection))
+
+
+class SlowQueryMiddleware(MiddlewareMixin):
+    """Enable the slow query log and tag queries with the view that ran them."""
+    
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_THRESHOLD_MS:
+            raise MiddlewareNotUsed()
+        super().__init__(get_response)
+        connection_created.connect(install_slow_query_log, dispatch_uid='store_slow_queries')
+        for connection in connections.all(initialized_only=True):
+            install_slow_query_log(None, connection)
+    
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _view.set(request.resolver_match.view_name)
+    
+    def process_response(self, request, response):
+        _view.set(None)
+        return response
+
+
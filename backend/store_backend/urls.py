@@ -5,6 +5,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from store_backend.metrics import metrics_view
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -24,7 +25,9 @@ urlpatterns = [
     path('api/expenses/', include('apps.expenses.urls')),
     path('api/quotes/', include('apps.quotes.urls')),
     path('api/reports/', include('apps.reports.urls')),
+    path('api/changes/', include('apps.outbox.urls')),
     path('api/config/', include('apps.users.config_urls')),
+    path('api/metrics/', metrics_view, name='metrics'),
 ]
 
 if settings.DEBUG:
@@ -72,17 +72,13 @@ const Dashboard = () => {
     const fetchData = async () => {
       try {
         setError(null);
-        const [dashboardRes, salesChartRes, topProductsRes, categoryRes] = await Promise.all([
-          reportsAPI.getDashboard(),
-          reportsAPI.getSalesChart(30),
-          reportsAPI.getTopProducts(30, 5),
-          reportsAPI.getSalesByCategory(30),
-        ]);
+        // One request; the backend runs the report queries concurrently
+        const { data } = await reportsAPI.getDashboardBundle(30, 5);
 
-        setDashboardData(dashboardRes.data || SAMPLE_DASHBOARD);
-        setSalesChart(salesChartRes.data || []);
-        setTopProducts(topProductsRes.data || []);
-        setCategorySales(categoryRes.data || []);
+        setDashboardData(data.summary || SAMPLE_DASHBOARD);
+        setSalesChart(data.sales_chart || []);
+        setTopProducts(data.top_products || []);
+        setCategorySales(data.sales_by_category || []);
       } catch (err: any) {
         console.error('Error fetching dashboard data:', err);
         
@@ -117,6 +113,45 @@ const Dashboard = () => {
     fetchData();
   }, []);
 
+  // Live figures: the server pushes the summary fields that change, so
+  // open dashboards do not each recompute the report
+  useEffect(() => {
+    let source: EventSource | null = null;
+    let retryTimer: ReturnType<typeof setTimeout> | undefined;
+    let stopped = false;
+
+    const connect = async () => {
+      try {
+        const { data } = await reportsAPI.getLiveDashboardTicket();
+        // Without a streaming (ASGI) server the figures stay as loaded
+        if (!data.stream || stopped) return;
+
+        source = new EventSource(reportsAPI.getLiveDashboardUrl(data.ticket));
+        const apply = (event: MessageEvent) => {
+          const fields = JSON.parse(event.data);
+          delete fields.low_stock;
+          setDashboardData((current) => ({ ...current, ...fields }));
+        };
+        source.addEventListener('summary', apply);
+        source.addEventListener('delta', apply);
+        source.onerror = () => {
+          // The ticket in the URL expires quickly, so reconnect with a new one
+          source?.close();
+          retryTimer = setTimeout(connect, 5000);
+        };
+      } catch {
+        if (!stopped) retryTimer = setTimeout(connect, 30000);
+      }
+    };
+
+    connect();
+    return () => {
+      stopped = true;
+      clearTimeout(retryTimer);
+      source?.close();
+    };
+  }, []);
+
   const getLocale = () => i18n.language === 'es' ? 'es-PE' : 'en-US';
 
   if (isLoading) {
@@ -55,10 +55,13 @@ const Settings = () => {
     setIsLoading(true);
 
     try {
-      await authAPI.changePassword({
+      const response = await authAPI.changePassword({
         old_password: passwordData.old_password,
         new_password: passwordData.new_password,
       });
+      // Older tokens are revoked by the change; keep the session with the new pair
+      localStorage.setItem('access_token', response.data.access);
+      localStorage.setItem('refresh_token', response.data.refresh);
       setMessage({ type: 'success', text: 'Contraseña actualizada correctamente' });
       setPasswordData({ old_password: '', new_password: '', confirm_password: '' });
     } catch {
@@ -3,6 +3,8 @@ import { APP_CONFIG } from '../config/app.config';
 
 const api = axios.create({
   baseURL: APP_CONFIG.apiUrl,
+  // Carries the read-your-writes cookie that keeps recent writers off the replica
+  withCredentials: true,
   headers: {
     'Content-Type': 'application/json',
   },
@@ -95,6 +97,8 @@ export const salesAPI = {
   create: (data: Record<string, unknown>) => api.post('/sales/', data),
   cancel: (id: number) => api.post(`/sales/${id}/cancel/`),
   getInvoices: (params?: Record<string, string>) => api.get('/sales/invoices/', { params }),
+  getPayments: (params?: Record<string, string>) => api.get('/sales/payments/', { params }),
+  addPayment: (data: Record<string, unknown>) => api.post('/sales/payments/', data),
 };
 
 // Clients API
@@ -104,6 +108,7 @@ export const clientsAPI = {
   create: (data: Record<string, unknown>) => api.post('/clients/', data),
   update: (id: number, data: Record<string, unknown>) => api.put(`/clients/${id}/`, data),
   delete: (id: number) => api.delete(`/clients/${id}/`),
+  autocomplete: (q: string, limit = 10) => api.get('/clients/autocomplete/', { params: { q, limit } }),
 };
 
 // Suppliers API
@@ -123,6 +128,10 @@ export const expensesAPI = {
   update: (id: number, data: Record<string, unknown>) => api.put(`/expenses/${id}/`, data),
   delete: (id: number) => api.delete(`/expenses/${id}/`),
   getCategories: () => api.get('/expenses/categories/'),
+  getRecurring: (params?: Record<string, string>) => api.get('/expenses/recurring/', { params }),
+  createRecurring: (data: Record<string, unknown>) => api.post('/expenses/recurring/', data),
+  updateRecurring: (id: number, data: Record<string, unknown>) => api.put(`/expenses/recurring/${id}/`, data),
+  generateRecurring: (until?: string) => api.post('/expenses/recurring/generate/', until ? { until } : {}),
 };
 
 // Quotes API
@@ -135,11 +144,20 @@ export const quotesAPI = {
   send: (id: number) => api.post(`/quotes/${id}/send/`),
   accept: (id: number) => api.post(`/quotes/${id}/accept/`),
   reject: (id: number) => api.post(`/quotes/${id}/reject/`),
+  editItems: (id: number, items: Record<string, unknown>[]) => api.put(`/quotes/${id}/items/`, { items }),
+  convert: (id: number, data?: Record<string, unknown>) => api.post(`/quotes/${id}/convert/`, data),
 };
 
 // Reports API
 export const reportsAPI = {
   getDashboard: () => api.get('/reports/dashboard/'),
+  getDashboardBundle: (days?: number, limit?: number) =>
+    api.get('/reports/async/dashboard-bundle/', { params: { days, limit } }),
+  // EventSource cannot send headers: the stream is opened with a short-lived
+  // ticket from this endpoint, never with the access token
+  getLiveDashboardTicket: () => api.post('/reports/live/ticket/'),
+  getLiveDashboardUrl: (ticket: string) =>
+    `${APP_CONFIG.apiUrl}/reports/live/?ticket=${encodeURIComponent(ticket)}`,
   getSalesChart: (days?: number) => api.get('/reports/sales-chart/', { params: { days } }),
   getSalesByCategory: (days?: number) => api.get('/reports/sales-by-category/', { params: { days } }),
   getTopProducts: (days?: number, limit?: number) => 
@@ -150,6 +168,8 @@ export const reportsAPI = {
     api.get('/reports/monthly-comparison/', { params: { months } }),
   getAccountingReport: (params?: Record<string, string>) => 
     api.get('/reports/accounting/', { params }),
+  getReceivables: (params?: Record<string, string>) => 
+    api.get('/reports/receivables/', { params }),
 };
 
 // Config API